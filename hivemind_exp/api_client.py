@@ -0,0 +1,133 @@
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+logger = logging.getLogger(__name__)
+
+# Statuses meaning the request was turned away without being processed. 502
+# and 504 are not retried: the backend may have received the request and acted
+# on it, and calls like submit-reward are not idempotent.
+RETRY_STATUSES = frozenset({429, 503})
+
+
+@dataclass
+class EndpointStats:
+    """Running totals for calls to one API method."""
+
+    calls: int = 0
+    errors: int = 0
+    retries: int = 0
+    total_latency_seconds: float = 0.0
+    max_latency_seconds: float = 0.0
+
+    @property
+    def mean_latency_seconds(self) -> float:
+        return self.total_latency_seconds / self.calls if self.calls else 0.0
+
+
+class ApiClient:
+    """
+    Keep-alive HTTP client for the modal proxy API.
+
+    Requests share one pooled session, so repeated calls reuse connections.
+    Every request has a (connect, read) timeout. Failures that are safe to
+    repeat (no connection could be made, or the proxy answered with a
+    RETRY_STATUSES status) are retried with full-jitter exponential backoff.
+    Read timeouts, dropped connections and gateway errors are not retried,
+    since the backend may already have acted on the call. Per-method latency
+    is recorded in stats.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        connect_timeout_seconds: float = 5.0,
+        read_timeout_seconds: float = 30.0,
+        max_retries: int = 3,
+        base_backoff_seconds: float = 0.5,
+        max_backoff_seconds: float = 8.0,
+        pool_size: int = 10,
+    ):
+        self.base_url = base_url
+        self.timeout = (connect_timeout_seconds, read_timeout_seconds)
+        self.max_retries = max_retries
+        self.base_backoff_seconds = base_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.stats: dict[str, EndpointStats] = {}
+        self._sleep = time.sleep
+        self._stats_lock = threading.Lock()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def close(self):
+        self.session.close()
+
+    @staticmethod
+    def _never_sent(e: requests.exceptions.ConnectionError) -> bool:
+        if isinstance(e, requests.exceptions.ConnectTimeout):
+            return True
+        reason = getattr(e.args[0], "reason", None) if e.args else None
+        return isinstance(reason, NewConnectionError)
+
+    def _backoff_seconds(self, attempt: int) -> float:
+        cap = min(self.max_backoff_seconds, self.base_backoff_seconds * 2**attempt)
+        return random.uniform(0, cap)
+
+    def _record(self, method: str, latency: float, retries: int, failed: bool):
+        with self._stats_lock:
+            stats = self.stats.setdefault(method, EndpointStats())
+            stats.calls += 1
+            stats.retries += retries
+            stats.errors += failed
+            stats.total_latency_seconds += latency
+            stats.max_latency_seconds = max(stats.max_latency_seconds, latency)
+
+    def post(self, method: str, payload: dict):
+        """POSTs payload as JSON to base_url + method and returns the decoded response."""
+        url = self.base_url + method
+        start = time.monotonic()
+        attempt = 0
+        failed = True
+        try:
+            while True:
+                try:
+                    response = self.session.post(url, json=payload, timeout=self.timeout)
+                    if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                        response.raise_for_status()  # Raise an exception for HTTP errors
+                        failed = False
+                        return response.json()
+                    reason = f"status {response.status_code}"
+                except requests.exceptions.ConnectionError as e:
+                    if attempt >= self.max_retries or not self._never_sent(e):
+                        raise
+                    reason = str(e)
+
+                backoff = self._backoff_seconds(attempt)
+                attempt += 1
+                logger.debug(
+                    f"Retrying {method} in {backoff:.2f}s (attempt {attempt}/{self.max_retries}): {reason}"
+                )
+                self._sleep(backoff)
+        finally:
+            self._record(method, time.monotonic() - start, attempt, failed)
+
+
+_clients: dict[str, ApiClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_api_client(base_url: str) -> ApiClient:
+    """Returns the process-wide client for base_url, so coordinators share one connection pool."""
+    with _clients_lock:
+        if base_url not in _clients:
+            _clients[base_url] = ApiClient(base_url)
+        return _clients[base_url]
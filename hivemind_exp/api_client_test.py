@@ -0,0 +1,116 @@
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from hivemind_exp.api_client import ApiClient
+
+
+class StandInProxy:
+    """Local stand-in for the modal proxy that answers with scripted statuses."""
+
+    def __init__(self):
+        self.statuses = []
+        self.requests = []
+        self.delay_seconds = 0.0
+        proxy = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                proxy.requests.append((self.path, self.client_address[1], body))
+                time.sleep(proxy.delay_seconds)
+                status = proxy.statuses.pop(0) if proxy.statuses else 200
+                payload = json.dumps({"ok": status == 200}).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/api/"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def proxy():
+    proxy = StandInProxy()
+    yield proxy
+    proxy.close()
+
+
+@pytest.fixture
+def client(proxy):
+    client = ApiClient(proxy.url, read_timeout_seconds=1.0, max_retries=2)
+    client._sleep = lambda seconds: None
+    yield client
+    client.close()
+
+
+def test_reuses_connection(proxy, client):
+    assert client.post("submit-reward", {"roundNumber": 1}) == {"ok": True}
+    assert client.post("submit-winner", {"roundNumber": 1}) == {"ok": True}
+    assert [path for path, _, _ in proxy.requests] == ["/api/submit-reward", "/api/submit-winner"]
+    assert proxy.requests[0][1] == proxy.requests[1][1]  # Same client port: kept alive.
+    assert proxy.requests[0][2] == {"roundNumber": 1}
+
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_retries_requests_turned_away(proxy, client, status):
+    proxy.statuses = [status]
+    assert client.post("submit-reward", {}) == {"ok": True}
+    assert len(proxy.requests) == 2
+    assert client.stats["submit-reward"].retries == 1
+    assert client.stats["submit-reward"].errors == 0
+
+
+@pytest.mark.parametrize("status", [500, 502, 504])
+def test_does_not_retry_requests_the_backend_may_have_processed(proxy, client, status):
+    proxy.statuses = [status]
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.post("submit-reward", {})
+    assert len(proxy.requests) == 1
+    assert client.stats["submit-reward"].errors == 1
+
+
+def test_does_not_retry_read_timeout(proxy, client):
+    client.timeout = (1.0, 0.1)
+    proxy.delay_seconds = 0.3
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        client.post("guess-answer", {})
+    assert len(proxy.requests) == 1
+
+
+def test_gives_up_after_max_retries(proxy, client):
+    proxy.statuses = [503] * 5
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.post("claim-reward", {})
+    assert len(proxy.requests) == 3
+    assert client.stats["claim-reward"].retries == 2
+
+
+def test_retries_refused_connections():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    client = ApiClient(f"http://127.0.0.1:{port}/api/", max_retries=2)
+    sleeps = []
+    client._sleep = sleeps.append
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.post("register-peer", {})
+    assert len(sleeps) == 2
+    client.close()
@@ -6,6 +6,8 @@ import requests
 from eth_account import Account
 from web3 import Web3
 
+from hivemind_exp.api_client import get_api_client
+
 ALCHEMY_URL = "https://gensyn-testnet.g.alchemy.com/public"
 
 MAINNET_CHAIN_ID = 685685
@@ -148,14 +150,11 @@ class ModalSwarmCoordinator(SwarmCoordinator):
 
 
 def send_via_api(org_id, method, args):
-    # Construct URL and payload.
-    url = MODAL_PROXY_URL + method
+    # Construct payload.
     payload = {"orgId": org_id} | args
 
-    # Send the POST request.
-    response = requests.post(url, json=payload)
-    response.raise_for_status()  # Raise an exception for HTTP errors
-    return response.json()
+    # Send the POST request over the shared keep-alive session.
+    return get_api_client(MODAL_PROXY_URL).post(method, payload)
 
 
 def setup_web3() -> Web3:
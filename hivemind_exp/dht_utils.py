@@ -1,11 +1,17 @@
 import hashlib
-from functools import lru_cache
-from typing import Any
+import queue
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Iterable, Iterator
 
 from hivemind.dht import DHT
 from hivemind.utils import ValueWithExpiration
 
-from hivemind_exp.hivemind_utils import HivemindNode
+from hivemind_exp.hivemind_utils import HivemindNode, approx_size
 
 ROUND_STAGE_NUMBER_KEY = "rl_swarm_rs"  # No subkeys. Coordinator publishes.
 
@@ -46,22 +52,178 @@ def hash_keys(outputs):
     return result
 
 
-@lru_cache
+@dataclass
+class _CacheEntry:
+    round_num: int
+    value: Any
+    size: int
+    expires_at: float
+    error: Exception | None = None
+
+
+class OutputsCache:
+    """
+    Bounded cache for stage outputs fetched from the DHT.
+
+    Entries expire after ttl_seconds, only the latest round_window rounds are
+    kept, and the least recently used entries are evicted once the cached
+    values exceed max_bytes. A failed lookup (ValueError) is remembered for
+    error_ttl_seconds so callers retrying in a loop don't hammer the DHT, and
+    concurrent misses for the same key share a single lookup.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 256 * 1024 * 1024,
+        ttl_seconds: float = 300.0,
+        round_window: int = 3,
+        error_ttl_seconds: float = 10.0,
+    ):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.round_window = round_window
+        self.error_ttl_seconds = error_ttl_seconds
+
+        self._entries: OrderedDict[Hashable, _CacheEntry] = OrderedDict()
+        self._inflight: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._clock = time.monotonic
+        self.latest_round = None
+        self.bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.collapsed = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "collapsed": self.collapsed,
+            "evictions": self.evictions,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+            self.latest_round = None
+
+    def get(self, key: Hashable, round_num: int, fetch: Callable[[], Any]) -> Any:
+        """Returns the cached value for key, calling fetch on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry.expires_at > self._clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                if entry.error:
+                    raise entry.error
+                return entry.value
+            if entry:
+                self._remove(key)
+
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+                self.misses += 1
+            else:
+                self.collapsed += 1
+
+        if not leader:
+            # Another caller is already fetching this key.
+            return future.result()
+
+        try:
+            value = fetch()
+        except ValueError as e:
+            with self._lock:
+                del self._inflight[key]
+                expires_at = self._clock() + self.error_ttl_seconds
+                self._store(key, _CacheEntry(round_num, None, 0, expires_at, error=e))
+            future.set_exception(e)
+            raise
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._inflight[key]
+            expires_at = self._clock() + self.ttl_seconds
+            self._store(key, _CacheEntry(round_num, value, approx_size(value), expires_at))
+        future.set_result(value)
+        return value
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self.bytes -= entry.size
+
+    def _store(self, key, entry: _CacheEntry):
+        if self.latest_round is None or entry.round_num > self.latest_round:
+            self.latest_round = entry.round_num
+            # Drop rounds that just left the window.
+            for old_key in [
+                k for k, e in self._entries.items() if not self._in_window(e.round_num)
+            ]:
+                self._remove(old_key)
+                self.evictions += 1
+
+        if not self._in_window(entry.round_num) or entry.size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = entry
+        self.bytes += entry.size
+        while self.bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _in_window(self, round_num: int) -> bool:
+        return round_num > self.latest_round - self.round_window
+
+
+# get_outputs keeps one cache per DHT, held only as long as the DHT is, so a
+# new DHT never sees outputs cached for an earlier one.
+_OUTPUTS_CACHES: "weakref.WeakKeyDictionary[DHT, OutputsCache]" = weakref.WeakKeyDictionary()
+_OUTPUTS_CACHES_LOCK = threading.Lock()
+
+
+def get_outputs_cache(dht: DHT) -> OutputsCache:
+    with _OUTPUTS_CACHES_LOCK:
+        cache = _OUTPUTS_CACHES.get(dht)
+        if cache is None:
+            cache = _OUTPUTS_CACHES[dht] = OutputsCache()
+        return cache
+
+
 def get_outputs(
     dht: DHT, node_key: str, r, s, get_cached_fn=None
 ) -> dict[str, tuple[float, dict]]:  # Q: (timestamp, outputs)
-    # Try provided cache function first.
-    if get_cached_fn:
-        if outputs := get_cached_fn(r, s):
+    def fetch():
+        # Try provided cache function first.
+        if get_cached_fn:
+            if outputs := get_cached_fn(r, s):
+                return hash_keys(outputs)
+
+        # Try from DHT next to include peered outputs.
+        if outputs := get_dht_value(dht, key=outputs_key(node_key, r, s), latest=False):
             return hash_keys(outputs)
 
-    # Try from DHT next to include peered outputs.
-    if outputs := get_dht_value(dht, key=outputs_key(node_key, r, s), latest=False):
-        return hash_keys(outputs)
+        raise ValueError(
+            f"could not retrieve stage outputs for {node_key} at round {r} stage {s}"
+        )
 
-    raise ValueError(
-        f"could not retrieve stage outputs for {node_key} at round {r} stage {s}"
-    )
+    return get_outputs_cache(dht).get((node_key, r, s, get_cached_fn), r, fetch)
 
 
 def get_round_and_stage(
@@ -75,8 +237,7 @@ def get_round_and_stage(
     return round_num, stage
 
 
-def get_dht_value(dht: DHT, **kwargs) -> Any | None:
-    wrapper = dht.get(**kwargs)
+def _unwrap_value(wrapper) -> Any | None:
     if not wrapper:
         return None
 
@@ -86,3 +247,73 @@ def get_dht_value(dht: DHT, **kwargs) -> Any | None:
         # Subkeys exist; unwrap ValueWithExpiration.
         return {k: v.value for k, v in value.items()}
     return value
+
+
+def get_dht_value(dht: DHT, **kwargs) -> Any | None:
+    return _unwrap_value(dht.get(**kwargs))
+
+
+def get_dht_values(
+    dht: DHT,
+    keys: Iterable[str],
+    max_concurrency: int = 32,
+    timeout: float | None = None,
+    **kwargs,
+) -> Iterator[tuple[str, Any | None, Exception | None]]:
+    """
+    Looks up many keys concurrently on the DHT's event loop.
+
+    Yields (key, value, error) as each lookup finishes, with value unwrapped as
+    in get_dht_value (None if not found) and error set if that lookup failed.
+    At most max_concurrency lookups are in flight at once. Lookups not finished
+    within timeout seconds of the call are cancelled and yielded with a
+    TimeoutError. kwargs are passed to every dht.get call.
+    """
+    pending = iter(keys)
+    in_flight: dict[Any, str] = {}
+    done: queue.Queue = queue.Queue()
+    deadline = None if timeout is None else time.monotonic() + timeout
+    failed: list[tuple[str, Exception]] = []
+
+    def submit():
+        while len(in_flight) < max_concurrency:
+            key = next(pending, None)
+            if key is None:
+                return
+            try:
+                future = dht.get(key, return_future=True, **kwargs)
+            except Exception as e:
+                failed.append((key, e))
+                continue
+            in_flight[future] = key
+            future.add_done_callback(done.put)
+
+    try:
+        submit()
+        while in_flight or failed:
+            while failed:
+                key, error = failed.pop(0)
+                yield key, None, error
+
+            if not in_flight:
+                submit()
+                continue
+
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                future = done.get(timeout=remaining)
+            except queue.Empty:
+                for key in list(in_flight.values()) + list(pending):
+                    yield key, None, TimeoutError(f"DHT lookup for {key} timed out")
+                return
+
+            key = in_flight.pop(future)
+            try:
+                value, error = _unwrap_value(future.result()), None
+            except Exception as e:
+                value, error = None, e
+            submit()
+            yield key, value, error
+    finally:
+        for future in in_flight:
+            future.cancel()
@@ -0,0 +1,265 @@
+import gc
+import threading
+import time
+from concurrent.futures import Future
+
+import pytest
+from hivemind.utils import ValueWithExpiration
+
+from hivemind_exp.dht_utils import (
+    _OUTPUTS_CACHES,
+    OutputsCache,
+    get_outputs,
+    get_dht_values,
+    get_outputs_cache,
+    outputs_key,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def cache():
+    cache = OutputsCache(max_bytes=10_000, ttl_seconds=60, round_window=2, error_ttl_seconds=5)
+    cache._clock = FakeClock()
+    return cache
+
+
+def test_hit_until_ttl_expires(cache):
+    calls = []
+    fetch = lambda: calls.append(1) or {"q": "a"}
+    assert cache.get("k", 0, fetch) == {"q": "a"}
+    assert cache.get("k", 0, fetch) == {"q": "a"}
+    assert len(calls) == 1
+
+    cache._clock.now = 61
+    cache.get("k", 0, fetch)
+    assert len(calls) == 2
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_keeps_only_round_window(cache):
+    for r in range(3):
+        cache.get(("k", r), r, lambda: {"r": r})
+    assert len(cache) == 2
+    assert cache.latest_round == 2
+    assert cache.evictions == 1
+
+    # Older rounds are fetched but not stored.
+    cache.get(("k", 0), 0, lambda: {"r": 0})
+    assert len(cache) == 2
+
+
+def test_clear_resets_round_window(cache):
+    cache.get("new", 5, lambda: "x")
+    cache.clear()
+    cache.get("old", 0, lambda: "y")
+    assert len(cache) == 1
+
+
+def test_evicts_least_recently_used_over_byte_budget(cache):
+    value = "x" * 3000
+    cache.get("a", 0, lambda: value)
+    cache.get("b", 0, lambda: value)
+    cache.get("a", 0, lambda: value)  # Refreshes "a".
+    cache.get("c", 0, lambda: value)
+    cache.get("d", 0, lambda: value)
+    assert cache.bytes <= cache.max_bytes
+    assert "b" not in cache._entries
+    assert "a" in cache._entries
+
+    # Values larger than the whole budget are returned but not cached.
+    cache.get("huge", 0, lambda: "x" * 20_000)
+    assert "huge" not in cache._entries
+
+
+def test_caches_failed_lookups_for_error_ttl(cache):
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        raise ValueError("missing")
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            cache.get("k", 0, fetch)
+    assert len(calls) == 1
+
+    cache._clock.now = 6
+    with pytest.raises(ValueError):
+        cache.get("k", 0, fetch)
+    assert len(calls) == 2
+
+
+def test_other_errors_are_not_cached(cache):
+    def fetch():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        cache.get("k", 0, fetch)
+    assert len(cache) == 0
+    assert cache.get("k", 0, lambda: "ok") == "ok"
+
+
+def test_collapses_concurrent_misses(cache):
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "v"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(cache.get("k", 0, fetch)))
+    leader.start()
+    started.wait(5)
+    followers = [
+        threading.Thread(target=lambda: results.append(cache.get("k", 0, fetch)))
+        for _ in range(3)
+    ]
+    for t in followers:
+        t.start()
+    while cache.collapsed < 3:
+        time.sleep(0.001)
+    release.set()
+    for t in [leader, *followers]:
+        t.join(5)
+
+    assert results == ["v"] * 4
+    assert len(calls) == 1
+
+
+class StubDHT:
+    def __init__(self, values):
+        self.values = values
+
+    def get(self, key, latest=False):
+        return self.values.get(key)
+
+
+def _outputs(outputs):
+    return ValueWithExpiration(
+        {k: ValueWithExpiration(v, 0.0) for k, v in outputs.items()}, 0.0
+    )
+
+
+def test_get_outputs_is_cached_per_dht():
+    key = outputs_key("node", 0, 0)
+    q = "a" * 32
+    dht_a = StubDHT({key: _outputs({q: (1.0, {"from": "a"})})})
+    dht_b = StubDHT({key: _outputs({q: (1.0, {"from": "b"})})})
+
+    assert get_outputs(dht_a, "node", 0, 0) == {q: (1.0, {"from": "a"})}
+    assert get_outputs(dht_b, "node", 0, 0) == {q: (1.0, {"from": "b"})}
+
+    # Cached: the DHT isn't read again.
+    dht_a.values.clear()
+    assert get_outputs(dht_a, "node", 0, 0) == {q: (1.0, {"from": "a"})}
+
+
+def test_outputs_cache_is_dropped_with_its_dht():
+    dht = StubDHT({})
+    get_outputs_cache(dht)
+    assert dht in _OUTPUTS_CACHES
+    n = len(_OUTPUTS_CACHES)
+    del dht
+    gc.collect()
+    assert len(_OUTPUTS_CACHES) == n - 1
+
+
+class FutureDHT:
+    """DHT stub whose get(..., return_future=True) returns futures the test resolves."""
+
+    def __init__(self, errors=None):
+        self.futures = {}
+        self.errors = errors or {}
+        self.max_in_flight = 0
+
+    def get(self, key, return_future=False, **kwargs):
+        assert return_future
+        if key in self.errors:
+            raise self.errors[key]
+        future = self.futures[key] = Future()
+        in_flight = sum(not f.done() for f in self.futures.values())
+        self.max_in_flight = max(self.max_in_flight, in_flight)
+        return future
+
+    def resolve(self, key, value):
+        self.futures[key].set_result(value)
+
+
+def _resolve_in_background(dht, keys, values):
+    def run():
+        for key in keys:
+            while key not in dht.futures:
+                time.sleep(0.001)
+            if isinstance(values[key], Exception):
+                dht.futures[key].set_exception(values[key])
+            else:
+                dht.resolve(key, values[key])
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_get_dht_values_unwraps_and_reports_errors():
+    dht = FutureDHT(errors={"bad_submit": RuntimeError("rejected")})
+    values = {
+        "plain": ValueWithExpiration(7, 0.0),
+        "subkeys": _outputs({"x": 1}),
+        "missing": None,
+        "failed": KeyError("lookup failed"),
+    }
+    _resolve_in_background(dht, list(values), values)
+
+    results = {
+        key: (value, error)
+        for key, value, error in get_dht_values(dht, [*values, "bad_submit"], timeout=5)
+    }
+    assert results["plain"] == (7, None)
+    assert results["subkeys"] == ({"x": 1}, None)
+    assert results["missing"] == (None, None)
+    assert isinstance(results["failed"][1], KeyError)
+    assert isinstance(results["bad_submit"][1], RuntimeError)
+
+
+def test_get_dht_values_caps_concurrency():
+    dht = FutureDHT()
+    keys = [f"k{i}" for i in range(10)]
+    _resolve_in_background(dht, keys, {k: ValueWithExpiration(k, 0.0) for k in keys})
+
+    results = list(get_dht_values(dht, keys, max_concurrency=3, timeout=5))
+    assert sorted(key for key, _, _ in results) == keys
+    assert dht.max_in_flight <= 3
+
+
+def test_get_dht_values_times_out_and_cancels():
+    dht = FutureDHT()
+    _resolve_in_background(dht, ["fast"], {"fast": ValueWithExpiration(1, 0.0)})
+
+    results = list(get_dht_values(dht, ["fast", "slow", "queued"], max_concurrency=2, timeout=0.2))
+    assert results[0] == ("fast", 1, None)
+    timed_out = {key: error for key, _, error in results[1:]}
+    assert set(timed_out) == {"slow", "queued"}
+    assert all(isinstance(e, TimeoutError) for e in timed_out.values())
+    assert dht.futures["slow"].cancelled()
+
+
+def test_get_dht_values_cancels_when_closed_early():
+    dht = FutureDHT()
+    _resolve_in_background(dht, ["a"], {"a": ValueWithExpiration(1, 0.0)})
+
+    lookups = get_dht_values(dht, ["a", "b"])
+    assert next(lookups) == ("a", 1, None)
+    lookups.close()
+    assert dht.futures["b"].cancelled()
@@ -1,10 +1,126 @@
-from collections import defaultdict
+import pickle
+import sys
+from collections.abc import MutableMapping
 from dataclasses import dataclass, field
-from typing import Any, Callable, Sequence
+from typing import Any, Callable, Iterator, Sequence
 
 import torch
 
 
+def approx_size(value) -> int:
+    """Approximate in-memory size of value, in bytes, from its pickled size."""
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+class RoundWindowCache(MutableMapping):
+    """
+    Stage outputs keyed by (round, stage), keeping only the latest max_rounds rounds.
+
+    Storing a stage from a newer round evicts every stage more than max_rounds
+    rounds behind it. With max_bytes set, whole stages are also evicted oldest
+    first once the approximate size of the cached outputs passes the budget.
+    The stage being written is never evicted, so a write for an old round is
+    kept until the next write to another stage. Sizes are only computed when
+    max_bytes is set; otherwise bytes stays 0.
+    """
+
+    def __init__(self, max_rounds: int = 3, max_bytes: int | None = None):
+        self.max_rounds = max_rounds
+        self.max_bytes = max_bytes
+        self._stages: dict[tuple[int, int], dict[str, tuple[float, dict]]] = {}
+        self._sizes: dict[tuple[int, int], int] = {}
+        self.latest_round = None
+        self.bytes = 0
+
+        self.evicted_stages = 0
+        self.evicted_entries = 0
+        self.evicted_bytes = 0
+
+    def __getitem__(self, key: tuple[int, int]) -> dict[str, tuple[float, dict]]:
+        return self._stages[key]
+
+    def __setitem__(self, key: tuple[int, int], outputs: dict[str, tuple[float, dict]]):
+        if key in self._stages:
+            self._discard(key)
+        self._stages[key] = outputs
+        if self.max_bytes is not None:
+            self._sizes[key] = sum(approx_size(v) for v in outputs.values())
+            self.bytes += self._sizes[key]
+        self._evict(key)
+
+    def __delitem__(self, key: tuple[int, int]):
+        if key not in self._stages:
+            raise KeyError(key)
+        self._discard(key)
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        return iter(self._stages)
+
+    def __len__(self) -> int:
+        return len(self._stages)
+
+    def clear(self):
+        self._stages.clear()
+        self._sizes.clear()
+        self.latest_round = None
+        self.bytes = 0
+
+    def put(self, r: int, s: int, question: str, value: tuple[float, dict]):
+        key = (r, s)
+        stage = self._stages.setdefault(key, {})
+        if self.max_bytes is not None:
+            size = approx_size(value)
+            if question in stage:
+                size -= approx_size(stage[question])
+            self._sizes[key] = self._sizes.get(key, 0) + size
+            self.bytes += size
+        stage[question] = value
+        self._evict(key)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "stages": len(self._stages),
+            "bytes": self.bytes,
+            "evicted_stages": self.evicted_stages,
+            "evicted_entries": self.evicted_entries,
+            "evicted_bytes": self.evicted_bytes,
+        }
+
+    def _discard(self, key: tuple[int, int]) -> tuple[int, int]:
+        outputs = self._stages.pop(key)
+        size = self._sizes.pop(key, 0)
+        self.bytes -= size
+        return len(outputs), size
+
+    def _evict_stage(self, key: tuple[int, int]):
+        entries, size = self._discard(key)
+        self.evicted_stages += 1
+        self.evicted_entries += entries
+        self.evicted_bytes += size
+
+    def _evict(self, written: tuple[int, int]):
+        r = written[0]
+        if self.latest_round is None or r > self.latest_round:
+            self.latest_round = r
+
+        for key in [
+            k
+            for k in self._stages
+            if k[0] <= self.latest_round - self.max_rounds and k != written
+        ]:
+            self._evict_stage(key)
+
+        if self.max_bytes is not None:
+            for key in sorted(self._stages):
+                if self.bytes <= self.max_bytes:
+                    break
+                if key != written:
+                    self._evict_stage(key)
+
+
 @dataclass
 class HivemindNode:
     # Node metadata.
@@ -15,10 +131,10 @@ class HivemindNode:
 
     # Q&A outputs from the last training step.
     outputs: dict[Any, Any] = field(default_factory=dict)
-    # Cache for (r, s): Q: (timestamp, outputs).
-    round_cache: dict[tuple[int, int], dict[str, tuple[float, dict]]] = field(
-        default_factory=lambda: defaultdict(dict)
-    )
+    # Cache for (r, s): Q: (timestamp, outputs), bounded to the latest rounds.
+    round_cache_rounds: int = 3
+    round_cache_max_bytes: int | None = None
+    round_cache: RoundWindowCache = None  # type: ignore[assignment]
 
     # Reward outputs from the last training.
     rewards: Sequence[float | int] = field(default_factory=list)
@@ -29,6 +145,12 @@ class HivemindNode:
 
     out_expiration: int = 60 * 60 * 4  # hours
 
+    def __post_init__(self):
+        if self.round_cache is None:
+            self.round_cache = RoundWindowCache(
+                self.round_cache_rounds, self.round_cache_max_bytes
+            )
+
     @staticmethod
     def coordinator(*args, **kwargs):
         return HivemindNode(*args, **kwargs, is_coordinator=True)
@@ -39,7 +161,7 @@ class HivemindNode:
             return self.round_cache[key]
 
     def put_stage_outputs(self, r, s, question, value: tuple[float, dict]):
-        self.round_cache[(r, s)][question] = value
+        self.round_cache.put(r, s, question, value)
 
     def clear_stage_cache(self):
         self.round_cache.clear()
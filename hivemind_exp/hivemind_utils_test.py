@@ -0,0 +1,64 @@
+from hivemind_exp.hivemind_utils import HivemindNode, RoundWindowCache, approx_size
+
+VALUE = (1.0, {"answer": "x" * 100})
+
+
+def test_keeps_latest_rounds():
+    cache = RoundWindowCache(max_rounds=2)
+    for r in range(4):
+        cache.put(r, 0, "q", VALUE)
+    assert sorted(cache) == [(2, 0), (3, 0)]
+    assert cache.stats()["evicted_stages"] == 2
+    # Without a byte budget, values are never sized.
+    assert cache.bytes == 0
+
+
+def test_write_to_old_round_is_kept():
+    cache = RoundWindowCache(max_rounds=2)
+    cache.put(5, 0, "q", VALUE)
+    cache.put(1, 0, "q", VALUE)
+    assert cache[(1, 0)] == {"q": VALUE}
+
+    # It goes once another stage is written.
+    cache.put(5, 1, "q", VALUE)
+    assert (1, 0) not in cache
+
+
+def test_clear_resets_round_window():
+    node = HivemindNode(model_name="m", key="k", round_cache_rounds=2)
+    for r in range(6):
+        node.put_stage_outputs(r, 0, "q", VALUE)
+    node.clear_stage_cache()
+    assert node.round_cache.latest_round is None
+    assert node.round_cache.bytes == 0
+
+    node.put_stage_outputs(0, 0, "q", VALUE)
+    node.put_stage_outputs(0, 1, "q", VALUE)
+    assert node.get_stage_outputs(0, 0) == {"q": VALUE}
+    assert node.get_stage_outputs(0, 1) == {"q": VALUE}
+
+
+def test_byte_budget_evicts_oldest_stages_first():
+    size = approx_size(VALUE)
+    cache = RoundWindowCache(max_rounds=10, max_bytes=2 * size)
+    cache.put(0, 0, "q", VALUE)
+    cache.put(0, 1, "q", VALUE)
+    cache.put(1, 0, "q", VALUE)
+    assert sorted(cache) == [(0, 1), (1, 0)]
+    assert cache.bytes <= cache.max_bytes
+
+    # The stage being written is kept even when it alone is over budget.
+    cache.put(1, 1, "big", (1.0, {"answer": "x" * 10 * size}))
+    assert (1, 1) in cache
+
+
+def test_overwriting_updates_size():
+    cache = RoundWindowCache(max_bytes=10 * approx_size(VALUE))
+    cache.put(0, 0, "q", VALUE)
+    cache.put(0, 0, "q", VALUE)
+    assert cache.bytes == approx_size(VALUE)
+
+    cache[(0, 1)] = {"a": VALUE, "b": VALUE}
+    del cache[(0, 0)]
+    assert cache.bytes == 2 * approx_size(VALUE)
+    assert len(cache) == 1
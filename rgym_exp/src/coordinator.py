@@ -1,9 +1,11 @@
 import json
 import requests
 from genrl.logging_utils.global_defs import get_logger
-from genrl.blockchain.connections import get_contract, send_via_api, setup_web3
+from genrl.blockchain.connections import get_contract, setup_web3
 from genrl.blockchain.coordinator import SwarmCoordinator
 
+from rgym_exp.src.utils.api_client import ApiClient, get_api_client
+
 
 class ModalSwarmCoordinator(SwarmCoordinator):
     def __init__(
@@ -13,16 +15,19 @@ class ModalSwarmCoordinator(SwarmCoordinator):
         org_id: str,
         modal_proxy_url: str,
         swarm_coordinator_abi_json: str,
+        api_client: ApiClient | None = None,
     ) -> None:
         super().__init__(web3_url, contract_address, swarm_coordinator_abi_json)
         self.org_id = org_id
         self.modal_proxy_url = modal_proxy_url
+        self.api_client = api_client or get_api_client(modal_proxy_url)
+
+    def _send(self, method, args):
+        return self.api_client.post(method, {"orgId": self.org_id} | args)
 
     def register_peer(self, peer_id):
         try:
-            send_via_api(
-                self.org_id, self.modal_proxy_url, "register-peer", {"peerId": peer_id}
-            )
+            self._send("register-peer", {"peerId": peer_id})
         except requests.exceptions.HTTPError as http_err:
             if http_err.response is None or http_err.response.status_code != 400:
                 raise
@@ -43,9 +48,7 @@ class ModalSwarmCoordinator(SwarmCoordinator):
 
     def submit_reward(self, round_num, stage_num, reward, peer_id):
         try:
-            send_via_api(
-                self.org_id,
-                self.modal_proxy_url,
+            self._send(
                 "submit-reward",
                 {
                     "roundNumber": round_num,
@@ -59,9 +62,7 @@ class ModalSwarmCoordinator(SwarmCoordinator):
 
     def submit_winners(self, round_num, winners, peer_id):
         try:
-            send_via_api(
-                self.org_id,
-                self.modal_proxy_url,
+            self._send(
                 "submit-winner",
                 {"roundNumber": round_num, "winners": winners, "peerId": peer_id},
             )
@@ -80,17 +81,21 @@ class PRGCoordinator:
         self,
         org_id: str,
         modal_proxy_url: str,
+        api_client: ApiClient | None = None,
     ) -> None:
         self.org_id = org_id
         self.modal_proxy_url = modal_proxy_url
+        # Shares one keep-alive connection pool with ModalSwarmCoordinator.
+        self.api_client = api_client or get_api_client(modal_proxy_url)
+
+    def _send(self, method, args):
+        return self.api_client.post(method, {"orgId": self.org_id} | args)
 
     def bet_token_balance(
         self, peer_id: str
     ) -> int:
         try:
-            response = send_via_api(
-                self.org_id,
-                self.modal_proxy_url,
+            response = self._send(
                 "bet-token-balance",
                 {
                     "peerId": peer_id,
@@ -113,9 +118,7 @@ class PRGCoordinator:
         self, game_id: int, peer_id: str, clue_id: int, choice_idx: int, bet: int
     ) -> None:
         try:
-            send_via_api(
-                self.org_id,
-                self.modal_proxy_url,
+            self._send(
                 "guess-answer",
                 {
                     "gameId": game_id,
@@ -132,9 +135,7 @@ class PRGCoordinator:
         self, game_id: int, peer_id: str
     ) -> None:
         try:
-            send_via_api(
-                self.org_id,
-                self.modal_proxy_url,
+            self._send(
                 "claim-reward",
                 {"gameId": game_id, "peerId": peer_id},
             )
@@ -19,6 +19,7 @@ from huggingface_hub import login, whoami
 
 from rgym_exp.src.utils.name_utils import get_name_from_peer_id
 from rgym_exp.src.prg_module import PRGModule
+from rgym_exp.src.submission_queue import RoundSubmissionQueue
 
 
 class SwarmGameManager(BaseGameManager, DefaultGameManagerMixin):
@@ -90,6 +91,14 @@ class SwarmGameManager(BaseGameManager, DefaultGameManagerMixin):
         self.round_signals = 0.0
         self.last_submitted_round = -1  # Track last round we submitted
 
+        # Chain submissions run in the background; unsent rounds are journaled and replayed on restart.
+        self.submission_queue = RoundSubmissionQueue(
+            self.coordinator,
+            self.peer_id,
+            os.path.join(log_dir, "submissions.jsonl"),
+        )
+        self.submission_queue.start()
+
         # PRG Game
         self.prg_module = PRGModule(log_dir, **kwargs)
         self.prg_game = self.prg_module.prg_game
@@ -117,34 +126,20 @@ class SwarmGameManager(BaseGameManager, DefaultGameManagerMixin):
         return random.randint(base + bonus // 2, 14)
 
     def _submit_to_chain(self, total_signals):
-        """Submit accumulated signals to blockchain after round completion"""
+        """Queue accumulated signals for submission to the blockchain after round completion"""
         try:
-            get_logger().info(f"Submitting round {self.state.round} results to blockchain...")
+            get_logger().info(f"Queueing round {self.state.round} results for blockchain submission...")
             get_logger().info(f"Signal by agent: {self._get_total_rewards_by_agent()}")
             get_logger().info(f"Total signals for this round: {total_signals}")
-            
-            # Submit reward
-            self.coordinator.submit_reward(
-                self.state.round, 0, int(total_signals), self.peer_id
-            )
-            get_logger().info(f"Successfully submitted reward to blockchain for round {self.state.round}")
 
-            # Submit winners (using self as max agent for now)
+            # Submit reward and winners (using self as max agent for now)
             max_agent = self.peer_id
-            self.coordinator.submit_winners(self.state.round, [max_agent], self.peer_id)
-            get_logger().info(f"Successfully submitted winners to blockchain for round {self.state.round}")
-            
+            self.submission_queue.submit(self.state.round, int(total_signals), [max_agent])
             return True
 
         except Exception as e:
-            get_logger().error(f"Failed to submit round {self.state.round} results to blockchain: {str(e)}")
             get_logger().exception(
-                "Failed to submit to chain.\n"
-                "This is most likely transient and will recover.\n"
-                "There is no need to kill the program.\n"
-                "If you encounter this error, please report it to Gensyn by\n"
-                "filing a github issue here: https://github.com/gensyn-ai/rl-swarm/issues/ \n"
-                "including the full stacktrace."
+                f"Failed to queue round {self.state.round} results for blockchain submission: {str(e)}"
             )
             return False
 
@@ -166,7 +161,7 @@ class SwarmGameManager(BaseGameManager, DefaultGameManagerMixin):
             submit_success = self._submit_to_chain(self.round_signals)
             
             if submit_success:
-                get_logger().info(f"Round {self.state.round} submission completed successfully!")
+                get_logger().info(f"Round {self.state.round} submission queued successfully!")
                 self.last_submitted_round = self.state.round
                 get_logger().info(f"Skipping remaining training, waiting for next round...")
                 # Reset signals after successful submission
@@ -199,6 +194,7 @@ class SwarmGameManager(BaseGameManager, DefaultGameManagerMixin):
         """Called after the entire game is completed"""
         get_logger().info("Game completed! Performing final save to HuggingFace...")
         self._save_to_hf()
+        self.submission_queue.stop()
 
     def _configure_hf_hub(self, hf_push_frequency):
         username = whoami(token=self.hf_token)["name"]
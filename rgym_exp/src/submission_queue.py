@@ -0,0 +1,217 @@
+import json
+import os
+import random
+import threading
+from dataclasses import dataclass, field
+
+import requests
+from genrl.blockchain import SwarmCoordinator
+from genrl.logging_utils.global_defs import get_logger
+
+# Calls made for each round, in order: winners only go out once the reward is recorded.
+STEPS = ("reward", "winners")
+
+
+@dataclass
+class RoundSubmission:
+    round_num: int
+    reward: int
+    winners: list[str]
+    done: set[str] = field(default_factory=set)
+    attempts: int = 0
+
+
+class RoundSubmissionQueue:
+    """
+    Submits round results to the coordinator from a background thread.
+
+    submit() appends the round to an on-disk journal and returns at once. The
+    worker sends the round's submit_reward and then submit_winners call,
+    journals each as it succeeds and retries failed calls with jittered
+    backoff, one round at a time in round order. On startup, rounds the
+    journal shows as unfinished are replayed, so pending submissions survive
+    restarts. A round is abandoned once the proxy rejects it with a 4xx
+    status other than 429 (e.g. the round is already closed), or after
+    max_attempts failures.
+
+    Journal lines are JSON objects:
+        {"op": "enqueue", "round": 3, "reward": 12, "winners": ["Qm..."]}
+        {"op": "reward", "round": 3}
+        {"op": "winners", "round": 3}
+        {"op": "abandon", "round": 3}
+    """
+
+    def __init__(
+        self,
+        coordinator: SwarmCoordinator,
+        peer_id: str,
+        journal_path: str,
+        max_attempts: int = 8,
+        base_backoff_seconds: float = 5.0,
+        max_backoff_seconds: float = 300.0,
+    ):
+        self.coordinator = coordinator
+        self.peer_id = peer_id
+        self.journal_path = journal_path
+        self.max_attempts = max_attempts
+        self.base_backoff_seconds = base_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+
+        self._cond = threading.Condition()
+        self._journal_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._pending: dict[int, RoundSubmission] = self._replay_journal()
+        self._worker = None
+
+    def __len__(self):
+        with self._cond:
+            return len(self._pending)
+
+    def start(self):
+        if self._worker:
+            return
+        if self._pending:
+            get_logger().info(
+                f"Resuming {len(self._pending)} pending round submissions: {sorted(self._pending)}"
+            )
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def stop(self, timeout: float | None = 30):
+        """Waits up to timeout for pending rounds to be sent, then stops. Unsent rounds stay journaled."""
+        if not self._worker:
+            return
+        with self._cond:
+            self._cond.wait_for(lambda: not self._pending, timeout=timeout)
+            self._stop_event.set()
+            self._cond.notify_all()
+        self._worker.join(timeout=5)
+        self._worker = None
+
+    def submit(self, round_num: int, reward: int, winners: list[str]) -> None:
+        """Durably queues a round's results for submission."""
+        with self._cond:
+            if round_num in self._pending:
+                return
+            self._append({"op": "enqueue", "round": round_num, "reward": reward, "winners": winners})
+            self._pending[round_num] = RoundSubmission(round_num, reward, winners)
+            self._cond.notify_all()
+
+    def _append(self, entry: dict):
+        with self._journal_lock:
+            with open(self.journal_path, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _replay_journal(self) -> dict[int, RoundSubmission]:
+        """Loads unfinished rounds from the journal, then rewrites it with only those rounds."""
+        pending: dict[int, RoundSubmission] = {}
+        if not os.path.exists(self.journal_path):
+            return pending
+
+        with open(self.journal_path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final write from a crash; everything before it is intact.
+                    continue
+                round_num = entry["round"]
+                if entry["op"] == "enqueue":
+                    pending[round_num] = RoundSubmission(round_num, entry["reward"], entry["winners"])
+                elif round_num in pending:
+                    if entry["op"] == "abandon":
+                        del pending[round_num]
+                    else:
+                        pending[round_num].done.add(entry["op"])
+
+        pending = {r: s for r, s in sorted(pending.items()) if len(s.done) < len(STEPS)}
+
+        # Compact so the journal doesn't grow over a long run.
+        tmp_path = self.journal_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            for s in pending.values():
+                f.write(json.dumps({"op": "enqueue", "round": s.round_num, "reward": s.reward, "winners": s.winners}) + "\n")
+                for step in sorted(s.done):
+                    f.write(json.dumps({"op": step, "round": s.round_num}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.journal_path)
+        return pending
+
+    def _call(self, submission: RoundSubmission, step: str):
+        if step == "reward":
+            self.coordinator.submit_reward(submission.round_num, 0, submission.reward, self.peer_id)
+        else:
+            self.coordinator.submit_winners(submission.round_num, submission.winners, self.peer_id)
+
+    def _backoff_seconds(self, attempt: int) -> float:
+        cap = min(self.max_backoff_seconds, self.base_backoff_seconds * 2**attempt)
+        return random.uniform(0, cap)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._stop_event.is_set())
+                if self._stop_event.is_set():
+                    return
+                submission = self._pending[min(self._pending)]
+
+            error = None
+            for step in STEPS:
+                if step in submission.done:
+                    continue
+                try:
+                    self._call(submission, step)
+                except Exception as e:
+                    error = e
+                    break
+                self._append({"op": step, "round": submission.round_num})
+                submission.done.add(step)
+
+            if error is None:
+                get_logger().info(f"Successfully submitted round {submission.round_num} results to blockchain")
+                with self._cond:
+                    del self._pending[submission.round_num]
+                    self._cond.notify_all()
+                continue
+
+            submission.attempts += 1
+            if _is_permanent(error):
+                get_logger().error(
+                    f"Round {submission.round_num} submission was rejected; not retrying: {error}"
+                )
+                self._abandon(submission)
+                continue
+
+            if submission.attempts >= self.max_attempts:
+                get_logger().error(
+                    f"Giving up on round {submission.round_num} submission after {submission.attempts} attempts: {error}\n"
+                    "There is no need to kill the program; later rounds will still be submitted.\n"
+                    "If you encounter this error, please report it to Gensyn by\n"
+                    "filing a github issue here: https://github.com/gensyn-ai/rl-swarm/issues/"
+                )
+                self._abandon(submission)
+                continue
+
+            backoff = self._backoff_seconds(submission.attempts)
+            get_logger().warning(
+                f"Round {submission.round_num} submission failed ({error}); retrying in {backoff:.1f}s"
+            )
+            if self._stop_event.wait(backoff):
+                return
+
+    def _abandon(self, submission: RoundSubmission):
+        self._append({"op": "abandon", "round": submission.round_num})
+        with self._cond:
+            del self._pending[submission.round_num]
+            self._cond.notify_all()
+
+
+def _is_permanent(error: Exception) -> bool:
+    """Whether the proxy rejected the call outright, so retrying can't succeed."""
+    if not isinstance(error, requests.exceptions.HTTPError) or error.response is None:
+        return False
+    status = error.response.status_code
+    return 400 <= status < 500 and status != 429
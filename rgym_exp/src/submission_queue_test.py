@@ -0,0 +1,160 @@
+import json
+import threading
+import time
+
+import pytest
+import requests
+
+from rgym_exp.src.submission_queue import RoundSubmissionQueue
+
+
+def http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.exceptions.HTTPError(f"{status} error", response=response)
+
+
+class FakeCoordinator:
+    def __init__(self):
+        self.calls = []
+        self.failures = {}  # (step, round) -> errors to raise, in order
+        self.lock = threading.Lock()
+
+    def _record(self, step, round_num):
+        with self.lock:
+            errors = self.failures.get((step, round_num))
+            if errors:
+                raise errors.pop(0)
+            self.calls.append((step, round_num))
+
+    def submit_reward(self, round_num, stage_num, reward, peer_id):
+        self._record("reward", round_num)
+
+    def submit_winners(self, round_num, winners, peer_id):
+        self._record("winners", round_num)
+
+
+@pytest.fixture
+def coordinator():
+    return FakeCoordinator()
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return str(tmp_path / "submissions.jsonl")
+
+
+def make_queue(coordinator, journal, **kwargs):
+    kwargs.setdefault("base_backoff_seconds", 0.001)
+    return RoundSubmissionQueue(coordinator, "peer", journal, **kwargs)
+
+
+def read_journal(journal):
+    with open(journal) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_sends_reward_then_winners_in_round_order(coordinator, journal):
+    queue = make_queue(coordinator, journal)
+    queue.submit(2, 10, ["peer"])
+    queue.submit(1, 5, ["peer"])
+    queue.start()
+    queue.stop(timeout=5)
+
+    assert coordinator.calls == [("reward", 1), ("winners", 1), ("reward", 2), ("winners", 2)]
+    assert len(queue) == 0
+
+
+def test_retries_transient_failures(coordinator, journal):
+    coordinator.failures[("winners", 1)] = [http_error(503), requests.exceptions.ConnectionError()]
+    queue = make_queue(coordinator, journal)
+    queue.submit(1, 5, ["peer"])
+    queue.start()
+    queue.stop(timeout=5)
+
+    # The reward is journaled once and not sent again while winners are retried.
+    assert coordinator.calls == [("reward", 1), ("winners", 1)]
+    assert [e["op"] for e in read_journal(journal)] == ["enqueue", "reward", "winners"]
+
+
+def test_winners_wait_for_reward(coordinator, journal):
+    coordinator.failures[("reward", 1)] = [http_error(429)]
+    queue = make_queue(coordinator, journal)
+    queue.submit(1, 5, ["peer"])
+    queue.start()
+    queue.stop(timeout=5)
+
+    assert coordinator.calls == [("reward", 1), ("winners", 1)]
+
+
+def test_rejected_round_is_abandoned_immediately(coordinator, journal):
+    coordinator.failures[("reward", 1)] = [http_error(400)]
+    queue = make_queue(coordinator, journal, base_backoff_seconds=60)
+    queue.submit(1, 5, ["peer"])
+    queue.submit(2, 6, ["peer"])
+    queue.start()
+    queue.stop(timeout=5)
+
+    assert coordinator.calls == [("reward", 2), ("winners", 2)]
+    assert {"op": "abandon", "round": 1} in read_journal(journal)
+
+
+def test_abandons_after_max_attempts(coordinator, journal):
+    coordinator.failures[("reward", 1)] = [http_error(503)] * 3
+    queue = make_queue(coordinator, journal, max_attempts=3)
+    queue.submit(1, 5, ["peer"])
+    queue.submit(2, 6, ["peer"])
+    queue.start()
+    queue.stop(timeout=5)
+
+    assert coordinator.calls == [("reward", 2), ("winners", 2)]
+    assert {"op": "abandon", "round": 1} in read_journal(journal)
+
+
+def test_submit_does_not_wait_for_the_coordinator(coordinator, journal):
+    coordinator.submit_reward = lambda *args: time.sleep(0.5)
+    queue = make_queue(coordinator, journal)
+    queue.start()
+    start = time.monotonic()
+    queue.submit(1, 5, ["peer"])
+    assert time.monotonic() - start < 0.1
+    queue.stop(timeout=0)
+
+
+def test_unsent_rounds_are_replayed_after_restart(coordinator, journal):
+    coordinator.failures[("winners", 1)] = [http_error(503)] * 100
+    queue = make_queue(coordinator, journal, base_backoff_seconds=60)
+    queue.start()
+    queue.submit(1, 5, ["peer"])
+    queue.stop(timeout=0.2)
+    assert coordinator.calls == [("reward", 1)]
+
+    coordinator.failures.clear()
+    restarted = make_queue(coordinator, journal)
+    assert len(restarted) == 1
+    restarted.start()
+    restarted.stop(timeout=5)
+    assert coordinator.calls == [("reward", 1), ("winners", 1)]
+
+
+def test_replay_compacts_journal_and_skips_torn_write(coordinator, journal):
+    entries = [
+        {"op": "enqueue", "round": 1, "reward": 5, "winners": ["peer"]},
+        {"op": "reward", "round": 1},
+        {"op": "winners", "round": 1},
+        {"op": "enqueue", "round": 2, "reward": 6, "winners": ["peer"]},
+        {"op": "abandon", "round": 2},
+        {"op": "enqueue", "round": 3, "reward": 7, "winners": ["peer"]},
+        {"op": "reward", "round": 3},
+    ]
+    with open(journal, "w") as f:
+        f.writelines(json.dumps(e) + "\n" for e in entries)
+        f.write('{"op": "winn')
+
+    queue = make_queue(coordinator, journal)
+    assert len(queue) == 1
+    assert read_journal(journal) == entries[-2:]
+
+    queue.start()
+    queue.stop(timeout=5)
+    assert coordinator.calls == [("winners", 3)]
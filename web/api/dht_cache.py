@@ -0,0 +1,198 @@
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Iterable, Optional
+
+from hivemind.dht import DHT
+
+from hivemind_exp.chain_utils import ModalSwarmCoordinator
+from hivemind_exp.dht_utils import get_dht_value, rewards_key
+from hivemind_exp.name_utils import get_name_from_peer_id
+
+from .kinesis import GossipMessageData
+
+
+class DHTCache:
+    """
+    In-memory copy of the swarm state served by the web API.
+
+    A single background thread refreshes each entry once its TTL expires:
+    the round/stage from the coordinator and the current stage's rewards from
+    the DHT (refetched immediately when the round or stage changes). Gossip is
+    pushed in by GossipDHTPublisher as it publishes, so it costs no extra DHT
+    reads. Handlers only read the latest snapshot, so request rate never turns
+    into DHT lookups. version increases whenever any served value changes.
+    """
+
+    def __init__(
+        self,
+        dht: DHT,
+        coordinator: ModalSwarmCoordinator,
+        logger: logging.Logger | None = None,
+        round_stage_ttl_seconds: float = 30,
+        rewards_ttl_seconds: float = 60,
+        max_gossip: int = 200,
+    ):
+        """
+        Args:
+            dht: The DHT to read rewards from
+            coordinator: The coordinator to get round and stage information from
+            logger: Logger instance
+            round_stage_ttl_seconds: How long a polled round/stage is served before refreshing
+            rewards_ttl_seconds: How long polled rewards are served before refreshing
+            max_gossip: Number of most recent gossip messages kept
+        """
+        self.dht = dht
+        self.coordinator = coordinator
+        self.logger = logger or logging.getLogger(__name__)
+        self.ttl_seconds = {
+            "round_stage": round_stage_ttl_seconds,
+            "rewards": rewards_ttl_seconds,
+        }
+
+        self._clock = time.monotonic
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._poll_thread = None
+
+        # Monotonic time at which each entry is next refreshed.
+        self._expires = {name: 0.0 for name in self.ttl_seconds}
+        self.last_polled = None
+        self.version = 0
+        self.current_round = -1
+        self.current_stage = -1
+        self._leaderboard: dict[str, Any] | None = None
+        self._gossip: deque[dict[str, Any]] = deque(maxlen=max_gossip)
+
+    def start(self):
+        """Start the polling thread."""
+        if self._poll_thread:
+            self.logger.warning("DHTCache is already running")
+            return
+        self._stop_event.clear()
+        self._poll_thread = threading.Thread(target=self._poll_loop, daemon=True)
+        self._poll_thread.start()
+
+    def stop(self):
+        """Stop the polling thread."""
+        if not self._poll_thread:
+            return
+        self._stop_event.set()
+        self._poll_thread.join(timeout=5)
+        self._poll_thread = None
+
+    def get_last_polled(self) -> datetime | None:
+        """Get the time of the last successful round/stage poll."""
+        return self.last_polled
+
+    def get_round_and_stage(self) -> tuple[int, int] | None:
+        if self.last_polled is None:
+            return None
+        with self._lock:
+            return self.current_round, self.current_stage
+
+    def get_leaderboard(self) -> dict[str, Any] | None:
+        """The current stage's rewards, highest score first, or None before the first poll."""
+        return self._leaderboard
+
+    def get_gossip(self) -> list[dict[str, Any]]:
+        """The most recently published gossip, oldest first."""
+        with self._lock:
+            return list(self._gossip)
+
+    def add_gossip(self, messages: Iterable[GossipMessageData]) -> None:
+        """Record published gossip messages."""
+        dumped = [m.model_dump(mode="json", by_alias=True) for m in messages]
+        if not dumped:
+            return
+        with self._lock:
+            self._gossip.extend(dumped)
+            self.version += 1
+
+    def refresh(self) -> None:
+        """Refresh every entry whose TTL has expired."""
+        if self._clock() >= self._expires["round_stage"]:
+            self._refresh_round_stage()
+        if self.last_polled is not None and self._clock() >= self._expires["rewards"]:
+            self._refresh_rewards()
+
+    def _poll_loop(self):
+        while not self._stop_event.is_set():
+            self.refresh()
+            wait = min(self._expires.values()) - self._clock()
+            self._stop_event.wait(max(wait, 0.1))
+
+    def _refresh_round_stage(self):
+        try:
+            new_round, new_stage = self.coordinator.get_round_and_stage()
+        except Exception as e:
+            self.logger.error(
+                "Error refreshing round/stage in DHT cache", extra={"error": str(e)}
+            )
+            # Keep serving the last value, and retry on the next tick.
+            self._expires["round_stage"] = self._clock() + 1
+            return
+
+        with self._lock:
+            changed = (new_round, new_stage) != (self.current_round, self.current_stage)
+            self.current_round = new_round
+            self.current_stage = new_stage
+            if changed:
+                self.version += 1
+        if changed:
+            self.logger.info(
+                "DHT cache round/stage changed",
+                extra={"round": new_round, "stage": new_stage},
+            )
+            self._expires["rewards"] = 0.0
+
+        self.last_polled = datetime.now(timezone.utc)
+        self._expires["round_stage"] = self._clock() + self.ttl_seconds["round_stage"]
+
+    def _refresh_rewards(self):
+        round_num, stage_num = self.current_round, self.current_stage
+        try:
+            rewards = get_dht_value(
+                self.dht, key=rewards_key(round_num, stage_num), beam_size=500
+            )
+        except Exception as e:
+            self.logger.error(
+                "Error refreshing rewards in DHT cache",
+                extra={"error": str(e), "round": round_num, "stage": stage_num},
+            )
+            self._expires["rewards"] = self._clock() + 1
+            return
+
+        leaderboard = _leaderboard(round_num, stage_num, rewards)
+        with self._lock:
+            if leaderboard != self._leaderboard:
+                self._leaderboard = leaderboard
+                self.version += 1
+        self._expires["rewards"] = self._clock() + self.ttl_seconds["rewards"]
+
+
+def _leaderboard(
+    round_num: int, stage_num: int, rewards: Optional[dict[str, Any]]
+) -> dict[str, Any]:
+    leaders = []
+    for peer_id, score in (rewards or {}).items():
+        try:
+            score = float(score)
+        except (TypeError, ValueError):
+            continue
+        leaders.append(
+            {
+                "id": peer_id,
+                "nickname": get_name_from_peer_id(peer_id) or peer_id,
+                "score": score,
+            }
+        )
+    leaders.sort(key=lambda leader: leader["score"], reverse=True)
+    return {
+        "round": round_num,
+        "stage": stage_num,
+        "leaders": leaders,
+        "total": len(leaders),
+    }
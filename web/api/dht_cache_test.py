@@ -0,0 +1,136 @@
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+from hivemind.utils import ValueWithExpiration
+
+from hivemind_exp.dht_utils import rewards_key
+
+from .dht_cache import DHTCache
+from .kinesis import GossipMessageData
+
+TEST_TIME = datetime(2024, 3, 21, 12, 34, 56, 789000, tzinfo=timezone.utc)
+
+
+def _rewards_value(rewards):
+    return ValueWithExpiration(
+        {peer: ValueWithExpiration(score, 0.0) for peer, score in rewards.items()}, 0.0
+    )
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _cache(round_stage=(1, 0), rewards=None):
+    dht = MagicMock()
+    dht.get.return_value = _rewards_value(rewards or {})
+    coordinator = MagicMock()
+    coordinator.get_round_and_stage.return_value = round_stage
+    cache = DHTCache(dht, coordinator, round_stage_ttl_seconds=30, rewards_ttl_seconds=60)
+    cache._clock = FakeClock()
+    return cache
+
+
+def test_empty_before_first_poll():
+    cache = _cache()
+    assert cache.get_last_polled() is None
+    assert cache.get_round_and_stage() is None
+    assert cache.get_leaderboard() is None
+
+
+def test_refresh_populates_round_stage_and_leaderboard():
+    cache = _cache(round_stage=(3, 1), rewards={"peer-a": 1.5, "peer-b": 4.0, "peer-c": "bad"})
+    cache.refresh()
+
+    assert cache.get_last_polled() is not None
+    assert cache.get_round_and_stage() == (3, 1)
+    cache.dht.get.assert_called_once_with(key=rewards_key(3, 1), beam_size=500)
+
+    leaderboard = cache.get_leaderboard()
+    assert leaderboard["round"] == 3
+    assert leaderboard["stage"] == 1
+    assert leaderboard["total"] == 2
+    assert [leader["id"] for leader in leaderboard["leaders"]] == ["peer-b", "peer-a"]
+    assert all(leader["nickname"] for leader in leaderboard["leaders"])
+
+
+def test_refresh_respects_ttls():
+    cache = _cache()
+    cache.refresh()
+    cache.refresh()
+    assert cache.coordinator.get_round_and_stage.call_count == 1
+    assert cache.dht.get.call_count == 1
+
+    cache._clock.now = 31
+    cache.refresh()
+    assert cache.coordinator.get_round_and_stage.call_count == 2
+    assert cache.dht.get.call_count == 1
+
+    cache._clock.now = 61
+    cache.refresh()
+    assert cache.coordinator.get_round_and_stage.call_count == 3
+    assert cache.dht.get.call_count == 2
+
+
+def test_round_change_refreshes_rewards_immediately():
+    cache = _cache(round_stage=(1, 0))
+    cache.refresh()
+
+    cache.coordinator.get_round_and_stage.return_value = (1, 1)
+    cache.dht.get.return_value = _rewards_value({"peer-a": 2.0})
+    cache._clock.now = 31
+    cache.refresh()
+
+    cache.dht.get.assert_called_with(key=rewards_key(1, 1), beam_size=500)
+    assert cache.get_leaderboard()["stage"] == 1
+    assert cache.get_leaderboard()["total"] == 1
+
+
+def test_errors_keep_last_value():
+    cache = _cache(round_stage=(2, 0), rewards={"peer-a": 1.0})
+    cache.refresh()
+    last_polled = cache.get_last_polled()
+
+    cache.coordinator.get_round_and_stage.side_effect = Exception("rpc down")
+    cache.dht.get.side_effect = Exception("dht down")
+    cache._clock.now = 61
+    cache.refresh()
+
+    assert cache.get_last_polled() == last_polled
+    assert cache.get_round_and_stage() == (2, 0)
+    assert cache.get_leaderboard()["total"] == 1
+
+
+def test_gossip_is_bounded():
+    cache = _cache()
+    cache._gossip = type(cache._gossip)(maxlen=2)
+    cache.add_gossip(
+        GossipMessageData(
+            id=f"msg{i}", peerId="peer1", peerName="Peer 1", message="hi", timestamp=TEST_TIME
+        )
+        for i in range(3)
+    )
+
+    gossip = cache.get_gossip()
+    assert [g["id"] for g in gossip] == ["msg1", "msg2"]
+    assert gossip[0]["peerId"] == "peer1"
+    assert gossip[0]["timestamp"] == "2024-03-21T12:34:56.789000Z"
+
+
+def test_version_changes_only_with_served_data():
+    cache = _cache(round_stage=(1, 0), rewards={"peer-a": 1.0})
+    cache.refresh()
+    version = cache.version
+
+    cache._clock.now = 61
+    cache.refresh()
+    assert cache.version == version
+
+    cache.dht.get.return_value = _rewards_value({"peer-a": 2.0})
+    cache._clock.now = 122
+    cache.refresh()
+    assert cache.version == version + 1
@@ -0,0 +1,327 @@
+"""
+DHT polling pipeline, runnable in the API process or in a separate poller process.
+
+In the default mode server.main runs PollingPipeline next to the uvicorn event
+loop. With DHT_SNAPSHOT_PATH set, DHTPollerProcess runs the pipeline (DHT,
+decoding, Kinesis publishing) in its own process instead. That process writes
+the DHT cache to a JSON snapshot file whenever it changes, and each API worker
+process serves a SnapshotDHTCache that reloads the file. Decoding then never
+holds the API's GIL, and any number of uvicorn workers serve the same data.
+"""
+
+import json
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+from datetime import datetime
+from typing import Any
+
+from hivemind_exp.chain_utils import ModalSwarmCoordinator, setup_web3
+
+from . import global_dht
+from .dht_cache import DHTCache
+from .dht_pub import AdaptivePollSchedule, GossipDHTPublisher
+from .gossip_stream import GossipBroadcaster
+from .kinesis import Kinesis
+from .kinesis_sink import BufferedKinesisSink
+from .local_kinesis import LocalKinesisClient
+
+
+class PollingPipeline:
+    """Starts the DHT, DHT cache, Kinesis sink and gossip publisher that feed the API."""
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        broadcaster: GossipBroadcaster | None = None,
+        start_publisher: bool = True,
+    ):
+        """
+        Args:
+            start_publisher: Start the gossip publisher's polling thread. Pass False
+                to start it on an event loop with gossip_publisher.start_async().
+        """
+        contract_addr = os.getenv("CONTRACT_ADDRESS")
+
+        if contract_addr is None:
+            raise Exception("CONTRACT_ADDRESS is required in environment")
+
+        coordinator = ModalSwarmCoordinator(
+            setup_web3(), contract_addr, org_id=""
+        )  # Only allows contract calls
+        initial_peers = coordinator.get_bootnodes()
+
+        # Supplied with the bootstrap node, the client will have access to the DHT.
+        logger.info(f"initializing DHT with peers {initial_peers}")
+
+        kinesis_stream = os.getenv("KINESIS_STREAM", "")
+        self.local_kinesis_client = None
+        if not kinesis_stream and (local_dir := os.getenv("KINESIS_LOCAL_DIR")):
+            # Record gossip to local segment files instead of AWS.
+            kinesis_stream = "local"
+            self.local_kinesis_client = LocalKinesisClient(local_dir)
+
+        kinesis_client = Kinesis(
+            kinesis_stream,
+            client=self.local_kinesis_client,
+            partition_strategy=os.getenv("KINESIS_PARTITION_STRATEGY", "peer"),
+            encoding=os.getenv("KINESIS_ENCODING", "json"),
+            max_entries_per_record=int(os.getenv("KINESIS_ENTRIES_PER_RECORD", "1")),
+        )
+
+        # Publish from a background flusher so slow Kinesis calls don't delay DHT polls.
+        self.kinesis_sink = BufferedKinesisSink(
+            kinesis_client,
+            backpressure=os.getenv("KINESIS_BACKPRESSURE", "block"),
+            block_timeout_seconds=30,
+            spill_dir=os.getenv("KINESIS_SPILL_DIR") or None,
+            logger=logger,
+        )
+        self.kinesis_sink.start()
+
+        global_dht.setup_global_dht(initial_peers, coordinator, logger, kinesis_client)
+        self.dht_cache = global_dht.dht_cache
+
+        # Start publishing to kinesis. This will eventually replace the populate_cache thread.
+        logger.info("Starting gossip publisher")
+        self.gossip_publisher = GossipDHTPublisher(
+            dht=global_dht.dht,
+            kinesis_client=self.kinesis_sink,
+            logger=logger,
+            coordinator=coordinator,
+            poll_interval_seconds=150,  # 2.5 minute
+            # Poll every ~15 seconds around round changes, backing off to 10 minutes when idle.
+            poll_schedule=AdaptivePollSchedule(min_interval_seconds=15, max_interval_seconds=600),
+            decode_workers=int(os.getenv("DHT_DECODE_WORKERS", "0")),
+            dht_cache=self.dht_cache,
+            broadcaster=broadcaster,
+        )
+        if start_publisher:
+            self.gossip_publisher.start()
+
+    def stop(self):
+        if self.gossip_publisher.running:
+            self.gossip_publisher.stop()
+        self.dht_cache.stop()
+        self.kinesis_sink.stop()
+        if self.local_kinesis_client:
+            self.local_kinesis_client.close()
+
+
+def cache_snapshot(cache: DHTCache) -> dict[str, Any]:
+    last_polled = cache.get_last_polled()
+    round_and_stage = cache.get_round_and_stage()
+    return {
+        "version": cache.version,
+        "lastPolled": last_polled.isoformat() if last_polled else None,
+        "roundAndStage": list(round_and_stage) if round_and_stage else None,
+        "leaderboard": cache.get_leaderboard(),
+        "gossip": cache.get_gossip(),
+    }
+
+
+def write_snapshot(path: str, snapshot: dict[str, Any]) -> None:
+    """Writes snapshot to path atomically, so readers never see a partial file."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".snapshot-")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(snapshot, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class SnapshotDHTCache:
+    """
+    Read-only DHTCache backed by a snapshot file written by DHTPollerProcess.
+
+    A background thread reloads the file when it changes; handlers only read
+    the loaded snapshot. When a broadcaster is given, round changes and gossip
+    that is new since the previous snapshot are published to it, so streaming
+    clients of every API worker see the poller's events.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        broadcaster: GossipBroadcaster | None = None,
+        reload_interval_seconds: float = 0.5,
+        logger: logging.Logger | None = None,
+    ):
+        self.path = path
+        self.broadcaster = broadcaster
+        self.reload_interval_seconds = reload_interval_seconds
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._snapshot: dict[str, Any] = {}
+        self._file_id = None
+        self._last_polled = None
+        self._stop_event = threading.Event()
+        self._reload_thread = None
+
+    @property
+    def version(self):
+        return self._snapshot.get("version", 0)
+
+    def start(self):
+        """Load the current snapshot and start the reload thread."""
+        if self._reload_thread:
+            self.logger.warning("SnapshotDHTCache is already running")
+            return
+        self.reload()
+        self._stop_event.clear()
+        self._reload_thread = threading.Thread(target=self._reload_loop, daemon=True)
+        self._reload_thread.start()
+
+    def stop(self):
+        if not self._reload_thread:
+            return
+        self._stop_event.set()
+        self._reload_thread.join(timeout=5)
+        self._reload_thread = None
+
+    def get_last_polled(self) -> datetime | None:
+        return self._last_polled
+
+    def get_round_and_stage(self) -> tuple[int, int] | None:
+        round_and_stage = self._snapshot.get("roundAndStage")
+        return tuple(round_and_stage) if round_and_stage else None
+
+    def get_leaderboard(self) -> dict[str, Any] | None:
+        return self._snapshot.get("leaderboard")
+
+    def get_gossip(self) -> list[dict[str, Any]]:
+        return list(self._snapshot.get("gossip", []))
+
+    def reload(self) -> bool:
+        """Loads the snapshot file if it changed. Returns whether a new snapshot was loaded."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        file_id = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if file_id == self._file_id:
+            return False
+
+        try:
+            with open(self.path) as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.error("Error loading DHT snapshot", extra={"error": str(e)})
+            return False
+
+        previous = self._snapshot
+        self._file_id = file_id
+        last_polled = snapshot.get("lastPolled")
+        # Publish the snapshot before its poll time so handlers never see a
+        # recent poll time with stale data.
+        self._snapshot = snapshot
+        self._last_polled = datetime.fromisoformat(last_polled) if last_polled else None
+        if previous:
+            self._broadcast_changes(previous, snapshot)
+        return True
+
+    def _broadcast_changes(self, previous: dict[str, Any], snapshot: dict[str, Any]):
+        if not self.broadcaster:
+            return
+
+        round_and_stage = snapshot.get("roundAndStage")
+        if round_and_stage and round_and_stage != previous.get("roundAndStage"):
+            round_num, stage_num = round_and_stage
+            self.broadcaster.publish("round", {"round": round_num, "stage": stage_num})
+
+        seen = {g["id"] for g in previous.get("gossip", [])}
+        new_gossip = [g for g in snapshot.get("gossip", []) if g["id"] not in seen]
+        if new_gossip:
+            self.broadcaster.publish("gossip", new_gossip)
+
+    def _reload_loop(self):
+        while not self._stop_event.wait(self.reload_interval_seconds):
+            self.reload()
+
+
+def _run_poller(snapshot_path: str, stop_event, write_interval_seconds: float):
+    # Importing the server configures the JSON log handler in this process.
+    from .server import logger
+
+    pipeline = PollingPipeline(logger)
+    written = None
+    try:
+        while not stop_event.wait(write_interval_seconds):
+            cache = pipeline.dht_cache
+            state = (cache.version, cache.get_last_polled())
+            if state != written:
+                write_snapshot(snapshot_path, cache_snapshot(cache))
+                written = state
+    finally:
+        pipeline.stop()
+
+
+class DHTPollerProcess:
+    """
+    Runs PollingPipeline in a child process that writes DHT cache snapshots to snapshot_path.
+
+    A watchdog thread checks the child every check_interval_seconds and
+    restarts it if it exited (e.g. the DHT crashed or it was OOM killed), so
+    the API never keeps serving a frozen snapshot.
+    """
+
+    def __init__(
+        self,
+        snapshot_path: str,
+        write_interval_seconds: float = 0.5,
+        check_interval_seconds: float = 5.0,
+        logger: logging.Logger | None = None,
+    ):
+        # Spawn rather than fork: the child starts its own DHT threads and event loop.
+        self._ctx = multiprocessing.get_context("spawn")
+        self._stop_event = self._ctx.Event()
+        self._args = (snapshot_path, self._stop_event, write_interval_seconds)
+        self.check_interval_seconds = check_interval_seconds
+        self.logger = logger or logging.getLogger(__name__)
+        self.restarts = 0
+        self.process = None
+
+        self._watchdog = None
+        self._watchdog_stop = threading.Event()
+
+    def _start_process(self):
+        self.process = self._ctx.Process(
+            target=_run_poller,
+            args=self._args,
+            name="dht-poller",
+            # Not a daemon: the DHT and decode workers start processes of their own.
+        )
+        self.process.start()
+
+    def start(self):
+        self._start_process()
+        self._watchdog_stop.clear()
+        self._watchdog = threading.Thread(target=self._watch, daemon=True)
+        self._watchdog.start()
+
+    def _watch(self):
+        while not self._watchdog_stop.wait(self.check_interval_seconds):
+            if self.process.is_alive():
+                continue
+            self.restarts += 1
+            self.logger.error(
+                "DHT poller process exited; restarting",
+                extra={"exitcode": self.process.exitcode, "restarts": self.restarts},
+            )
+            self._start_process()
+
+    def stop(self, timeout: float = 30):
+        # Stop the watchdog first so it doesn't restart the exiting poller.
+        self._watchdog_stop.set()
+        if self._watchdog:
+            self._watchdog.join()
+            self._watchdog = None
+        self._stop_event.set()
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
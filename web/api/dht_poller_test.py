@@ -0,0 +1,128 @@
+import os
+import time
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+from .dht_poller import DHTPollerProcess, SnapshotDHTCache, cache_snapshot, write_snapshot
+
+TEST_TIME = datetime(2024, 3, 21, 12, 34, 56, tzinfo=timezone.utc)
+
+
+def _snapshot(version=1, round_and_stage=(1, 0), gossip_ids=()):
+    return {
+        "version": version,
+        "lastPolled": TEST_TIME.isoformat(),
+        "roundAndStage": list(round_and_stage),
+        "leaderboard": {"round": round_and_stage[0], "leaders": [], "total": 0},
+        "gossip": [{"id": gossip_id} for gossip_id in gossip_ids],
+    }
+
+
+def test_cache_snapshot():
+    cache = MagicMock()
+    cache.version = 3
+    cache.get_last_polled.return_value = TEST_TIME
+    cache.get_round_and_stage.return_value = (2, 1)
+    cache.get_leaderboard.return_value = {"total": 0}
+    cache.get_gossip.return_value = [{"id": "msg1"}]
+
+    assert cache_snapshot(cache) == {
+        "version": 3,
+        "lastPolled": TEST_TIME.isoformat(),
+        "roundAndStage": [2, 1],
+        "leaderboard": {"total": 0},
+        "gossip": [{"id": "msg1"}],
+    }
+
+
+def test_write_snapshot_replaces_atomically(tmp_path):
+    path = str(tmp_path / "snapshot.json")
+    write_snapshot(path, _snapshot(version=1))
+    write_snapshot(path, _snapshot(version=2))
+    assert os.listdir(tmp_path) == ["snapshot.json"]
+
+    cache = SnapshotDHTCache(path)
+    assert cache.reload()
+    assert cache.version == 2
+
+
+def test_snapshot_cache_serves_loaded_snapshot(tmp_path):
+    path = str(tmp_path / "snapshot.json")
+    cache = SnapshotDHTCache(path)
+    assert not cache.reload()
+    assert cache.get_last_polled() is None
+    assert cache.get_round_and_stage() is None
+
+    write_snapshot(path, _snapshot(round_and_stage=(4, 2), gossip_ids=["msg1"]))
+    assert cache.reload()
+    assert not cache.reload()
+    assert cache.get_last_polled() == TEST_TIME
+    assert cache.get_round_and_stage() == (4, 2)
+    assert cache.get_leaderboard()["round"] == 4
+    assert cache.get_gossip() == [{"id": "msg1"}]
+
+
+def test_snapshot_cache_broadcasts_changes(tmp_path):
+    path = str(tmp_path / "snapshot.json")
+    broadcaster = MagicMock()
+    cache = SnapshotDHTCache(path, broadcaster=broadcaster)
+
+    write_snapshot(path, _snapshot(version=1, gossip_ids=["msg1"]))
+    cache.reload()
+    # The first snapshot is the baseline, not news.
+    broadcaster.publish.assert_not_called()
+
+    write_snapshot(path, _snapshot(version=2, round_and_stage=(1, 1), gossip_ids=["msg1", "msg2"]))
+    cache.reload()
+    assert broadcaster.publish.call_args_list[0].args == ("round", {"round": 1, "stage": 1})
+    assert broadcaster.publish.call_args_list[1].args == ("gossip", [{"id": "msg2"}])
+
+
+def test_snapshot_cache_keeps_last_good_snapshot(tmp_path):
+    path = str(tmp_path / "snapshot.json")
+    cache = SnapshotDHTCache(path)
+    write_snapshot(path, _snapshot(version=5))
+    cache.reload()
+
+    with open(path, "w") as f:
+        f.write("{not json")
+    assert not cache.reload()
+    assert cache.version == 5
+
+
+
+class _ExitedProcess:
+    """Stands in for a poller process that crashed right after starting."""
+
+    exitcode = -9
+
+    def __init__(self, **kwargs):
+        self.started = False
+
+    def start(self):
+        self.started = True
+
+    def is_alive(self):
+        return False
+
+    def join(self, timeout=None):
+        pass
+
+
+def test_poller_process_is_restarted_when_it_exits(tmp_path, caplog):
+    poller = DHTPollerProcess(str(tmp_path / "snapshot.json"), check_interval_seconds=0.01)
+    poller._ctx = MagicMock(Process=_ExitedProcess)
+    poller.start()
+    deadline = time.monotonic() + 5
+    while poller.restarts < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    poller.stop()
+
+    assert poller.restarts >= 2
+    assert poller.process.started
+    assert "DHT poller process exited; restarting" in [r.message for r in caplog.records]
+
+    # Once stopped, the watchdog no longer restarts it.
+    restarts = poller.restarts
+    time.sleep(0.05)
+    assert poller.restarts == restarts
@@ -1,13 +1,15 @@
+import asyncio
 import hashlib
 import logging
+import multiprocessing
 import threading
-import time
 import uuid
 import random
 from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
-from typing import Any, Optional
-from .game_tree import Payload, from_bytes
+from typing import Any, Iterable, Optional
 
 from hivemind.dht import DHT
 
@@ -15,6 +17,9 @@ from hivemind_exp.chain_utils import ModalSwarmCoordinator
 from hivemind_exp.dht_utils import get_dht_value, outputs_key, rewards_key
 from hivemind_exp.name_utils import get_name_from_peer_id
 
+from .gossip_dedup import GossipDedupCache
+from .gossip_sampler import StratifiedReservoirSampler
+from .gossip_utils import extract_gossip_fields
 from .kinesis import (
     GossipMessage,
     GossipMessageData,
@@ -22,6 +27,43 @@ from .kinesis import (
 )
 
 
+class AdaptivePollSchedule:
+    """
+    Poll intervals that follow round progression.
+
+    After a poll that saw activity (a round/stage change or peers publishing
+    new values) the next poll comes min_interval_seconds later. Every idle
+    poll multiplies the interval by backoff_factor, up to
+    max_interval_seconds. Intervals are jittered by up to jitter (a fraction)
+    either way so replicas don't poll in lockstep.
+    """
+
+    def __init__(
+        self,
+        min_interval_seconds: float = 15,
+        max_interval_seconds: float = 600,
+        backoff_factor: float = 2.0,
+        jitter: float = 0.1,
+        rng: random.Random | None = None,
+    ):
+        self.min_interval_seconds = min_interval_seconds
+        self.max_interval_seconds = max_interval_seconds
+        self.backoff_factor = backoff_factor
+        self.jitter = jitter
+        self.rng = rng or random.Random()
+        self.interval_seconds = min_interval_seconds
+
+    def next_interval(self, active: bool) -> float:
+        """Returns the seconds to wait before the next poll, given whether the last one saw activity."""
+        if active:
+            self.interval_seconds = self.min_interval_seconds
+        else:
+            self.interval_seconds = min(
+                self.interval_seconds * self.backoff_factor, self.max_interval_seconds
+            )
+        return self.interval_seconds * self.rng.uniform(1 - self.jitter, 1 + self.jitter)
+
+
 class BaseDHTPublisher(ABC):
     """
     Base class for DHT publishers that poll the DHT for changes and publish data to Kinesis.
@@ -35,6 +77,8 @@ class BaseDHTPublisher(ABC):
         logger: logging.Logger,
         poll_interval_seconds: int = 300,  # 5 minutes default
         coordinator: Optional[ModalSwarmCoordinator] = None,
+        step_timeout_seconds: float = 60,
+        poll_schedule: AdaptivePollSchedule | None = None,
     ):
         """
         Initialize the DHT publisher.
@@ -45,23 +89,37 @@ class BaseDHTPublisher(ABC):
             logger: Logger instance
             poll_interval_seconds: How often to poll the DHT (in seconds)
             coordinator: The coordinator to get round and stage information from
+            step_timeout_seconds: Timeout for each network step of an asyncio poll
+            poll_schedule: Adapts the poll interval to activity; polls every
+                poll_interval_seconds if None
         """
         self.dht = dht
         self.kinesis_client = kinesis_client
         self.logger = logger
         self.poll_interval_seconds = poll_interval_seconds
         self.coordinator = coordinator
+        self.step_timeout_seconds = step_timeout_seconds
+        self.poll_schedule = poll_schedule
 
         # Thread control
         self._stop_event = threading.Event()
         self._poll_thread = None
         self.running = False
 
+        # Asyncio control
+        self._async_stop_event = None
+        self._poll_task = None
+        # Worker-thread steps that haven't finished, including ones a poll
+        # stopped waiting for. Polls are skipped until this is empty.
+        self._steps_in_flight: set[asyncio.Future] = set()
+
         # State tracking
         self.current_round = -1
         self.current_stage = -1
         self.last_polled = None
         self.poll_id = None
+        # Set by a poll that saw the round/stage change or new values.
+        self.poll_active = False
 
         # Store the class name for use in logging
         self.class_name = self.__class__.__name__
@@ -92,6 +150,34 @@ class BaseDHTPublisher(ABC):
         self.running = False
         self.logger.info(f"{self.class_name} stopped")
 
+    def start_async(self):
+        """Start polling as a task on the running event loop, e.g. from the FastAPI lifespan."""
+        if self._poll_task:
+            self.logger.warning(f"{self.class_name} is already running")
+            return
+
+        self.logger.info(f"{self.class_name} starting")
+        self._async_stop_event = asyncio.Event()
+        self._poll_task = asyncio.create_task(self._poll_loop_async())
+        self.running = True
+        self.logger.info(f"{self.class_name} started")
+
+    async def stop_async(self):
+        """Stop the polling task, abandoning any poll in progress."""
+        if not self._poll_task:
+            self.logger.warning(f"{self.class_name} is not running")
+            return
+
+        self._async_stop_event.set()
+        self._poll_task.cancel()
+        try:
+            await self._poll_task
+        except asyncio.CancelledError:
+            pass
+        self._poll_task = None
+        self.running = False
+        self.logger.info(f"{self.class_name} stopped")
+
     def get_last_polled(self):
         """Get the time of the last poll."""
         return self.last_polled
@@ -113,23 +199,101 @@ class BaseDHTPublisher(ABC):
     def _get_peer_name_from_id(self, peer_id: str) -> str:
         return get_name_from_peer_id(peer_id) or peer_id
 
+    def _next_poll_interval(self) -> float:
+        if not self.poll_schedule:
+            return self.poll_interval_seconds
+        interval = self.poll_schedule.next_interval(self.poll_active)
+        self.logger.info(
+            "Scheduled next poll",
+            extra={
+                "class": self.class_name,
+                "interval_seconds": round(interval, 1),
+                "active": self.poll_active,
+                "poll_id": self.poll_id,
+            },
+        )
+        return interval
+
+    def _start_poll(self):
+        self.poll_id = str(uuid.uuid4())
+        self.poll_active = False
+
+        self.logger.info(
+            "Polling for round/stage",
+            extra={
+                "class": self.class_name,
+                "round": self.current_round,
+                "stage": self.current_stage,
+                "poll_id": self.poll_id,
+            },
+        )
+
     def _poll_loop(self):
         """Main polling loop."""
 
         while not self._stop_event.is_set():
-            self.poll_id = str(uuid.uuid4())
+            self._start_poll()
+            self._poll_once()
+            self._stop_event.wait(self._next_poll_interval())
 
-            self.logger.info(
-                "Polling for round/stage",
-                extra={
-                    "class": self.class_name,
-                    "round": self.current_round,
-                    "stage": self.current_stage,
-                    "poll_id": self.poll_id,
-                },
+    async def _poll_loop_async(self):
+        """Main polling loop on the event loop; waits on the stop event so stopping is immediate."""
+
+        while not self._async_stop_event.is_set():
+            if self._steps_in_flight:
+                self.logger.warning(
+                    "Skipping poll: previous poll still running",
+                    extra={
+                        "class": self.class_name,
+                        "steps_in_flight": len(self._steps_in_flight),
+                        "poll_id": self.poll_id,
+                    },
+                )
+            else:
+                self._start_poll()
+                await self._poll_once_async()
+            try:
+                await asyncio.wait_for(
+                    self._async_stop_event.wait(), self._next_poll_interval()
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run_step(self, fn, *args, timeout: bool = True):
+        """
+        Runs a blocking step in a worker thread. With timeout, raises
+        asyncio.TimeoutError after step_timeout_seconds. The thread can't be
+        interrupted, so the step stays in _steps_in_flight until it returns
+        and later polls are skipped rather than piling up behind it.
+        """
+        step = asyncio.ensure_future(asyncio.to_thread(fn, *args))
+        self._steps_in_flight.add(step)
+        step.add_done_callback(self._step_done)
+        done, _ = await asyncio.wait(
+            {step}, timeout=self.step_timeout_seconds if timeout else None
+        )
+        if not done:
+            raise asyncio.TimeoutError
+        return step.result()
+
+    def _step_done(self, step: asyncio.Future):
+        self._steps_in_flight.discard(step)
+        # Retrieve the result of abandoned steps so asyncio doesn't log it as unhandled.
+        if not step.cancelled():
+            step.exception()
+
+    async def _poll_once_async(self):
+        """
+        Perform a single poll of the DHT without blocking the event loop.
+        Subclasses may override this to run independent steps concurrently.
+        """
+        try:
+            await self._run_step(self._poll_once)
+        except asyncio.TimeoutError:
+            self.logger.error(
+                "Timed out polling",
+                extra={"class": self.class_name, "poll_id": self.poll_id},
             )
-            self._poll_once()
-            time.sleep(self.poll_interval_seconds)
 
     @abstractmethod
     def _poll_once(self):
@@ -152,124 +316,335 @@ class GossipDHTPublisher(BaseDHTPublisher):
         logger=None,
         poll_interval_seconds: int = 300,
         coordinator=None,
+        poll_schedule: AdaptivePollSchedule | None = None,
+        decode_workers: int = 0,
+        decode_chunk_size: int = 8,
+        parallel_decode_min_peers: int = 32,
+        gossip_sample_size: int = 200,
+        gossip_per_peer_quota: int = 10,
+        gossip_dedup_size: int = 50_000,
+        dht_cache=None,
+        broadcaster=None,
     ):
-        """Initialize the publisher."""
+        """
+        Initialize the publisher.
+
+        Args:
+            decode_workers: Worker processes used to decode peer values. 0 or 1 decodes serially.
+            decode_chunk_size: Peer values sent to a worker per task.
+            parallel_decode_min_peers: Rounds with fewer peers than this are decoded serially.
+            gossip_sample_size: Maximum gossip messages published per poll.
+            gossip_per_peer_quota: Maximum gossip messages published per peer per poll.
+            gossip_dedup_size: Maximum gossip IDs remembered per round to avoid republishing.
+            dht_cache: DHTCache that published gossip is also recorded in, for the web API.
+            broadcaster: GossipBroadcaster that published gossip and round changes are streamed to.
+        """
         super().__init__(
-            dht, kinesis_client, logger, poll_interval_seconds, coordinator=coordinator
+            dht,
+            kinesis_client,
+            logger,
+            poll_interval_seconds,
+            coordinator=coordinator,
+            poll_schedule=poll_schedule,
         )
+        self.decode_workers = decode_workers
+        self.decode_chunk_size = decode_chunk_size
+        self.parallel_decode_min_peers = parallel_decode_min_peers
+        self._decode_executor = None
+        self.gossip_sample_size = gossip_sample_size
+        self.gossip_per_peer_quota = gossip_per_peer_quota
+        self.gossip_dedup = GossipDedupCache(max_size=gossip_dedup_size)
+        self.dht_cache = dht_cache
+        self.broadcaster = broadcaster
+
+        # Per-peer (expiration_time, content digest) of the values already
+        # turned into gossip for _seen_round, so unchanged values are skipped.
+        self._seen_round = None
+        self._seen_versions: dict[str, tuple[Any, bytes]] = {}
+
+        # (round, gossip IDs, peer IDs) of published messages the Kinesis sink
+        # later failed to deliver. Appended from the sink's flusher thread and
+        # drained by the poll, so the messages are built and published again.
+        self._undelivered: deque[tuple[int, set[str], set[str]]] = deque()
 
-    def _poll_once(self):
-        try:
-            new_round, new_stage = self.coordinator.get_round_and_stage()
+    def stop(self):
+        super().stop()
+        self._shutdown_decode_executor()
+
+    async def stop_async(self):
+        await super().stop_async()
+        self._shutdown_decode_executor()
+
+    def _shutdown_decode_executor(self):
+        if self._decode_executor:
+            self._decode_executor.shutdown(wait=False, cancel_futures=True)
+            self._decode_executor = None
+
+    def _decode_peer_values(
+        self, blobs: list[bytes]
+    ) -> Iterable[list[tuple[str, list, str]]]:
+        """Decodes peer values into gossip rows, in order, fanning out to worker processes for large rounds."""
+        if self.decode_workers <= 1 or len(blobs) < self.parallel_decode_min_peers:
+            return map(extract_gossip_fields, blobs)
+
+        if not self._decode_executor:
+            # Spawn rather than fork: the DHT runs its own threads and event loop.
+            self._decode_executor = ProcessPoolExecutor(
+                max_workers=self.decode_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._decode_executor.map(
+            extract_gossip_fields, blobs, chunksize=self.decode_chunk_size
+        )
+
+    def _changed_peer_values(
+        self, round_value: dict[str, Any]
+    ) -> tuple[list[str], list[bytes], dict[str, tuple[Any, bytes]]]:
+        """
+        Returns the peer IDs and values that changed since they were last
+        turned into gossip this round, plus their new versions. A matching
+        expiration time means the peer hasn't republished; otherwise the
+        content digest decides, so identical republished values are skipped too.
+        """
+        if self._seen_round != self.current_round:
+            self._seen_round = self.current_round
+            self._seen_versions = {}
+
+        peer_ids, blobs, versions = [], [], {}
+        for peer_id, value_with_expiration in round_value.items():
+            blob = value_with_expiration.value
+            expiration_time = getattr(value_with_expiration, "expiration_time", None)
+            seen = self._seen_versions.get(peer_id)
+            if seen and expiration_time is not None and seen[0] == expiration_time:
+                continue
+
+            digest = hashlib.blake2b(blob, digest_size=16).digest()
+            if seen and seen[1] == digest:
+                # Same content republished; just remember the new expiration.
+                self._seen_versions[peer_id] = (expiration_time, digest)
+                continue
+
+            peer_ids.append(peer_id)
+            blobs.append(blob)
+            versions[peer_id] = (expiration_time, digest)
+        return peer_ids, blobs, versions
+
+    def _gossip_message(
+        self, peer_id: str, question: str, actions: list, source_dataset: str
+    ) -> tuple[int, dict[str, Any]]:
+        action = random.choice(actions) if actions else ""
+
+        # Stamp the message with the current time.
+        now_utc = datetime.now(timezone.utc)
+        ts = int(now_utc.timestamp())
+
+        # Generate a unique ID for the gossip message.
+        gossip_id = hashlib.md5(f"{question}-{peer_id}-{self.current_round}-{action}-{source_dataset}".encode()).hexdigest()
+        return (
+            ts, {
+                "id": gossip_id,
+                "message": f"{question}...{action}",
+                "node": get_name_from_peer_id(peer_id),
+                "nodeId": peer_id,
+                "dataset": source_dataset,
+            }
+        )
 
+    def _update_round_stage(self, new_round: int, new_stage: int):
+        self.logger.info(
+            "Polled for round/stage",
+            extra={
+                "class": self.class_name,
+                "round": new_round,
+                "stage": new_stage,
+                "poll_id": self.poll_id,
+            }
+        )
+
+        if new_round != self.current_round or new_stage != self.current_stage:
             self.logger.info(
-                "Polled for round/stage",
+                "Round/stage changed",
                 extra={
                     "class": self.class_name,
-                    "round": new_round,
-                    "stage": new_stage,
+                    "old_round": self.current_round,
+                    "old_stage": self.current_stage,
+                    "new_round": new_round,
+                    "new_stage": new_stage,
                     "poll_id": self.poll_id,
                 }
             )
-
-            if new_round != self.current_round or new_stage != self.current_stage:
-                self.logger.info(
-                    "Round/stage changed",
-                    extra={
-                        "class": self.class_name,
-                        "old_round": self.current_round,
-                        "old_stage": self.current_stage,
-                        "new_round": new_round,
-                        "new_stage": new_stage,
-                        "poll_id": self.poll_id,
-                    }
+            self.poll_active = True
+            if self.broadcaster:
+                self.broadcaster.publish(
+                    "round", {"round": new_round, "stage": new_stage}
                 )
 
-            # Update current round and stage
-            self.current_round = new_round
-            self.current_stage = new_stage
-
-            round_gossip = []
-
-            round_data = self.dht.get(str(self.current_round))
-            if not round_data:
-                self.logger.info("No gossip found for round", extra={"round": self.current_round})
-                return
-
-            # Update the last polled time
-            self.last_polled = datetime.now(timezone.utc)
-
-            for peer_id, value_with_expiration in round_data.value.items():
-                bytes = value_with_expiration.value
-                payload_dict = from_bytes(bytes)
-
-                # Flatten the payloads into a list of payloads.
-                all_payloads = []
-                for _, payload_list in payload_dict.items():
-                    all_payloads.extend(payload_list)
-
-                # For each payload, generate a gossip message.
-                for payload in all_payloads:
-                    world_state_tuple = payload.world_state
-                    question = world_state_tuple.environment_states["question"]
-                    actions = payload.actions
-                    source_dataset = world_state_tuple.environment_states["metadata"]["source_dataset"]
-                    action = random.choice(actions) if actions else ""
-
-                    # Stamp the message with the current time.
-                    now_utc = datetime.now(timezone.utc)
-                    ts = int(now_utc.timestamp())
-
-                    # Generate a unique ID for the gossip message.
-                    gossip_id = hashlib.md5(f"{question}-{peer_id}-{self.current_round}-{action}-{source_dataset}".encode()).hexdigest()
-                    round_gossip.append((
-                        ts, {
-                            "id": gossip_id,
-                            "message": f"{question}...{action}",
-                            "node": get_name_from_peer_id(peer_id),
-                            "nodeId": peer_id,
-                            "dataset": source_dataset,
-                        }
-                    ))
-
-            self.logger.info("Got gossip messages", extra={
-                "message_count": len(round_gossip),
-            })
-
-            # Shuffle the gossip messages to attempt to avoid getting only 1 peer, and only publish 200.
-            random.shuffle(round_gossip)
-            round_gossip = round_gossip[:200]
-
-            self._publish_gossip(round_gossip)
+        # Update current round and stage
+        self.current_round = new_round
+        self.current_stage = new_stage
+
+    def _delivery_callback(self, round_num: int, gossip_ids: set[str], peer_ids: set[str]):
+        def on_done(delivered: bool):
+            if not delivered:
+                self._undelivered.append((round_num, gossip_ids, peer_ids))
+
+        return on_done
+
+    def _forget_undelivered(self):
+        """Makes gossip the sink failed to deliver eligible for publishing again."""
+        forgotten = 0
+        while self._undelivered:
+            round_num, gossip_ids, peer_ids = self._undelivered.popleft()
+            self.gossip_dedup.discard(round_num, gossip_ids)
+            if round_num == self._seen_round:
+                for peer_id in peer_ids:
+                    self._seen_versions.pop(peer_id, None)
+            forgotten += len(gossip_ids)
+        if forgotten:
+            self.logger.warning(
+                "Republishing undelivered gossip",
+                extra={"num_messages": forgotten, "poll_id": self.poll_id},
+            )
+
+    def _process_round_data(self, round_data):
+        self._forget_undelivered()
+        if not round_data:
+            self.logger.info("No gossip found for round", extra={"round": self.current_round})
+            return
+
+        # Update the last polled time
+        self.last_polled = datetime.now(timezone.utc)
+
+        peer_ids, blobs, versions = self._changed_peer_values(round_data.value)
+        self.logger.info("Peer values changed since last poll", extra={
+            "changed": len(peer_ids),
+            "unchanged": len(round_data.value) - len(peer_ids),
+            "round": self.current_round,
+            "poll_id": self.poll_id,
+        })
+        if peer_ids:
+            self.poll_active = True
+
+        # Sample while decoding so only the published messages are built and hashed.
+        sampler = StratifiedReservoirSampler(
+            self.gossip_sample_size, self.gossip_per_peer_quota
+        )
+        empty_peers = set()
+        for peer_id, rows in zip(peer_ids, self._decode_peer_values(blobs)):
+            if not rows:
+                empty_peers.add(peer_id)
+            for row in rows:
+                sampler.offer(peer_id, row)
+
+        self.logger.info("Got gossip messages", extra={
+            "message_count": sampler.seen,
+        })
+
+        sample = sampler.sample()
+        round_gossip = [
+            self._gossip_message(peer_id, question, actions, source_dataset)
+            for peer_id, (question, actions, source_dataset) in sample
+        ]
+        if not self._publish_gossip(round_gossip):
+            return
 
+        # Only values that made it into a published sample (or had nothing to
+        # gossip) are marked seen; the rest stay eligible on the next poll.
+        published_peers = empty_peers | {peer_id for peer_id, _ in sample}
+        self._seen_versions.update(
+            (peer_id, version)
+            for peer_id, version in versions.items()
+            if peer_id in published_peers
+        )
+
+    def _poll_once(self):
+        try:
+            new_round, new_stage = self.coordinator.get_round_and_stage()
+            self._update_round_stage(new_round, new_stage)
+            self._process_round_data(self.dht.get(str(self.current_round)))
         except Exception as e:
-            self.logger.error(
-                "Error polling for round/stage in gossip",
-                extra={
-                    "class": self.class_name,
-                    "error": str(e),
-                    "poll_id": self.poll_id,
-                },
-            )
+            self._log_poll_error(e)
 
-    def _publish_gossip(self, gossip: list[tuple[float, dict[str, Any]]]):
+    async def _poll_once_async(self):
+        """
+        Checks the round/stage and fetches the current round's values at the
+        same time, refetching only if the round changed. Each step runs in a
+        worker thread. The network steps are bounded by step_timeout_seconds;
+        processing the values always runs to completion, so it is never
+        abandoned while it updates the seen versions and dedup cache.
+        """
+        try:
+            polled_round = self.current_round
+            steps = [self._run_step(self.coordinator.get_round_and_stage)]
+            if polled_round >= 0:
+                steps.append(self._run_step(self.dht.get, str(polled_round)))
+            round_stage, *round_data = await asyncio.gather(*steps, return_exceptions=True)
+            if isinstance(round_stage, BaseException):
+                raise round_stage
+
+            self._update_round_stage(*round_stage)
+            round_data = round_data[0] if round_data else None
+            if (
+                polled_round < 0
+                or isinstance(round_data, BaseException)
+                or self.current_round != polled_round
+            ):
+                round_data = await self._run_step(self.dht.get, str(self.current_round))
+
+            await self._run_step(self._process_round_data, round_data, timeout=False)
+        except Exception as e:
+            self._log_poll_error(e)
+
+    def _log_poll_error(self, e: Exception):
+        self.logger.error(
+            "Error polling for round/stage in gossip",
+            extra={
+                "class": self.class_name,
+                "error": str(e) or type(e).__name__,
+                "poll_id": self.poll_id,
+            },
+        )
+
+    def _publish_gossip(self, gossip: list[tuple[float, dict[str, Any]]]) -> bool:
         """
         Publish gossip data to Kinesis.
 
         Args:
             gossip_data: The gossip data from the DHT
+
+        Returns:
+            False if publishing failed, True otherwise (including when there was nothing new to publish).
         """
         try:
             if not gossip:
                 self.logger.info("No gossip data to publish")
-                return
+                return True
+
+            # Drop messages already published this round, including repeats within this batch.
+            new_gossip, batch_ids = [], set()
+            for ts, g in gossip:
+                if g["id"] not in batch_ids and self.gossip_dedup.is_new(self.current_round, g["id"]):
+                    batch_ids.add(g["id"])
+                    new_gossip.append((ts, g))
+
+            if len(new_gossip) < len(gossip):
+                self.logger.info(
+                    "Dropped already published gossip",
+                    extra={
+                        "num_dropped": len(gossip) - len(new_gossip),
+                        **self.gossip_dedup.stats(),
+                    },
+                )
+            if not new_gossip:
+                self.logger.info("No new gossip data to publish")
+                return True
 
             self.logger.info(
-                "Publishing gossip messages", extra={"num_messages": len(gossip)}
+                "Publishing gossip messages", extra={"num_messages": len(new_gossip)}
             )
             gossip_data = []
 
-            for ts, g in gossip:
+            for ts, g in new_gossip:
                 dt = datetime.fromtimestamp(ts, tz=timezone.utc)
                 gossip_data.append(
                     GossipMessageData(
@@ -284,12 +659,27 @@ class GossipDHTPublisher(BaseDHTPublisher):
 
             if len(gossip_data) > 0:
                 self.kinesis_client.put_gossip(
-                    GossipMessage(type="gossip", data=gossip_data)
+                    GossipMessage(type="gossip", data=gossip_data),
+                    on_done=self._delivery_callback(
+                        self.current_round,
+                        batch_ids,
+                        {g.peer_id for g in gossip_data},
+                    ),
                 )
+                self.gossip_dedup.add(self.current_round, batch_ids)
+                if self.dht_cache:
+                    self.dht_cache.add_gossip(gossip_data)
+                if self.broadcaster:
+                    self.broadcaster.publish(
+                        "gossip",
+                        [g.model_dump(mode="json", by_alias=True) for g in gossip_data],
+                    )
                 self.logger.info("Successfully published gossip")
+            return True
 
         except Exception as e:
             self.logger.error(
                 "Error publishing gossip",
                 extra={"error": str(e), "poll_id": self.poll_id},
             )
+            return False
@@ -1,4 +1,6 @@
+import asyncio
 import logging
+import random
 import sys
 import time
 from pathlib import Path
@@ -14,7 +16,7 @@ sys.path.append(str(parent_dir))
 # because these functions are only copied over at build time in Docker and aren't available during local testing.
 # This allows us to test the DHTPublisher class without needing the actual hivemind_exp module.
 
-from api.dht_pub import GossipDHTPublisher
+from api.dht_pub import AdaptivePollSchedule, GossipDHTPublisher
 from api.game_tree import Payload, WorldState, to_bytes, from_bytes
 from api.kinesis import GossipMessage, GossipMessageData
 
@@ -208,6 +210,22 @@ class TestGossipDHTPublisher:
         assert caplog.records[0].message == "Publishing gossip messages"
         assert caplog.records[0].num_messages == 2
 
+    def test_publish_gossip_records_and_streams(self):
+        """Test that published gossip also reaches the DHT cache and the stream broadcaster."""
+        self.publisher.dht_cache = MagicMock()
+        self.publisher.broadcaster = MagicMock()
+
+        self.publisher._publish_gossip(
+            [(1000.0, {"id": "id1", "message": "message1", "node": "node1", "nodeId": "peer_id_1"})]
+        )
+
+        cached = self.publisher.dht_cache.add_gossip.call_args[0][0]
+        assert [g.id for g in cached] == ["id1"]
+        event, data = self.publisher.broadcaster.publish.call_args[0]
+        assert event == "gossip"
+        assert data[0]["id"] == "id1"
+        assert data[0]["peerId"] == "peer_id_1"
+
     def test_publish_gossip_no_data(self, caplog):
         """Test publishing gossip when there's no data."""
         # Mock the Kinesis client's put_gossip method
@@ -284,3 +302,377 @@ class TestGossipDHTPublisher:
         assert data_item.peer_name == "solitary finicky meerkat"
         assert data_item.peer_id == "test_peer_id"
         assert data_item.dataset == "calendar_arithmetic"  # Should be from metadata
+
+    def test_poll_once_parallel_decode(self):
+        """Test that decoding in worker processes matches serial decoding."""
+        payloads = {
+            f"peer_{i}": to_bytes({
+                0: [
+                    Payload(
+                        world_state=WorldState(
+                            environment_states={
+                                "question": f"Question {i}?",
+                                "metadata": {"source_dataset": "propositional_logic"},
+                            },
+                            opponent_states=None,
+                            personal_states=None,
+                        ),
+                        actions=[f"answer {i}"],
+                        metadata=None,
+                    )
+                ]
+            })
+            for i in range(3)
+        }
+        self.publisher.dht.get = MagicMock(
+            return_value=MagicMock(
+                value={peer_id: DummyValue(blob) for peer_id, blob in payloads.items()}
+            )
+        )
+        self.publisher.kinesis_client.put_gossip = MagicMock()
+        self.coordinator.get_round_and_stage.return_value = (1, 0)
+
+        self.publisher.decode_workers = 2
+        self.publisher.decode_chunk_size = 1
+        self.publisher.parallel_decode_min_peers = 1
+        try:
+            self.publisher._poll_once()
+            assert self.publisher._decode_executor is not None
+        finally:
+            self.publisher.stop()
+        assert self.publisher._decode_executor is None
+
+        actual_message = self.publisher.kinesis_client.put_gossip.call_args[0][0]
+        messages = sorted((d.peer_id, d.message) for d in actual_message.data)
+        assert messages == [
+            (f"peer_{i}", f"Question {i}?...answer {i}") for i in range(3)
+        ]
+
+    def test_poll_once_skips_unchanged_values(self):
+        """Test that only peers that republished are decoded on later polls."""
+        round_value = self._round_value({"peer_a": "A?", "peer_b": "B?"})
+        self.publisher.dht.get = MagicMock(
+            side_effect=lambda key: MagicMock(value=dict(round_value))
+        )
+        self.publisher.kinesis_client.put_gossip = MagicMock()
+        self.coordinator.get_round_and_stage.return_value = (1, 0)
+
+        def published():
+            if not self.publisher.kinesis_client.put_gossip.called:
+                return []
+            message = self.publisher.kinesis_client.put_gossip.call_args[0][0]
+            self.publisher.kinesis_client.put_gossip.reset_mock()
+            return sorted(d.peer_id for d in message.data)
+
+        self.publisher._poll_once()
+        assert published() == ["peer_a", "peer_b"]
+
+        # Nothing republished.
+        self.publisher._poll_once()
+        assert published() == []
+
+        # peer_a republished the same content, peer_b published new content.
+        round_value.update(
+            self._round_value({"peer_a": "A?", "peer_b": "B2?"}, expiration_time=20.0)
+        )
+        self.publisher._poll_once()
+        assert published() == ["peer_b"]
+
+        # A new round forgets what was seen.
+        self.coordinator.get_round_and_stage.return_value = (2, 0)
+        self.publisher._poll_once()
+        assert published() == ["peer_a", "peer_b"]
+
+    def _round_value(self, questions, expiration_time=10.0):
+        round_value = {}
+        for peer_id, question in questions.items():
+            world_state = WorldState(
+                environment_states={
+                    "question": question,
+                    "metadata": {"source_dataset": "calendar_arithmetic"},
+                },
+                opponent_states=None,
+                personal_states=None,
+            )
+            payload = Payload(world_state=world_state, actions=["4"], metadata=None)
+            v = DummyValue(to_bytes({0: [payload]}))
+            v.expiration_time = expiration_time
+            round_value[peer_id] = v
+        return round_value
+
+    def test_failed_publish_keeps_values_unseen(self):
+        """Values from a poll whose publish failed are turned into gossip on the next poll."""
+        round_value = self._round_value({"peer_a": "A?"})
+        self.publisher.dht.get = MagicMock(return_value=MagicMock(value=round_value))
+        self.coordinator.get_round_and_stage.return_value = (1, 0)
+
+        self.publisher.kinesis_client.put_gossip = MagicMock(side_effect=Exception("boom"))
+        self.publisher._poll_once()
+        assert "peer_a" not in self.publisher._seen_versions
+
+        self.publisher.kinesis_client.put_gossip = MagicMock()
+        self.publisher._poll_once()
+        message = self.publisher.kinesis_client.put_gossip.call_args[0][0]
+        assert [d.peer_id for d in message.data] == ["peer_a"]
+        assert "peer_a" in self.publisher._seen_versions
+
+    def test_unsampled_peers_stay_eligible(self):
+        """Peers left out of one poll's sample get their turn on later polls."""
+        self.publisher.gossip_sample_size = 1
+        round_value = self._round_value({"peer_a": "A?", "peer_b": "B?", "peer_c": "C?"})
+        self.publisher.dht.get = MagicMock(return_value=MagicMock(value=round_value))
+        self.publisher.kinesis_client.put_gossip = MagicMock()
+        self.coordinator.get_round_and_stage.return_value = (1, 0)
+
+        published = []
+        for _ in range(3):
+            self.publisher._poll_once()
+            message = self.publisher.kinesis_client.put_gossip.call_args[0][0]
+            self.publisher.kinesis_client.put_gossip.reset_mock()
+            published.extend(d.peer_id for d in message.data)
+        assert sorted(published) == ["peer_a", "peer_b", "peer_c"]
+
+        # Everyone has been published, so there is nothing left to decode.
+        self.publisher._poll_once()
+        self.publisher.kinesis_client.put_gossip.assert_not_called()
+
+    def test_undelivered_gossip_is_republished(self):
+        """Gossip the sink accepted but failed to deliver is published again on the next poll."""
+        round_value = self._round_value({"peer_a": "A?"})
+        self.publisher.dht.get = MagicMock(return_value=MagicMock(value=round_value))
+        self.coordinator.get_round_and_stage.return_value = (1, 0)
+        self.publisher.kinesis_client.put_gossip = MagicMock()
+
+        self.publisher._poll_once()
+        message, on_done = self._put_gossip_call()
+        assert [d.peer_id for d in message.data] == ["peer_a"]
+
+        # Delivered: nothing left to publish.
+        on_done(True)
+        self.publisher._poll_once()
+        self.publisher.kinesis_client.put_gossip.assert_not_called()
+
+        # The flush failed after put_gossip returned.
+        round_value.update(self._round_value({"peer_a": "A2?"}, expiration_time=20.0))
+        self.publisher._poll_once()
+        message, on_done = self._put_gossip_call()
+        on_done(False)
+        self.publisher._poll_once()
+        republished, _ = self._put_gossip_call()
+        assert [d.id for d in republished.data] == [d.id for d in message.data]
+
+    def _put_gossip_call(self):
+        put_gossip = self.publisher.kinesis_client.put_gossip
+        put_gossip.assert_called_once()
+        call_args = put_gossip.call_args
+        put_gossip.reset_mock()
+        return call_args[0][0], call_args[1]["on_done"]
+
+    def test_publish_gossip_drops_already_published(self, caplog):
+        """Test that gossip IDs are only published once per round."""
+        caplog.set_level(logging.INFO)
+
+        def gossip(gossip_id):
+            return (
+                1000.0,
+                {"id": gossip_id, "message": "m", "node": "n", "nodeId": "p"},
+            )
+
+        self.publisher.kinesis_client.put_gossip = MagicMock()
+        self.publisher.current_round = 1
+
+        self.publisher._publish_gossip([gossip("id1"), gossip("id1"), gossip("id2")])
+        message = self.publisher.kinesis_client.put_gossip.call_args[0][0]
+        assert [d.id for d in message.data] == ["id1", "id2"]
+
+        self.publisher.kinesis_client.put_gossip.reset_mock()
+        self.publisher._publish_gossip([gossip("id2"), gossip("id3")])
+        message = self.publisher.kinesis_client.put_gossip.call_args[0][0]
+        assert [d.id for d in message.data] == ["id3"]
+        assert self.publisher.gossip_dedup.hits == 1
+
+        # Nothing new: Kinesis isn't called at all.
+        self.publisher.kinesis_client.put_gossip.reset_mock()
+        self.publisher._publish_gossip([gossip("id3")])
+        self.publisher.kinesis_client.put_gossip.assert_not_called()
+
+        # A failed publish doesn't mark IDs as published.
+        self.publisher.kinesis_client.put_gossip.side_effect = Exception("boom")
+        self.publisher._publish_gossip([gossip("id4")])
+        self.publisher.kinesis_client.put_gossip.side_effect = None
+        self.publisher.kinesis_client.put_gossip.reset_mock()
+        self.publisher._publish_gossip([gossip("id4")])
+        self.publisher.kinesis_client.put_gossip.assert_called_once()
+
+        # A new round starts from scratch.
+        self.publisher.current_round = 2
+        self.publisher.kinesis_client.put_gossip.reset_mock()
+        self.publisher._publish_gossip([gossip("id1")])
+        self.publisher.kinesis_client.put_gossip.assert_called_once()
+
+    def test_poll_once_async_runs_steps_concurrently(self):
+        """Test that the round check and the DHT get overlap when the round is known."""
+        def slow(result):
+            def fn(*args):
+                time.sleep(0.2)
+                return result
+            return fn
+
+        self.publisher.current_round = 1
+        self.publisher.current_stage = 0
+        self.coordinator.get_round_and_stage.side_effect = slow((1, 0))
+        self.mock_dht.get.side_effect = slow(None)
+
+        start = time.monotonic()
+        asyncio.run(self.publisher._poll_once_async())
+        assert time.monotonic() - start < 0.35
+        self.mock_dht.get.assert_called_once_with("1")
+
+    def test_poll_once_async_refetches_after_round_change(self):
+        """Test that the round's values are fetched again when the round changed."""
+        self.publisher.current_round = 1
+        self.coordinator.get_round_and_stage.return_value = (2, 0)
+        self.mock_dht.get.return_value = None
+
+        asyncio.run(self.publisher._poll_once_async())
+        assert self.mock_dht.get.call_args_list == [call("1"), call("2")]
+        assert self.publisher.current_round == 2
+
+    def test_poll_once_async_step_timeout(self, caplog):
+        """Test that a hung RPC fails the poll instead of stalling it."""
+        self.publisher.step_timeout_seconds = 0.05
+        self.coordinator.get_round_and_stage.side_effect = lambda: time.sleep(0.5)
+
+        async def run():
+            start = time.monotonic()
+            await self.publisher._poll_once_async()
+            return time.monotonic() - start
+
+        # The abandoned thread finishes on its own; asyncio.run waits for it on exit.
+        assert asyncio.run(run()) < 0.4
+        assert caplog.records[-1].message == "Error polling for round/stage in gossip"
+        assert caplog.records[-1].error == "TimeoutError"
+        assert self.publisher.current_round == -1
+
+    def test_poll_once_async_does_not_time_out_processing(self, caplog):
+        """Test that processing the round's values always runs to completion."""
+        self.publisher.step_timeout_seconds = 0.05
+        self.publisher.current_round = 1
+        self.coordinator.get_round_and_stage.return_value = (1, 0)
+        self.mock_dht.get.return_value = None
+        processed = []
+        self.publisher._process_round_data = lambda data: (time.sleep(0.2), processed.append(data))
+
+        asyncio.run(self.publisher._poll_once_async())
+        assert processed == [None]
+        assert not self.publisher._steps_in_flight
+        assert "Error polling for round/stage in gossip" not in [r.message for r in caplog.records]
+
+    def test_polls_skipped_while_step_in_flight(self, caplog):
+        """Test that a hung step isn't joined by another copy on every later poll."""
+        self.publisher.poll_interval_seconds = 0.02
+        self.publisher.step_timeout_seconds = 0.02
+        self.coordinator.get_round_and_stage.side_effect = lambda: time.sleep(0.3)
+
+        async def run():
+            self.publisher.start_async()
+            await asyncio.sleep(0.2)
+            await self.publisher.stop_async()
+
+        asyncio.run(run())
+        assert self.coordinator.get_round_and_stage.call_count == 1
+        assert "Skipping poll: previous poll still running" in [r.message for r in caplog.records]
+
+    def test_stop_async_shuts_down_decode_executor(self):
+        """Test that stopping the asyncio publisher also stops the decode workers."""
+        executor = MagicMock()
+        self.publisher._decode_executor = executor
+        self.publisher.poll_interval_seconds = 60
+        self.coordinator.get_round_and_stage.return_value = (1, 0)
+        self.mock_dht.get.return_value = None
+
+        async def run():
+            self.publisher.start_async()
+            await asyncio.sleep(0.05)
+            await self.publisher.stop_async()
+
+        asyncio.run(run())
+        executor.shutdown.assert_called_once()
+        assert self.publisher._decode_executor is None
+
+    def test_stop_async_is_immediate(self):
+        """Test that stopping doesn't wait for the poll interval or a poll in progress."""
+        self.publisher.poll_interval_seconds = 60
+        self.coordinator.get_round_and_stage.side_effect = lambda: time.sleep(0.5)
+
+        async def run():
+            self.publisher.start_async()
+            assert self.publisher.running
+            await asyncio.sleep(0.05)
+            start = time.monotonic()
+            await self.publisher.stop_async()
+            return time.monotonic() - start
+
+        assert asyncio.run(run()) < 0.1
+        assert self.publisher.running is False
+
+    def test_poll_marks_activity(self):
+        """Test that round changes and new values mark the poll active, and idle polls don't."""
+        self.coordinator.get_round_and_stage.return_value = (1, 0)
+        self.mock_dht.get.return_value = None
+        self.publisher._start_poll()
+        self.publisher._poll_once()
+        assert self.publisher.poll_active
+
+        self.publisher._start_poll()
+        self.publisher._poll_once()
+        assert not self.publisher.poll_active
+
+        world_state = WorldState(
+            environment_states={"question": "Q?", "metadata": {"source_dataset": "math"}},
+            opponent_states=None,
+            personal_states=None,
+        )
+        payload = Payload(world_state=world_state, actions=["A"], metadata=None)
+        value = DummyValue(to_bytes({0: [payload]}))
+        value.expiration_time = 10.0
+        self.mock_dht.get.return_value = DummyValue({"peer_a": value})
+        self.publisher._start_poll()
+        self.publisher._poll_once()
+        assert self.publisher.poll_active
+
+        self.publisher._start_poll()
+        self.publisher._poll_once()
+        assert not self.publisher.poll_active
+
+    def test_next_poll_interval_uses_schedule(self):
+        """Test that the poll interval is fixed without a schedule and adaptive with one."""
+        assert self.publisher._next_poll_interval() == 0.1
+
+        self.publisher.poll_schedule = AdaptivePollSchedule(
+            min_interval_seconds=10, max_interval_seconds=100, jitter=0
+        )
+        self.publisher.poll_active = False
+        assert self.publisher._next_poll_interval() == 20
+        self.publisher.poll_active = True
+        assert self.publisher._next_poll_interval() == 10
+
+
+class TestAdaptivePollSchedule:
+    """Tests for the AdaptivePollSchedule class."""
+
+    def test_backs_off_while_idle(self):
+        schedule = AdaptivePollSchedule(
+            min_interval_seconds=15, max_interval_seconds=100, jitter=0
+        )
+        assert [schedule.next_interval(False) for _ in range(4)] == [30, 60, 100, 100]
+        assert schedule.next_interval(True) == 15
+        assert schedule.next_interval(False) == 30
+
+    def test_jitter_stays_in_bounds(self):
+        schedule = AdaptivePollSchedule(
+            min_interval_seconds=10, max_interval_seconds=10, jitter=0.2, rng=random.Random(0)
+        )
+        intervals = [schedule.next_interval(True) for _ in range(100)]
+        assert all(8 <= interval <= 12 for interval in intervals)
+        assert len(set(intervals)) > 1
@@ -1,8 +1,11 @@
+import codecs
 import sys
 import struct # Added for float serialization
+from collections import namedtuple
+from functools import lru_cache
 from types import NoneType
 from dataclasses import dataclass
-from typing import Any, Dict, List, Tuple, Type
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Type
 
 @dataclass
 class Payload(dict):
@@ -37,31 +40,42 @@ class ObjType:
     WORLD_STATE = 8
     NONE = 9
 
+# Wire format versions understood by from_bytes.
+WIRE_V1 = 1
+WIRE_V2 = 2
+_V2_MAGIC = b"\xa7GT" + bytes((WIRE_V2,))
+
 #### Deserialization methods ####
 
+# Readers take any buffer and decode in place at offset i. from_bytes wraps the
+# blob in a memoryview so headers are unpacked without slicing and payload
+# slices are zero-copy views.
+_U64 = struct.Struct(">Q")
+_F64 = struct.Struct(">d")
+
+
 def int_from_bytes(b: bytes, i: int) -> Tuple[int, int]:
-    n_bytes = int.from_bytes(b[i : (i + 8)], byteorder="big", signed=False)
+    n_bytes = _U64.unpack_from(b, i)[0]
     i += 8
     value = int.from_bytes(b[i : (i + n_bytes)], byteorder="big", signed=True)
     return value, i + n_bytes
 
 def float_from_bytes(b: bytes, i: int) -> Tuple[float, int]:
-    n_bytes = int.from_bytes(b[i : (i + 8)], byteorder="big", signed=False)
+    n_bytes = _U64.unpack_from(b, i)[0]
     i += 8
-    value_tuple = struct.unpack('>d', b[i : (i + n_bytes)])
-    value = value_tuple[0] # struct.unpack returns a tuple
+    value = _F64.unpack_from(b, i)[0]
     return value, i + n_bytes
 
 def string_from_bytes(b: bytes, i: int) -> Tuple[str, int]:
-    n_bytes = int.from_bytes(b[i : (i + 8)], byteorder="big", signed=False)
+    n_bytes = _U64.unpack_from(b, i)[0]
     i += 8
-    s = b[i : (i + n_bytes)].decode("utf-8")
+    s = codecs.utf_8_decode(b[i : (i + n_bytes)], "strict", True)[0]
     i += n_bytes
     return s, i
 
 
 def list_from_bytes(b: bytes, i: int) -> Tuple[List[Any], int]:
-    n_items = int.from_bytes(b[i : (i + 8)], byteorder="big", signed=False)
+    n_items = _U64.unpack_from(b, i)[0]
     i += 8
     out = [None] * n_items
 
@@ -71,7 +85,7 @@ def list_from_bytes(b: bytes, i: int) -> Tuple[List[Any], int]:
 
 
 def dict_from_bytes(b: bytes, i: int) -> Tuple[List[Any], int]:
-    n_items = int.from_bytes(b[i : (i + 8)], byteorder="big", signed=False)
+    n_items = _U64.unpack_from(b, i)[0]
     i += 8
     out = {}
     for _ in range(n_items):
@@ -109,10 +123,13 @@ _DESERIALIZATION_METHOD = {ObjType.LIST: list_from_bytes,
                             ObjType.NONE: none_from_bytes}
 
 def from_bytes(b: bytes) -> Any:
-    return _from_bytes(b, 0)[0]
+    """Decodes a blob written by to_bytes in either wire format."""
+    with memoryview(b) as view:
+        fmt, i = _wire_format(view)
+        return _decode(view, i, fmt)[0]
 
 def _from_bytes(b: bytes, i: int) -> Tuple[Any, int]:
-    obj_type = int.from_bytes(b[i : (i + 8)], byteorder="big", signed=False)
+    obj_type = _U64.unpack_from(b, i)[0]
     i += 8
     return serializer_from_bytes(obj_type)(b, i)
 
@@ -125,74 +142,68 @@ def serializer_from_bytes(obj_type: ObjType):
 
 #### Serialization methods ####
 
-def boolean_to_bytes(obj: bool) -> bytes:
-    type_bytes = ObjType.BOOLEAN.to_bytes(length=8, byteorder="big", signed=False)
-    bool_bytes = b"0" if not obj else b"1"
-    return type_bytes + bool_bytes
-
-def none_to_bytes(obj: None) -> bytes:
-    return ObjType.NONE.to_bytes(length=8, byteorder="big", signed=False)
-
-def payload_to_bytes(obj: Payload) -> bytes:
-    type_bytes = ObjType.PAYLOAD.to_bytes(length=8, byteorder="big", signed=False)
-    world_state_bytes = to_bytes(obj.world_state)
-    actions_bytes = to_bytes(obj.actions)
-    metadata_bytes = to_bytes(obj.metadata)
-    return type_bytes + world_state_bytes + actions_bytes + metadata_bytes
-
-def world_state_to_bytes(obj: WorldState) -> bytes:
-    type_bytes = ObjType.WORLD_STATE.to_bytes(length=8, byteorder="big", signed=False)
-    environment_states_bytes = to_bytes(obj.environment_states)
-    opponent_states_bytes = to_bytes(obj.opponent_states)
-    personal_bytes = to_bytes(obj.personal_states)
-    return type_bytes + environment_states_bytes + opponent_states_bytes + personal_bytes
-    
-def int_to_bytes(obj: int) -> bytes:
-    type_bytes = ObjType.INTEGER.to_bytes(length=8, byteorder="big", signed=False)
+# Serializers append to a single bytearray and push child objects onto an
+# explicit stack instead of recursing, so nested payloads are written exactly
+# once and arbitrarily deep trees don't hit the recursion limit. Children are
+# pushed in reverse so they pop off the stack in serialization order.
+_TYPE_HEADERS = {obj_type: _U64.pack(obj_type) for obj_type in range(ObjType.LIST, ObjType.NONE + 1)}
+_FLOAT_SIZE_HEADER = _U64.pack(_F64.size)
+
+
+def boolean_to_buffer(obj: bool, buf: bytearray, stack: List[Any]) -> None:
+    buf += _TYPE_HEADERS[ObjType.BOOLEAN]
+    buf += b"0" if not obj else b"1"
+
+def none_to_buffer(obj: None, buf: bytearray, stack: List[Any]) -> None:
+    buf += _TYPE_HEADERS[ObjType.NONE]
+
+def payload_to_buffer(obj: Payload, buf: bytearray, stack: List[Any]) -> None:
+    buf += _TYPE_HEADERS[ObjType.PAYLOAD]
+    stack += (obj.metadata, obj.actions, obj.world_state)
+
+def world_state_to_buffer(obj: WorldState, buf: bytearray, stack: List[Any]) -> None:
+    buf += _TYPE_HEADERS[ObjType.WORLD_STATE]
+    stack += (obj.personal_states, obj.opponent_states, obj.environment_states)
+
+def int_to_buffer(obj: int, buf: bytearray, stack: List[Any]) -> None:
     byte_length = sys.getsizeof(obj)
-    int_bytes = obj.to_bytes(length=byte_length, byteorder="big", signed=True)
-    size_header = byte_length.to_bytes(length=8, byteorder="big", signed=False)
-    return type_bytes + size_header + int_bytes
-
-def float_to_bytes(obj: float) -> bytes:
-    type_bytes = ObjType.FLOAT.to_bytes(length=8, byteorder="big", signed=False)
-    packed_float_bytes = struct.pack('>d', obj)
-    byte_length = len(packed_float_bytes) # This will be 8 for '>d'
-    size_header = byte_length.to_bytes(length=8, byteorder="big", signed=False)
-    return type_bytes + size_header + packed_float_bytes
-
-def string_to_bytes(obj: str) -> bytes:
+    buf += _TYPE_HEADERS[ObjType.INTEGER]
+    buf += _U64.pack(byte_length)
+    buf += obj.to_bytes(length=byte_length, byteorder="big", signed=True)
+
+def float_to_buffer(obj: float, buf: bytearray, stack: List[Any]) -> None:
+    buf += _TYPE_HEADERS[ObjType.FLOAT]
+    buf += _FLOAT_SIZE_HEADER
+    buf += _F64.pack(obj)
+
+def string_to_buffer(obj: str, buf: bytearray, stack: List[Any]) -> None:
     serialized_obj = obj.encode("utf-8")
-    type_bytes = ObjType.STRING.to_bytes(length=8, byteorder="big", signed=False)
-    len_bytes = len(serialized_obj).to_bytes(length=8, byteorder="big", signed=False)
-    return type_bytes + len_bytes + serialized_obj
-
-def dict_to_bytes(obj: Dict[Any, Any]) -> bytes:
-    type_bytes = ObjType.DICT.to_bytes(length=8, byteorder="big", signed=False)
-    len_bytes = len(obj).to_bytes(length=8, byteorder="big", signed=False)
-    dict_bytes = []
-    for key, value in obj.items():
-        dict_bytes.append(to_bytes(key))
-        dict_bytes.append(to_bytes(value))
-    return type_bytes + len_bytes + b"".join(dict_bytes)
-
-def list_to_bytes(obj: List[Any]) -> bytes:
-    type_bytes = ObjType.LIST.to_bytes(length=8, byteorder="big", signed=False)
-    count_bytes = len(obj).to_bytes(length=8, byteorder="big", signed=False)
-    header = type_bytes + count_bytes
-    serialized_list = [to_bytes(x) for x in obj]
-    return header + b"".join(serialized_list)
+    buf += _TYPE_HEADERS[ObjType.STRING]
+    buf += _U64.pack(len(serialized_obj))
+    buf += serialized_obj
+
+def dict_to_buffer(obj: Dict[Any, Any], buf: bytearray, stack: List[Any]) -> None:
+    buf += _TYPE_HEADERS[ObjType.DICT]
+    buf += _U64.pack(len(obj))
+    for key, value in reversed(obj.items()):
+        stack.append(value)
+        stack.append(key)
+
+def list_to_buffer(obj: List[Any], buf: bytearray, stack: List[Any]) -> None:
+    buf += _TYPE_HEADERS[ObjType.LIST]
+    buf += _U64.pack(len(obj))
+    stack.extend(reversed(obj))
 
 _SERIALIZATION_METHOD = {
-    ObjType.BOOLEAN: boolean_to_bytes,
-    ObjType.NONE: none_to_bytes,
-    ObjType.PAYLOAD: payload_to_bytes,
-    ObjType.WORLD_STATE: world_state_to_bytes,
-    ObjType.INTEGER: int_to_bytes,
-    ObjType.FLOAT: float_to_bytes,
-    ObjType.STRING: string_to_bytes,
-    ObjType.DICT: dict_to_bytes,
-    ObjType.LIST: list_to_bytes
+    ObjType.BOOLEAN: boolean_to_buffer,
+    ObjType.NONE: none_to_buffer,
+    ObjType.PAYLOAD: payload_to_buffer,
+    ObjType.WORLD_STATE: world_state_to_buffer,
+    ObjType.INTEGER: int_to_buffer,
+    ObjType.FLOAT: float_to_buffer,
+    ObjType.STRING: string_to_buffer,
+    ObjType.DICT: dict_to_buffer,
+    ObjType.LIST: list_to_buffer
 }
 
 def serializer_to_bytes(obj_type: Type):
@@ -202,31 +213,418 @@ def serializer_to_bytes(obj_type: Type):
         )
     return _SERIALIZATION_METHOD[obj_type]
 
+_OBJTYPE_BY_TYPE = {
+    bool: ObjType.BOOLEAN,
+    NoneType: ObjType.NONE,
+    Payload: ObjType.PAYLOAD,
+    WorldState: ObjType.WORLD_STATE,
+    int: ObjType.INTEGER,
+    float: ObjType.FLOAT,
+    str: ObjType.STRING,
+    dict: ObjType.DICT,
+    list: ObjType.LIST,
+}
+
 def _type_to_objtype(obj_type: Type) -> ObjType:
     """Maps Python types to ObjType constants"""
-    if obj_type is bool:
-        return ObjType.BOOLEAN
-    elif obj_type is NoneType:
-        return ObjType.NONE
-    elif obj_type is Payload:
-        return ObjType.PAYLOAD
-    elif obj_type is WorldState:
-        return ObjType.WORLD_STATE
-    elif obj_type is int:
-        return ObjType.INTEGER
-    elif obj_type is float:
-        return ObjType.FLOAT
-    elif obj_type is str:
-        return ObjType.STRING
-    elif obj_type is dict:
-        return ObjType.DICT
-    elif obj_type is list:
-        return ObjType.LIST
+    try:
+        return _OBJTYPE_BY_TYPE[obj_type]
+    except KeyError:
+        raise RuntimeError(f"Unsupported type: {obj_type}") from None
+
+def to_bytes_into(obj: Any, buf: bytearray, version: int = WIRE_V1) -> int:
+    """
+    Appends the serialized form of obj to buf and returns the number of bytes
+    written. Output is identical to to_bytes(obj, version).
+    """
+    if version == WIRE_V2:
+        methods = _SERIALIZATION_METHOD_V2
+    elif version == WIRE_V1:
+        methods = _SERIALIZATION_METHOD
     else:
-        raise RuntimeError(f"Unsupported type: {obj_type}")
+        raise RuntimeError(f"Unsupported wire format version: {version}")
 
-def to_bytes(obj: Any) -> bytes:
-    obj_type = _type_to_objtype(type(obj))
-    return serializer_to_bytes(obj_type)(obj)
+    start = len(buf)
+    if version == WIRE_V2:
+        buf += _V2_MAGIC
 
+    stack = [obj]
+    pop = stack.pop
+    while stack:
+        obj = pop()
+        methods[_type_to_objtype(type(obj))](obj, buf, stack)
+    return len(buf) - start
+
+def to_bytes(obj: Any, version: int = WIRE_V1) -> bytes:
+    """
+    Serializes obj. v1 is the format every swarm node understands; v2 is the
+    compact format and is only readable by decoders that know its magic prefix.
+    """
+    buf = bytearray()
+    to_bytes_into(obj, buf, version)
+    return bytes(buf)
+
+#### Compact (v2) wire format ####
+
+# v2 blobs start with a magic prefix ending in the version byte. A v1 blob
+# starts with an 8-byte big-endian type tag whose first byte is always zero,
+# so the two formats can never be confused. After the prefix, every object is
+# a 1-byte type tag followed by:
+#   INTEGER      zigzag varint
+#   FLOAT        8-byte big-endian double
+#   STRING       varint byte length + UTF-8 bytes
+#   BOOLEAN      1 byte, 0 or 1
+#   LIST, DICT   varint item count + items (keys and values alternate)
+#   PAYLOAD, WORLD_STATE  their three fields in declaration order
+#   NONE         nothing
+_SMALL_VARINTS = [bytes((n,)) for n in range(0x80)]
+_TAG_BYTES = {obj_type: bytes((obj_type,)) for obj_type in range(ObjType.LIST, ObjType.NONE + 1)}
+
+
+def _encode_varint(n: int) -> bytes:
+    if n < 0x80:
+        return _SMALL_VARINTS[n]
+    out = bytearray()
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+    return bytes(out)
+
+def _read_varint(b: bytes, i: int) -> Tuple[int, int]:
+    byte = b[i]
+    i += 1
+    if byte < 0x80:
+        return byte, i
+    result = byte & 0x7F
+    shift = 7
+    while True:
+        byte = b[i]
+        i += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, i
+        shift += 7
+
+def _zigzag(n: int) -> int:
+    return n << 1 if n >= 0 else ((-n) << 1) - 1
+
+def _unzigzag(z: int) -> int:
+    return (z >> 1) ^ -(z & 1)
+
+def int_from_bytes_v2(b: bytes, i: int) -> Tuple[int, int]:
+    z, i = _read_varint(b, i)
+    return _unzigzag(z), i
+
+def float_from_bytes_v2(b: bytes, i: int) -> Tuple[float, int]:
+    return _F64.unpack_from(b, i)[0], i + 8
+
+def string_from_bytes_v2(b: bytes, i: int) -> Tuple[str, int]:
+    n_bytes, i = _read_varint(b, i)
+    s = codecs.utf_8_decode(b[i : (i + n_bytes)], "strict", True)[0]
+    return s, i + n_bytes
+
+def boolean_from_bytes_v2(b: bytes, i: int) -> Tuple[bool, int]:
+    return b[i] != 0, i + 1
+
+def list_from_bytes_v2(b: bytes, i: int) -> Tuple[List[Any], int]:
+    n_items, i = _read_varint(b, i)
+    out = [None] * n_items
+    for k in range(n_items):
+        out[k], i = _from_bytes_v2(b, i)
+    return out, i
+
+def dict_from_bytes_v2(b: bytes, i: int) -> Tuple[Dict[Any, Any], int]:
+    n_items, i = _read_varint(b, i)
+    out = {}
+    for _ in range(n_items):
+        key, i = _from_bytes_v2(b, i)
+        value, i = _from_bytes_v2(b, i)
+        out[key] = value
+    return out, i
+
+def payload_from_bytes_v2(b: bytes, i: int) -> Tuple[Payload, int]:
+    world_state, i = _from_bytes_v2(b, i)
+    actions, i = _from_bytes_v2(b, i)
+    metadata, i = _from_bytes_v2(b, i)
+    return Payload(world_state=world_state, actions=actions, metadata=metadata), i
+
+def world_state_from_bytes_v2(b: bytes, i: int) -> Tuple[WorldState, int]:
+    environment_states, i = _from_bytes_v2(b, i)
+    opponent_states, i = _from_bytes_v2(b, i)
+    personal_states, i = _from_bytes_v2(b, i)
+    return WorldState(environment_states=environment_states, opponent_states=opponent_states, personal_states=personal_states), i
 
+_DESERIALIZATION_METHOD_V2 = {ObjType.LIST: list_from_bytes_v2,
+                               ObjType.DICT: dict_from_bytes_v2,
+                               ObjType.STRING: string_from_bytes_v2,
+                               ObjType.INTEGER: int_from_bytes_v2,
+                               ObjType.FLOAT: float_from_bytes_v2,
+                               ObjType.BOOLEAN: boolean_from_bytes_v2,
+                               ObjType.PAYLOAD: payload_from_bytes_v2,
+                               ObjType.WORLD_STATE: world_state_from_bytes_v2,
+                               ObjType.NONE: none_from_bytes}
+
+def _from_bytes_v2(b: bytes, i: int) -> Tuple[Any, int]:
+    obj_type = b[i]
+    if obj_type not in _DESERIALIZATION_METHOD_V2:
+        raise RuntimeError(
+            f"Unsupported type: {obj_type}; supported types are {list(_DESERIALIZATION_METHOD_V2.keys())}."
+        )
+    return _DESERIALIZATION_METHOD_V2[obj_type](b, i + 1)
+
+def boolean_to_buffer_v2(obj: bool, buf: bytearray, stack: List[Any]) -> None:
+    buf += _TAG_BYTES[ObjType.BOOLEAN]
+    buf += b"\x01" if obj else b"\x00"
+
+def none_to_buffer_v2(obj: None, buf: bytearray, stack: List[Any]) -> None:
+    buf += _TAG_BYTES[ObjType.NONE]
+
+def payload_to_buffer_v2(obj: Payload, buf: bytearray, stack: List[Any]) -> None:
+    buf += _TAG_BYTES[ObjType.PAYLOAD]
+    stack += (obj.metadata, obj.actions, obj.world_state)
+
+def world_state_to_buffer_v2(obj: WorldState, buf: bytearray, stack: List[Any]) -> None:
+    buf += _TAG_BYTES[ObjType.WORLD_STATE]
+    stack += (obj.personal_states, obj.opponent_states, obj.environment_states)
+
+def int_to_buffer_v2(obj: int, buf: bytearray, stack: List[Any]) -> None:
+    buf += _TAG_BYTES[ObjType.INTEGER]
+    buf += _encode_varint(_zigzag(obj))
+
+def float_to_buffer_v2(obj: float, buf: bytearray, stack: List[Any]) -> None:
+    buf += _TAG_BYTES[ObjType.FLOAT]
+    buf += _F64.pack(obj)
+
+def string_to_buffer_v2(obj: str, buf: bytearray, stack: List[Any]) -> None:
+    serialized_obj = obj.encode("utf-8")
+    buf += _TAG_BYTES[ObjType.STRING]
+    buf += _encode_varint(len(serialized_obj))
+    buf += serialized_obj
+
+def dict_to_buffer_v2(obj: Dict[Any, Any], buf: bytearray, stack: List[Any]) -> None:
+    buf += _TAG_BYTES[ObjType.DICT]
+    buf += _encode_varint(len(obj))
+    for key, value in reversed(obj.items()):
+        stack.append(value)
+        stack.append(key)
+
+def list_to_buffer_v2(obj: List[Any], buf: bytearray, stack: List[Any]) -> None:
+    buf += _TAG_BYTES[ObjType.LIST]
+    buf += _encode_varint(len(obj))
+    stack.extend(reversed(obj))
+
+_SERIALIZATION_METHOD_V2 = {
+    ObjType.BOOLEAN: boolean_to_buffer_v2,
+    ObjType.NONE: none_to_buffer_v2,
+    ObjType.PAYLOAD: payload_to_buffer_v2,
+    ObjType.WORLD_STATE: world_state_to_buffer_v2,
+    ObjType.INTEGER: int_to_buffer_v2,
+    ObjType.FLOAT: float_to_buffer_v2,
+    ObjType.STRING: string_to_buffer_v2,
+    ObjType.DICT: dict_to_buffer_v2,
+    ObjType.LIST: list_to_buffer_v2
+}
+
+#### Projected decoding ####
+
+# Everything the projection and skip logic needs to walk one wire format.
+_WireFormat = namedtuple("_WireFormat", ["read_tag", "read_size", "decoders", "skip"])
+
+
+def _read_u64(b: bytes, i: int) -> Tuple[int, int]:
+    return _U64.unpack_from(b, i)[0], i + 8
+
+def _read_tag_v2(b: bytes, i: int) -> Tuple[int, int]:
+    return b[i], i + 1
+
+_SIZED_TYPES = frozenset((ObjType.INTEGER, ObjType.FLOAT, ObjType.STRING))
+_FIELD_TYPES = frozenset((ObjType.PAYLOAD, ObjType.WORLD_STATE))
+
+
+def _skip(b: bytes, i: int) -> int:
+    """Returns the offset just past the v1 object at i without decoding it."""
+    unpack = _U64.unpack_from
+    pending = 1
+    while pending:
+        pending -= 1
+        obj_type = unpack(b, i)[0]
+        i += 8
+        if obj_type in _SIZED_TYPES:
+            i += 8 + unpack(b, i)[0]
+        elif obj_type == ObjType.LIST:
+            pending += unpack(b, i)[0]
+            i += 8
+        elif obj_type == ObjType.DICT:
+            pending += 2 * unpack(b, i)[0]
+            i += 8
+        elif obj_type in _FIELD_TYPES:
+            pending += 3
+        elif obj_type == ObjType.BOOLEAN:
+            i += 1
+        elif obj_type != ObjType.NONE:
+            raise RuntimeError(f"Unsupported type: {obj_type}")
+    return i
+
+def _skip_v2(b: bytes, i: int) -> int:
+    """Returns the offset just past the v2 object at i without decoding it."""
+    pending = 1
+    while pending:
+        pending -= 1
+        obj_type = b[i]
+        i += 1
+        if obj_type == ObjType.STRING:
+            n_bytes, i = _read_varint(b, i)
+            i += n_bytes
+        elif obj_type == ObjType.INTEGER:
+            while b[i] >= 0x80:
+                i += 1
+            i += 1
+        elif obj_type == ObjType.FLOAT:
+            i += 8
+        elif obj_type == ObjType.LIST:
+            n_items, i = _read_varint(b, i)
+            pending += n_items
+        elif obj_type == ObjType.DICT:
+            n_items, i = _read_varint(b, i)
+            pending += 2 * n_items
+        elif obj_type in _FIELD_TYPES:
+            pending += 3
+        elif obj_type == ObjType.BOOLEAN:
+            i += 1
+        elif obj_type != ObjType.NONE:
+            raise RuntimeError(f"Unsupported type: {obj_type}")
+    return i
+
+_WIRE_FORMATS = {
+    WIRE_V1: _WireFormat(_read_u64, _read_u64, _DESERIALIZATION_METHOD, _skip),
+    WIRE_V2: _WireFormat(_read_tag_v2, _read_varint, _DESERIALIZATION_METHOD_V2, _skip_v2),
+}
+
+# Path tree leaf meaning "decode this whole subtree".
+_WHOLE = True
+
+
+def _wire_format(view: memoryview) -> Tuple[_WireFormat, int]:
+    """Returns the wire format of a blob and the offset of its root object."""
+    if view[: len(_V2_MAGIC)] == _V2_MAGIC:
+        return _WIRE_FORMATS[WIRE_V2], len(_V2_MAGIC)
+    return _WIRE_FORMATS[WIRE_V1], 0
+
+def _decode(b: bytes, i: int, fmt: _WireFormat) -> Tuple[Any, int]:
+    obj_type, i = fmt.read_tag(b, i)
+    if obj_type not in fmt.decoders:
+        raise RuntimeError(
+            f"Unsupported type: {obj_type}; supported types are {list(fmt.decoders.keys())}."
+        )
+    return fmt.decoders[obj_type](b, i)
+
+@lru_cache(maxsize=64)
+def _path_tree(paths: Tuple[str, ...]) -> Dict[str, Any]:
+    tree = {}
+    for path in paths:
+        node = tree
+        *parents, leaf = path.split(".")
+        for part in parents:
+            node = node.setdefault(part, {})
+            if node is _WHOLE:
+                break
+        else:
+            node[leaf] = _WHOLE
+    return tree
+
+def _project_fields(b: bytes, i: int, fmt: _WireFormat, names: Tuple[str, ...], node: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+    values = {}
+    for name in names:
+        child = node.get(name, node.get("*"))
+        if child is None:
+            values[name] = None
+            i = fmt.skip(b, i)
+        else:
+            values[name], i = _project(b, i, fmt, child)
+    return values, i
+
+def _project(b: bytes, i: int, fmt: _WireFormat, node: Any) -> Tuple[Any, int]:
+    if node is _WHOLE:
+        return _decode(b, i, fmt)
+
+    obj_type, i = fmt.read_tag(b, i)
+    if obj_type == ObjType.LIST:
+        n_items, i = fmt.read_size(b, i)
+        out = [None] * n_items
+        for k in range(n_items):
+            child = node.get(str(k), node.get("*"))
+            if child is None:
+                i = fmt.skip(b, i)
+            else:
+                out[k], i = _project(b, i, fmt, child)
+        return out, i
+    if obj_type == ObjType.DICT:
+        n_items, i = fmt.read_size(b, i)
+        out = {}
+        for _ in range(n_items):
+            key, i = _decode(b, i, fmt)
+            child = node.get(str(key), node.get("*"))
+            if child is None:
+                i = fmt.skip(b, i)
+            else:
+                out[key], i = _project(b, i, fmt, child)
+        return out, i
+    if obj_type == ObjType.PAYLOAD:
+        values, i = _project_fields(b, i, fmt, ("world_state", "actions", "metadata"), node)
+        return Payload(**values), i
+    if obj_type == ObjType.WORLD_STATE:
+        values, i = _project_fields(b, i, fmt, ("environment_states", "opponent_states", "personal_states"), node)
+        return WorldState(**values), i
+    # Paths that descend into a scalar just select the scalar.
+    if obj_type not in fmt.decoders:
+        raise RuntimeError(
+            f"Unsupported type: {obj_type}; supported types are {list(fmt.decoders.keys())}."
+        )
+    return fmt.decoders[obj_type](b, i)
+
+def decode_fields(b: bytes, paths: Iterable[str]) -> Any:
+    """
+    Decodes only the parts of a blob selected by paths, skipping every other
+    subtree using its headers without building Python objects for it.
+
+    Paths are dot-separated and start at the root object. A segment names a
+    Payload/WorldState field, a dict key or a list index (both compared as
+    strings), or is "*" to match every entry. The result keeps the shape of
+    the full decode: unselected dict entries are dropped, and unselected list
+    items and Payload/WorldState fields are None.
+
+        decode_fields(blob, ["*.*.actions", "*.*.world_state.environment_states.question"])
+    """
+    with memoryview(b) as view:
+        fmt, i = _wire_format(view)
+        return _project(view, i, fmt, _path_tree(tuple(paths)))[0]
+
+def iter_payloads(b: bytes, paths: Iterable[str] | None = None) -> Iterator[Payload]:
+    """
+    Yields every Payload in a blob one at a time, in serialization order,
+    descending through any lists and dicts that hold them (e.g. a round's
+    {batch: [Payload, ...]} value). Everything that isn't a Payload is skipped.
+
+    If paths is given, each Payload is projected as in decode_fields, with
+    paths relative to the Payload (e.g. "world_state.environment_states.question").
+    """
+    node = _WHOLE if paths is None else _path_tree(tuple(paths))
+    with memoryview(b) as view:
+        fmt, i = _wire_format(view)
+        pending = 1
+        while pending:
+            pending -= 1
+            obj_type, j = fmt.read_tag(view, i)
+            if obj_type == ObjType.PAYLOAD:
+                payload, i = _project(view, i, fmt, node)
+                yield payload
+            elif obj_type == ObjType.LIST:
+                n_items, i = fmt.read_size(view, j)
+                pending += n_items
+            elif obj_type == ObjType.DICT:
+                # Keys are walked (and skipped) like any other item.
+                n_items, i = fmt.read_size(view, j)
+                pending += 2 * n_items
+            else:
+                i = fmt.skip(view, i)
@@ -0,0 +1,188 @@
+"""
+Micro-benchmark for game_tree decoding.
+
+Builds a round value shaped like the ones GossipDHTPublisher reads from the DHT
+(one serialized {batch: [Payload, ...]} blob per peer) and times decoding every
+peer's blob.
+
+Run from the web directory:
+    python -m api.game_tree_bench --peers 100 --generations 8
+"""
+
+import argparse
+import random
+import string
+import struct
+import timeit
+from typing import Any, Tuple
+
+from .game_tree import (
+    WIRE_V1,
+    WIRE_V2,
+    ObjType,
+    Payload,
+    WorldState,
+    decode_fields,
+    from_bytes,
+    iter_payloads,
+    to_bytes,
+)
+
+# The fields GossipDHTPublisher reads from each payload.
+GOSSIP_PAYLOAD_FIELDS = [
+    "world_state.environment_states.question",
+    "world_state.environment_states.metadata.source_dataset",
+    "actions",
+]
+GOSSIP_FIELDS = ["*.*." + path for path in GOSSIP_PAYLOAD_FIELDS]
+
+DATASETS = ["calendar_arithmetic", "propositional_logic", "base_conversion", "decimal_arithmetic"]
+
+
+def _text(rng: random.Random, n_words: int) -> str:
+    return " ".join(
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9)))
+        for _ in range(n_words)
+    )
+
+
+def make_payload(rng: random.Random, n_generations: int) -> Payload:
+    world_state = WorldState(
+        environment_states={
+            "question": _text(rng, 40),
+            "answer": _text(rng, 3),
+            # reasoning-gym metadata carries the generator's parameters.
+            "metadata": {
+                "source_dataset": rng.choice(DATASETS),
+                "source_index": rng.randint(0, 10_000),
+                "dataset_index": rng.randint(0, 10_000),
+                "split": "train",
+                "difficulty": {
+                    "min_terms": rng.randint(2, 4),
+                    "max_terms": rng.randint(4, 8),
+                    "ops": ["+", "-", "*", "/"],
+                },
+                "expression": _text(rng, 12),
+                "solution_steps": [_text(rng, 10) for _ in range(4)],
+                "score": rng.random(),
+            },
+        },
+        opponent_states=None,
+        personal_states=None,
+    )
+    actions = [_text(rng, 120) for _ in range(n_generations)]
+    return Payload(world_state=world_state, actions=actions, metadata=None)
+
+
+def make_round_value(
+    n_peers: int,
+    n_batches: int,
+    n_generations: int,
+    seed: int = 0,
+    version: int = WIRE_V1,
+) -> dict[str, bytes]:
+    """Returns {peer_id: blob}, mirroring a round's subkeyed DHT value."""
+    rng = random.Random(seed)
+    round_value = {}
+    for p in range(n_peers):
+        payload_dict = {
+            b: [make_payload(rng, n_generations)] for b in range(n_batches)
+        }
+        round_value[f"peer-{p}"] = to_bytes(payload_dict, version=version)
+    return round_value
+
+
+# Reference v1 decoder as it was before readers unpacked headers in place: every
+# header, string and integer is read by slicing the blob into a new bytes object.
+def _baseline_from_bytes(b: bytes, i: int) -> Tuple[Any, int]:
+    obj_type = int.from_bytes(b[i : (i + 8)], byteorder="big", signed=False)
+    i += 8
+    if obj_type == ObjType.NONE:
+        return None, i
+    if obj_type == ObjType.BOOLEAN:
+        return b[i] == b"0", i + 1
+    if obj_type == ObjType.PAYLOAD:
+        world_state, i = _baseline_from_bytes(b, i)
+        actions, i = _baseline_from_bytes(b, i)
+        metadata, i = _baseline_from_bytes(b, i)
+        return Payload(world_state=world_state, actions=actions, metadata=metadata), i
+    if obj_type == ObjType.WORLD_STATE:
+        environment_states, i = _baseline_from_bytes(b, i)
+        opponent_states, i = _baseline_from_bytes(b, i)
+        personal_states, i = _baseline_from_bytes(b, i)
+        return WorldState(environment_states, opponent_states, personal_states), i
+
+    n = int.from_bytes(b[i : (i + 8)], byteorder="big", signed=False)
+    i += 8
+    if obj_type == ObjType.STRING:
+        return b[i : (i + n)].decode("utf-8"), i + n
+    if obj_type == ObjType.INTEGER:
+        return int.from_bytes(b[i : (i + n)], byteorder="big", signed=True), i + n
+    if obj_type == ObjType.FLOAT:
+        return struct.unpack(">d", b[i : (i + n)])[0], i + n
+    if obj_type == ObjType.LIST:
+        out = [None] * n
+        for k in range(n):
+            out[k], i = _baseline_from_bytes(b, i)
+        return out, i
+    if obj_type == ObjType.DICT:
+        out = {}
+        for _ in range(n):
+            key, i = _baseline_from_bytes(b, i)
+            out[key], i = _baseline_from_bytes(b, i)
+        return out, i
+    raise RuntimeError(f"Unsupported type: {obj_type}")
+
+
+def decode_round(round_value: dict[str, bytes], decode_fn) -> int:
+    n_payloads = 0
+    for blob in round_value.values():
+        for payload_list in decode_fn(blob).values():
+            n_payloads += len(payload_list)
+    return n_payloads
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--peers", type=int, default=100)
+    parser.add_argument("--batches", type=int, default=2)
+    parser.add_argument("--generations", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    round_values = {
+        version: make_round_value(
+            args.peers, args.batches, args.generations, version=version
+        )
+        for version in (WIRE_V1, WIRE_V2)
+    }
+    for version, round_value in round_values.items():
+        total_bytes = sum(len(v) for v in round_value.values())
+        print(f"v{version}: {len(round_value)} peers, {total_bytes / 1e6:.2f} MB serialized")
+
+    cases = {
+        "v1 baseline": (WIRE_V1, lambda blob: _baseline_from_bytes(blob, 0)[0]),
+        "v1 memoryview": (WIRE_V1, from_bytes),
+        "v2 memoryview": (WIRE_V2, from_bytes),
+        "v1 projected": (WIRE_V1, lambda blob: decode_fields(blob, GOSSIP_FIELDS)),
+        "v2 projected": (WIRE_V2, lambda blob: decode_fields(blob, GOSSIP_FIELDS)),
+        "v1 streamed": (
+            WIRE_V1,
+            lambda blob: {0: list(iter_payloads(blob, GOSSIP_PAYLOAD_FIELDS))},
+        ),
+    }
+    for name, (version, decode_fn) in cases.items():
+        round_value = round_values[version]
+        total_bytes = sum(len(v) for v in round_value.values())
+        best = min(
+            timeit.repeat(
+                lambda: decode_round(round_value, decode_fn),
+                number=1,
+                repeat=args.repeat,
+            )
+        )
+        print(f"{name:>14}: {best * 1e3:8.2f} ms/round ({total_bytes / best / 1e6:.1f} MB/s)")
+
+
+if __name__ == "__main__":
+    main()
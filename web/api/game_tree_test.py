@@ -0,0 +1,201 @@
+import struct
+import sys
+
+import pytest
+
+from .game_tree import (
+    _V2_MAGIC,
+    WIRE_V1,
+    WIRE_V2,
+    Payload,
+    WorldState,
+    decode_fields,
+    from_bytes,
+    iter_payloads,
+    to_bytes,
+    to_bytes_into,
+)
+from .game_tree_bench import _baseline_from_bytes, make_round_value
+
+
+def _payload(question="What is 2+2?", actions=("4", "5")):
+    world_state = WorldState(
+        environment_states={
+            "question": question,
+            "metadata": {"source_dataset": "calendar_arithmetic", "score": 0.5},
+        },
+        opponent_states=None,
+        personal_states=[1, -2, 3],
+    )
+    return Payload(world_state=world_state, actions=list(actions), metadata=None)
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        0,
+        -1,
+        2**40,
+        1.25,
+        "",
+        "héllo",
+        None,
+        [],
+        {},
+        [1, "a", [2.5, None]],
+        {"a": {"b": [1, 2]}, 3: "c"},
+        {0: [_payload(), _payload("Why?", ())]},
+    ],
+)
+def test_round_trip(obj):
+    assert from_bytes(to_bytes(obj)) == obj
+
+
+def test_matches_baseline_decoder():
+    """The in-place readers must decode exactly what the original slicing decoder did."""
+    for blob in make_round_value(n_peers=3, n_batches=2, n_generations=4).values():
+        assert from_bytes(blob) == _baseline_from_bytes(blob, 0)[0]
+
+
+def test_from_bytes_accepts_buffers():
+    blob = to_bytes({0: [_payload()]})
+    assert from_bytes(bytearray(blob)) == from_bytes(blob)
+    assert from_bytes(memoryview(blob)) == from_bytes(blob)
+
+
+def test_truncated_blob_raises():
+    blob = to_bytes({0: [_payload()]})
+    with pytest.raises(struct.error):
+        from_bytes(blob[:20])
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        0,
+        -1,
+        63,
+        -64,
+        2**70,
+        -(2**70),
+        1.25,
+        "héllo",
+        True,
+        False,
+        None,
+        [1, "a", [2.5, None]],
+        {"a": {"b": [1, 2]}, 3: "c"},
+        {0: [_payload(), _payload("Why?", ())]},
+    ],
+)
+def test_v2_round_trip(obj):
+    blob = to_bytes(obj, version=WIRE_V2)
+    assert blob.startswith(_V2_MAGIC)
+    assert from_bytes(blob) == obj
+
+
+def test_v2_is_compact():
+    payload_dict = {0: [_payload()]}
+    v1 = to_bytes(payload_dict)
+    v2 = to_bytes(payload_dict, version=WIRE_V2)
+    assert len(v2) * 2 < len(v1)
+    assert from_bytes(v1) == from_bytes(v2)
+
+
+def test_to_bytes_rejects_unknown_version():
+    with pytest.raises(RuntimeError, match="Unsupported wire format version"):
+        to_bytes(1, version=3)
+
+
+def test_v1_encoding_is_stable():
+    # Byte layout nodes in the swarm decode; must never change.
+    assert to_bytes(["a", None, True]) == (
+        (1).to_bytes(8, "big") + (3).to_bytes(8, "big")
+        + (3).to_bytes(8, "big") + (1).to_bytes(8, "big") + b"a"
+        + (9).to_bytes(8, "big")
+        + (6).to_bytes(8, "big") + b"1"
+    )
+
+
+@pytest.mark.parametrize("version", [WIRE_V1, WIRE_V2])
+def test_to_bytes_into_appends(version):
+    obj = {0: [_payload()]}
+    buf = bytearray(b"prefix")
+    n = to_bytes_into(obj, buf, version=version)
+    assert n == len(buf) - len(b"prefix")
+    assert bytes(buf[:6]) == b"prefix"
+    assert bytes(buf[6:]) == to_bytes(obj, version=version)
+
+
+@pytest.mark.parametrize("version", [WIRE_V1, WIRE_V2])
+def test_to_bytes_handles_deep_nesting(version):
+    depth = 10 * sys.getrecursionlimit()
+    obj = []
+    for _ in range(depth):
+        obj = [obj]
+    # v1 spends 16 bytes on each list header, v2 spends 2 plus the prefix.
+    expected = depth * 16 + 16 if version == WIRE_V1 else depth * 2 + 2 + len(_V2_MAGIC)
+    assert len(to_bytes(obj, version=version)) == expected
+
+
+@pytest.mark.parametrize("version", [WIRE_V1, WIRE_V2])
+def test_decode_fields_projects_payloads(version):
+    blob = to_bytes({0: [_payload(), _payload("Why?", ())]}, version=version)
+    out = decode_fields(
+        blob,
+        [
+            "*.*.world_state.environment_states.question",
+            "*.*.world_state.environment_states.metadata.source_dataset",
+            "*.*.actions",
+        ],
+    )
+    assert list(out) == [0]
+    first, second = out[0]
+    assert first.actions == ["4", "5"]
+    assert first.metadata is None
+    assert first.world_state.opponent_states is None
+    assert first.world_state.personal_states is None
+    assert first.world_state.environment_states == {
+        "question": "What is 2+2?",
+        "metadata": {"source_dataset": "calendar_arithmetic"},
+    }
+    assert second.world_state.environment_states["question"] == "Why?"
+    assert second.actions == []
+
+
+@pytest.mark.parametrize("version", [WIRE_V1, WIRE_V2])
+def test_decode_fields_skips_every_type(version):
+    skipped = [True, None, -3, 2**80, 1.5, "ß", {"k": [_payload()]}, _payload()]
+    blob = to_bytes([skipped, "kept", {"a": 1, "b": 2}], version=version)
+    assert decode_fields(blob, ["1", "2.b"]) == [None, "kept", {"b": 2}]
+    assert decode_fields(blob, ["0"]) == [
+        from_bytes(to_bytes(skipped, version=version)), None, None
+    ]
+
+
+def test_decode_fields_whole_path_wins():
+    blob = to_bytes({"a": {"b": 1, "c": 2}})
+    assert decode_fields(blob, ["a.b", "a"]) == {"a": {"b": 1, "c": 2}}
+    assert decode_fields(blob, []) == {}
+
+
+@pytest.mark.parametrize("version", [WIRE_V1, WIRE_V2])
+def test_iter_payloads_yields_in_order(version):
+    payloads = [_payload("a"), _payload("b"), _payload("c")]
+    blob = to_bytes({0: payloads[:2], "skip": [1, "x"], 1: [payloads[2]]}, version=version)
+    it = iter_payloads(blob)
+    assert next(it) == payloads[0]
+    assert list(it) == payloads[1:]
+
+
+def test_iter_payloads_projects():
+    blob = to_bytes({0: [_payload()]})
+    (payload,) = iter_payloads(blob, ["actions", "world_state.environment_states.question"])
+    assert payload.actions == ["4", "5"]
+    assert payload.world_state.environment_states == {"question": "What is 2+2?"}
+    assert payload.world_state.personal_states is None
+
+
+def test_iter_payloads_bare_payload_and_empty():
+    assert list(iter_payloads(to_bytes(_payload()))) == [_payload()]
+    assert list(iter_payloads(to_bytes({}))) == []
@@ -2,13 +2,16 @@ import multiprocessing
 
 import hivemind
 
+from .dht_cache import DHTCache
+
 # DHT singletons for the client
 # Initialized in main and used in the API handlers.
 dht: hivemind.DHT | None = None
+dht_cache: DHTCache | None = None
 
 
 def setup_global_dht(initial_peers, coordinator, logger, kinesis_client):
-    global dht
+    global dht, dht_cache
     dht = hivemind.DHT(
         start=True,
         startup_timeout=60,
@@ -17,3 +20,5 @@ def setup_global_dht(initial_peers, coordinator, logger, kinesis_client):
         cache_size=2000,
         client_mode=True,
     )
+    dht_cache = DHTCache(dht=dht, coordinator=coordinator, logger=logger)
+    dht_cache.start()
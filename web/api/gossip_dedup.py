@@ -0,0 +1,64 @@
+from collections import OrderedDict
+from typing import Hashable, Iterable
+
+
+class GossipDedupCache:
+    """
+    Bounded LRU set of gossip IDs already published for the current round.
+
+    IDs embed the round, so the cache is cleared whenever a different round is
+    seen instead of waiting for old IDs to age out. Once max_size IDs are held
+    the least recently seen ones are evicted, which can only cause an
+    occasional duplicate publish, never a dropped message.
+    """
+
+    def __init__(self, max_size: int = 50_000):
+        self.max_size = max_size
+        self.round_num: Hashable | None = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._ids: OrderedDict[str, None] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _use_round(self, round_num: Hashable) -> None:
+        if round_num != self.round_num:
+            self.round_num = round_num
+            self._ids.clear()
+
+    def is_new(self, round_num: Hashable, gossip_id: str) -> bool:
+        """Returns whether gossip_id hasn't been published this round, counting a hit or miss."""
+        self._use_round(round_num)
+        if gossip_id in self._ids:
+            self._ids.move_to_end(gossip_id)
+            self.hits += 1
+            return False
+        self.misses += 1
+        return True
+
+    def add(self, round_num: Hashable, gossip_ids: Iterable[str]) -> None:
+        """Records gossip IDs as published this round."""
+        self._use_round(round_num)
+        for gossip_id in gossip_ids:
+            self._ids[gossip_id] = None
+            self._ids.move_to_end(gossip_id)
+        while len(self._ids) > self.max_size:
+            self._ids.popitem(last=False)
+            self.evictions += 1
+
+    def discard(self, round_num: Hashable, gossip_ids: Iterable[str]) -> None:
+        """Forgets gossip IDs recorded for round_num, e.g. because they were never delivered."""
+        if round_num != self.round_num:
+            return
+        for gossip_id in gossip_ids:
+            self._ids.pop(gossip_id, None)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._ids),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
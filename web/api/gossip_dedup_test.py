@@ -0,0 +1,37 @@
+from .gossip_dedup import GossipDedupCache
+
+
+def test_counts_hits_and_misses():
+    cache = GossipDedupCache()
+    assert cache.is_new(1, "a")
+    cache.add(1, ["a"])
+    assert not cache.is_new(1, "a")
+    assert cache.is_new(1, "b")
+    assert cache.stats() == {"size": 1, "hits": 1, "misses": 2, "evictions": 0}
+
+
+def test_round_change_clears():
+    cache = GossipDedupCache()
+    cache.add(1, ["a", "b"])
+    assert cache.is_new(2, "a")
+    assert len(cache) == 0
+
+
+def test_evicts_least_recently_seen():
+    cache = GossipDedupCache(max_size=2)
+    cache.add(1, ["a", "b"])
+    assert not cache.is_new(1, "a")  # Refreshes "a".
+    cache.add(1, ["c"])
+    assert cache.evictions == 1
+    assert cache.is_new(1, "b")
+    assert not cache.is_new(1, "a")
+    assert not cache.is_new(1, "c")
+
+
+def test_discard():
+    cache = GossipDedupCache()
+    cache.add(1, ["a", "b"])
+    cache.discard(0, ["a"])  # Old round: ignored.
+    cache.discard(1, ["a", "missing"])
+    assert cache.is_new(1, "a")
+    assert not cache.is_new(1, "b")
@@ -0,0 +1,74 @@
+import random
+from typing import Any, Generic, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class StratifiedReservoirSampler(Generic[T]):
+    """
+    Samples a bounded, peer-balanced subset of a stream of (peer, item) pairs.
+
+    Each peer keeps a uniform reservoir of at most per_peer_quota items
+    (Algorithm R), so memory is bounded by the number of peers rather than the
+    number of items offered. sample() then deals items round-robin across peers
+    in random order until capacity is reached, so one chatty peer cannot crowd
+    out the others.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        per_peer_quota: int | None = None,
+        rng: random.Random | None = None,
+    ):
+        """
+        Args:
+            capacity: Maximum number of items returned by sample().
+            per_peer_quota: Maximum items kept per peer. Defaults to capacity.
+            rng: Random source, for reproducible sampling.
+        """
+        self.capacity = capacity
+        self.per_peer_quota = capacity if per_peer_quota is None else per_peer_quota
+        self.rng = rng or random.Random()
+        self.seen = 0
+
+        self._reservoirs: dict[Hashable, list[T]] = {}
+        self._seen_by_peer: dict[Hashable, int] = {}
+
+    def offer(self, peer: Hashable, item: T) -> None:
+        self.seen += 1
+        n = self._seen_by_peer.get(peer, 0) + 1
+        self._seen_by_peer[peer] = n
+
+        reservoir = self._reservoirs.setdefault(peer, [])
+        if len(reservoir) < self.per_peer_quota:
+            reservoir.append(item)
+            return
+
+        j = self.rng.randrange(n)
+        if j < self.per_peer_quota:
+            reservoir[j] = item
+
+    def sample(self) -> list[tuple[Hashable, T]]:
+        """Returns up to capacity (peer, item) pairs, balanced across peers."""
+        peers = list(self._reservoirs)
+        self.rng.shuffle(peers)
+        reservoirs = []
+        for peer in peers:
+            items = list(self._reservoirs[peer])
+            self.rng.shuffle(items)
+            reservoirs.append((peer, items))
+
+        out: list[tuple[Any, T]] = []
+        depth = 0
+        while len(out) < self.capacity and reservoirs:
+            remaining = []
+            for peer, items in reservoirs:
+                if len(out) == self.capacity:
+                    break
+                if depth < len(items):
+                    out.append((peer, items[depth]))
+                    remaining.append((peer, items))
+            reservoirs = remaining
+            depth += 1
+        return out
@@ -0,0 +1,51 @@
+import random
+from collections import Counter
+
+from .gossip_sampler import StratifiedReservoirSampler
+
+
+def test_sample_keeps_everything_under_capacity():
+    sampler = StratifiedReservoirSampler(capacity=10, rng=random.Random(0))
+    for i in range(4):
+        sampler.offer("a", i)
+    sampler.offer("b", 99)
+    assert sampler.seen == 5
+    assert sorted(sampler.sample()) == [("a", 0), ("a", 1), ("a", 2), ("a", 3), ("b", 99)]
+
+
+def test_chatty_peer_cannot_dominate():
+    sampler = StratifiedReservoirSampler(
+        capacity=20, per_peer_quota=50, rng=random.Random(0)
+    )
+    for i in range(10_000):
+        sampler.offer("chatty", i)
+    for peer in ("b", "c", "d"):
+        for i in range(5):
+            sampler.offer(peer, i)
+
+    counts = Counter(peer for peer, _ in sampler.sample())
+    assert sum(counts.values()) == 20
+    assert counts == {"chatty": 5, "b": 5, "c": 5, "d": 5}
+
+
+def test_per_peer_quota_bounds_memory_and_output():
+    sampler = StratifiedReservoirSampler(
+        capacity=200, per_peer_quota=3, rng=random.Random(0)
+    )
+    for i in range(1_000):
+        sampler.offer("a", i)
+    assert len(sampler._reservoirs["a"]) == 3
+    sample = sampler.sample()
+    assert len(sample) == 3
+    assert len({item for _, item in sample}) == 3
+
+
+def test_reservoir_is_roughly_uniform():
+    hits = Counter()
+    rng = random.Random(1)
+    for _ in range(2_000):
+        sampler = StratifiedReservoirSampler(capacity=1, rng=rng)
+        for i in range(4):
+            sampler.offer("a", i)
+        hits.update(item for _, item in sampler.sample())
+    assert all(400 < hits[i] < 600 for i in range(4))
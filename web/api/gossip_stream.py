@@ -0,0 +1,131 @@
+import asyncio
+import json
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, AsyncIterator
+
+# Sent in place of an event to tell a subscriber's stream to end.
+_CLOSE = None
+
+
+@dataclass
+class BroadcasterStats:
+    """Running totals for a GossipBroadcaster."""
+
+    events: int = 0
+    subscribed: int = 0
+    evicted: int = 0
+
+
+def encode_event(event: str, data: Any, event_id: int | None = None) -> bytes:
+    """Frames data as a server-sent event."""
+    frame = f"event: {event}\n"
+    if event_id is not None:
+        frame += f"id: {event_id}\n"
+    frame += f"data: {json.dumps(data, separators=(',', ':'))}\n\n"
+    return frame.encode("utf-8")
+
+
+class Subscription:
+    """One connected client's bounded queue of encoded events."""
+
+    def __init__(self, max_queued: int):
+        self.queue: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize=max_queued)
+        self.evicted = False
+
+    async def events(self, heartbeat_seconds: float) -> AsyncIterator[bytes]:
+        """Yields encoded events, and a comment line whenever nothing was sent for heartbeat_seconds."""
+        while True:
+            try:
+                frame = await asyncio.wait_for(self.queue.get(), heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield b": keep-alive\n\n"
+                continue
+            if frame is _CLOSE:
+                return
+            yield frame
+
+
+class GossipBroadcaster:
+    """
+    Fans gossip and round-change events out to streaming API clients.
+
+    publish() may be called from any thread (GossipDHTPublisher calls it from
+    its poll thread). Each event is encoded once and handed to every
+    subscriber's bounded queue on the event loop the subscribers live on. A
+    subscriber whose queue is full is evicted rather than slowing down or
+    growing memory for everyone else; its stream ends and the client is
+    expected to reconnect.
+    """
+
+    def __init__(
+        self,
+        max_subscribers: int = 5000,
+        max_queued_per_subscriber: int = 64,
+        logger: logging.Logger | None = None,
+    ):
+        self.max_subscribers = max_subscribers
+        self.max_queued_per_subscriber = max_queued_per_subscriber
+        self.logger = logger or logging.getLogger(__name__)
+        self.stats = BroadcasterStats()
+
+        self._subscribers: set[Subscription] = set()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._event_id = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> Subscription | None:
+        """Registers a subscriber. Must be called on the event loop; returns None when full."""
+        if len(self._subscribers) >= self.max_subscribers:
+            return None
+        self._loop = asyncio.get_running_loop()
+        subscription = Subscription(self.max_queued_per_subscriber)
+        self._subscribers.add(subscription)
+        self.stats.subscribed += 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    def publish(self, event: str, data: Any) -> None:
+        """Sends an event to every subscriber. Safe to call from any thread."""
+        loop = self._loop
+        if not self._subscribers or loop is None or loop.is_closed():
+            return
+
+        with self._lock:
+            self._event_id += 1
+            frame = encode_event(event, data, self._event_id)
+        self.stats.events += 1
+        try:
+            loop.call_soon_threadsafe(self._fan_out, frame)
+        except RuntimeError:
+            # The loop closed between the check and the call.
+            pass
+
+    def _fan_out(self, frame: bytes) -> None:
+        evicted = []
+        for subscription in self._subscribers:
+            try:
+                subscription.queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                evicted.append(subscription)
+
+        for subscription in evicted:
+            self._subscribers.discard(subscription)
+            subscription.evicted = True
+            # Drop its backlog so the close marker fits.
+            while not subscription.queue.empty():
+                subscription.queue.get_nowait()
+            subscription.queue.put_nowait(_CLOSE)
+
+        if evicted:
+            self.stats.evicted += len(evicted)
+            self.logger.warning(
+                "Evicted slow gossip stream subscribers",
+                extra={"num_evicted": len(evicted), "subscribers": len(self._subscribers)},
+            )
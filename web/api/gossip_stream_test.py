@@ -0,0 +1,68 @@
+import asyncio
+import threading
+
+from .gossip_stream import GossipBroadcaster, encode_event
+
+
+def test_encode_event():
+    assert encode_event("round", {"round": 1}, 7) == b'event: round\nid: 7\ndata: {"round":1}\n\n'
+
+
+def test_publish_without_subscribers_is_noop():
+    broadcaster = GossipBroadcaster()
+    broadcaster.publish("gossip", [])
+    assert broadcaster.stats.events == 0
+
+
+def test_fans_out_to_every_subscriber():
+    async def run():
+        broadcaster = GossipBroadcaster()
+        a, b = broadcaster.subscribe(), broadcaster.subscribe()
+
+        # The publisher calls in from its own poll thread.
+        thread = threading.Thread(target=broadcaster.publish, args=("gossip", [{"id": "msg1"}]))
+        thread.start()
+        thread.join()
+
+        frames = [await asyncio.wait_for(s.queue.get(), 1) for s in (a, b)]
+        assert frames[0] == frames[1]
+        assert frames[0] == encode_event("gossip", [{"id": "msg1"}], 1)
+
+    asyncio.run(run())
+
+
+def test_evicts_slow_subscriber():
+    async def run():
+        broadcaster = GossipBroadcaster(max_queued_per_subscriber=2)
+        slow, fast = broadcaster.subscribe(), broadcaster.subscribe()
+
+        received = []
+        for i in range(3):
+            broadcaster.publish("gossip", [{"id": f"msg{i}"}])
+            await asyncio.sleep(0)
+            received.append(await fast.queue.get())
+
+        assert slow.evicted
+        assert not fast.evicted
+        assert len(broadcaster) == 1
+        assert broadcaster.stats.evicted == 1
+        # The evicted stream ends instead of delivering a partial backlog.
+        assert [frame async for frame in slow.events(heartbeat_seconds=1)] == []
+        assert len(received) == 3
+
+    asyncio.run(run())
+
+
+def test_heartbeat_and_subscriber_limit():
+    async def run():
+        broadcaster = GossipBroadcaster(max_subscribers=1)
+        subscription = broadcaster.subscribe()
+        assert broadcaster.subscribe() is None
+
+        events = subscription.events(heartbeat_seconds=0.01)
+        assert await events.__anext__() == b": keep-alive\n\n"
+
+        broadcaster.unsubscribe(subscription)
+        assert broadcaster.subscribe() is not None
+
+    asyncio.run(run())
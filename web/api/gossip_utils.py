@@ -1,8 +1,18 @@
 import re
 
+from .game_tree import iter_payloads
+
 TAGGED_PATTERN_TEMPLATE = r"<{0}>\n*(.*?)\n*</{0}>"
 
 
+# The only parts of each Payload in a peer's round value that gossip needs.
+GOSSIP_PAYLOAD_FIELDS = (
+    "world_state.environment_states.question",
+    "world_state.environment_states.metadata.source_dataset",
+    "actions",
+)
+
+
 def _extract_tagged(text, tag):
     matches = re.findall(TAGGED_PATTERN_TEMPLATE.format(tag), text)
     return matches[0]
@@ -31,3 +41,19 @@ def stage3_message(node_key: str, question: str, ts, outputs: dict):
         return f"{summarize_feedback}...Majority: {majority}"
     except (ValueError, KeyError, IndexError):
         return stage1_message(node_key, question, ts, outputs)
+
+
+def extract_gossip_fields(blob: bytes) -> list[tuple[str, list, str]]:
+    """
+    Decodes one peer's round value into (question, actions, source_dataset)
+    rows. A module-level function, so it can be sent to decode worker processes.
+    """
+    rows = []
+    for payload in iter_payloads(blob, GOSSIP_PAYLOAD_FIELDS):
+        environment_states = payload.world_state.environment_states
+        rows.append((
+            environment_states["question"],
+            payload.actions,
+            environment_states["metadata"]["source_dataset"],
+        ))
+    return rows
@@ -1,12 +1,22 @@
+import gzip
 import json
 import logging
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, Callable, Dict, Iterator, List, Literal, Optional
 
 import boto3
 from botocore.exceptions import ClientError
 from pydantic import BaseModel, Field, field_serializer
 
+try:
+    import zstandard
+except ImportError:  # zstd record encoding is optional.
+    zstandard = None
+
 
 class KinesisError(Exception):
     """Base exception for Kinesis operations"""
@@ -49,10 +59,108 @@ class GossipMessage(BaseModel):
     data: List[GossipMessageData]
 
 
+@dataclass
+class PutRecordsStats:
+    """Running totals for PutRecords calls made by a Kinesis client."""
+
+    batches: int = 0
+    records: int = 0
+    bytes: int = 0
+    retried_records: int = 0
+    failed_batches: int = 0
+    last_batch_latency_seconds: float = 0.0
+    total_latency_seconds: float = 0.0
+    records_by_shard: Counter = field(default_factory=Counter)
+    # Encoded record sizes, bucketed by the next power of two in bytes.
+    record_size_histogram: Counter = field(default_factory=Counter)
+    records_split: int = 0
+
+    @property
+    def records_per_second(self) -> float:
+        if not self.total_latency_seconds:
+            return 0.0
+        return self.records / self.total_latency_seconds
+
+
+# How gossip records are assigned partition keys (and so shards):
+#   peer    the record's peerId, so each peer's gossip stays ordered on one shard
+#   rotate  round-robin over rotate_partitions keys, for an even spread
+#   single  one fixed key; every record lands on the same shard
+PartitionStrategy = Literal["peer", "rotate", "single"]
+SINGLE_PARTITION_KEY = "swarm-gossip"
+
+# Compressed records start with a content-type marker so consumers can tell
+# them apart from plain JSON records, which always start with "{".
+RecordEncoding = Literal["json", "gzip", "zstd"]
+CONTENT_TYPE_MARKERS = {
+    "gzip": b"application/gzip;gossip\n",
+    "zstd": b"application/zstd;gossip\n",
+}
+
+
+def decode_record(data: bytes) -> Dict[str, Any]:
+    """Decodes a record's Data in any RecordEncoding back into its JSON object."""
+    if data.startswith(CONTENT_TYPE_MARKERS["gzip"]):
+        data = gzip.decompress(data[len(CONTENT_TYPE_MARKERS["gzip"]) :])
+    elif data.startswith(CONTENT_TYPE_MARKERS["zstd"]):
+        if zstandard is None:
+            raise KinesisError("zstandard is required to decode zstd records")
+        data = zstandard.ZstdDecompressor().decompress(
+            data[len(CONTENT_TYPE_MARKERS["zstd"]) :]
+        )
+    return json.loads(data)
+
+
 class Kinesis:
-    def __init__(self, stream_name: str = ""):
+    # PutRecords service limits.
+    MAX_RECORDS_PER_REQUEST = 500
+    MAX_BYTES_PER_REQUEST = 5 * 1024 * 1024
+    MAX_BYTES_PER_RECORD = 1024 * 1024
+
+    def __init__(
+        self,
+        stream_name: str = "",
+        max_retries: int = 3,
+        base_backoff_seconds: float = 0.1,
+        max_backoff_seconds: float = 2.0,
+        partition_strategy: PartitionStrategy = "peer",
+        rotate_partitions: int = 64,
+        encoding: RecordEncoding = "json",
+        max_entries_per_record: int = 1,
+        client: Any = None,
+    ):
+        """
+        Args:
+            stream_name: Stream to publish to. Empty uses a no-op implementation.
+            max_retries: Times failed PutRecords entries are retried.
+            base_backoff_seconds: Initial retry backoff, doubled on every retry.
+            max_backoff_seconds: Upper bound on retry backoff.
+            partition_strategy: How gossip entries are assigned partition keys.
+            rotate_partitions: Number of keys the "rotate" strategy cycles through.
+            encoding: Record encoding. "gzip" and "zstd" add a content-type marker.
+            max_entries_per_record: Gossip entries with the same partition key
+                packed into one record. Records over the size limit are split.
+            client: Client to use instead of boto3's, e.g. a LocalKinesisClient.
+        """
+        if partition_strategy not in ("peer", "rotate", "single"):
+            raise ValueError(f"Unknown partition strategy: {partition_strategy}")
+        if encoding not in ("json", "gzip", "zstd"):
+            raise ValueError(f"Unknown record encoding: {encoding}")
+        if encoding == "zstd" and zstandard is None:
+            raise ValueError("zstd record encoding requires the zstandard package")
+
         self.stream_name = stream_name
         self.logger = logging.getLogger(__name__)
+        self.max_retries = max_retries
+        self.base_backoff_seconds = base_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.stats = PutRecordsStats()
+        self.partition_strategy = partition_strategy
+        self.rotate_partitions = rotate_partitions
+        self.encoding = encoding
+        self.max_entries_per_record = max_entries_per_record
+        self._next_partition = 0
+        self._sleep = time.sleep
 
         # If no stream name is provided, use no-op implementation
         if not stream_name:
@@ -63,7 +171,7 @@ class Kinesis:
             return
 
         # Initialize Kinesis client if stream name is provided
-        self.kinesis = boto3.client("kinesis", region_name="us-west-2")
+        self.kinesis = client or boto3.client("kinesis", region_name="us-west-2")
 
         # Verify stream exists
         try:
@@ -75,53 +183,197 @@ class Kinesis:
             )
             raise KinesisError(f"Stream {stream_name} not found or not accessible")
 
-    def _put_record(self, data: Dict[str, Any], partition_key: str) -> None:
-        """Put a record to Kinesis stream"""
+    def _encode(self, data: Dict[str, Any]) -> bytes:
+        raw = json.dumps(data, cls=DateTimeEncoder).encode("utf-8")
+        if self.encoding == "gzip":
+            return CONTENT_TYPE_MARKERS["gzip"] + gzip.compress(raw)
+        if self.encoding == "zstd":
+            return CONTENT_TYPE_MARKERS["zstd"] + zstandard.ZstdCompressor().compress(raw)
+        return raw
+
+    def _record(self, data: Dict[str, Any], partition_key: str) -> Dict[str, Any]:
+        return {"Data": self._encode(data), "PartitionKey": partition_key}
+
+    @staticmethod
+    def _record_size(record: Dict[str, Any]) -> int:
+        # Kinesis counts the partition key against the size limits.
+        return len(record["Data"]) + len(record["PartitionKey"].encode("utf-8"))
+
+    def _batches(self, records: List[Dict[str, Any]]) -> Iterator[List[Dict[str, Any]]]:
+        """Splits records into PutRecords requests within the count and size limits."""
+        batch, batch_bytes = [], 0
+        for record in records:
+            size = self._record_size(record)
+            if size > self.MAX_BYTES_PER_RECORD:
+                raise KinesisError(
+                    f"Record of {size} bytes exceeds the {self.MAX_BYTES_PER_RECORD} byte limit"
+                )
+            if batch and (
+                len(batch) == self.MAX_RECORDS_PER_REQUEST
+                or batch_bytes + size > self.MAX_BYTES_PER_REQUEST
+            ):
+                yield batch
+                batch, batch_bytes = [], 0
+            batch.append(record)
+            batch_bytes += size
+        if batch:
+            yield batch
+
+    def _backoff_seconds(self, attempt: int) -> float:
+        # Exponential backoff with full jitter.
+        cap = min(self.max_backoff_seconds, self.base_backoff_seconds * 2**attempt)
+        return random.uniform(0, cap)
+
+    def _put_batch(self, batch: List[Dict[str, Any]]) -> None:
+        """Sends one PutRecords request, retrying only the entries that failed."""
+        start = time.monotonic()
+        pending = batch
+        attempt = 0
+        while True:
+            try:
+                response = self.kinesis.put_records(
+                    StreamName=self.stream_name, Records=pending
+                )
+            except ClientError as e:
+                self.stats.failed_batches += 1
+                self.logger.error(
+                    f"Failed to put records to Kinesis: {str(e)}", exc_info=True
+                )
+                raise KinesisError(f"Failed to put records to Kinesis: {str(e)}")
+
+            for result in response["Records"]:
+                if not result.get("ErrorCode"):
+                    self.stats.records_by_shard[result.get("ShardId")] += 1
+
+            if not response.get("FailedRecordCount"):
+                break
+
+            failed = [
+                record
+                for record, result in zip(pending, response["Records"])
+                if result.get("ErrorCode")
+            ]
+            if attempt >= self.max_retries:
+                self.stats.failed_batches += 1
+                error_codes = {r["ErrorCode"] for r in response["Records"] if r.get("ErrorCode")}
+                raise KinesisError(
+                    f"{len(failed)} records failed after {attempt} retries: {sorted(error_codes)}"
+                )
+
+            self.stats.retried_records += len(failed)
+            self._sleep(self._backoff_seconds(attempt))
+            attempt += 1
+            pending = failed
+
+        latency = time.monotonic() - start
+        batch_bytes = sum(self._record_size(r) for r in batch)
+        self.stats.batches += 1
+        self.stats.records += len(batch)
+        self.stats.bytes += batch_bytes
+        self.stats.last_batch_latency_seconds = latency
+        self.stats.total_latency_seconds += latency
+        self.logger.info(
+            f"Put {len(batch)} records ({batch_bytes} bytes) to Kinesis stream "
+            f"{self.stream_name} in {latency * 1000:.1f}ms "
+            f"({len(batch) / latency if latency else 0:.0f} records/s, {attempt} retries)"
+        )
+
+    def _put_records(self, records: List[Dict[str, Any]]) -> None:
+        """Put records to Kinesis stream in as few PutRecords requests as the limits allow"""
         # No-op if no stream name was provided
         if not self.kinesis:
-            self.logger.debug(
-                f"No-op: received record {data} with partition key {partition_key}"
-            )
+            self.logger.debug(f"No-op: received {len(records)} records")
             return
 
-        try:
-            self.logger.debug(
-                f"Preparing to put record to Kinesis stream: {self.stream_name}"
-            )
-            self.logger.debug(f"Partition key: {partition_key}")
-            self.logger.debug(f"Data: {json.dumps(data, cls=DateTimeEncoder)}")
+        self.logger.debug(
+            f"Preparing to put {len(records)} records to Kinesis stream: {self.stream_name}"
+        )
+        for batch in self._batches(records):
+            self._put_batch(batch)
 
-            response = self.kinesis.put_record(
-                StreamName=self.stream_name,
-                Data=json.dumps(data, cls=DateTimeEncoder),
-                PartitionKey=partition_key,
-            )
+    def put_records(self, records: List[Dict[str, Any]]) -> None:
+        """Put already encoded {"Data", "PartitionKey"} records, e.g. recorded ones being replayed"""
+        self._put_records(records)
 
-            self.logger.info(
-                f"Successfully put record to Kinesis stream: {self.stream_name}. "
-                f"SequenceNumber: {response.get('SequenceNumber')}, "
-                f"ShardId: {response.get('ShardId')}"
-            )
-        except ClientError as e:
-            self.logger.error(
-                f"Failed to put record to Kinesis: {str(e)}", exc_info=True
-            )
-            raise KinesisError(f"Failed to put record to Kinesis: {str(e)}")
-        except Exception as e:
-            self.logger.error(
-                f"Unexpected error putting record to Kinesis: {str(e)}", exc_info=True
-            )
-            raise KinesisError(f"Unexpected error putting record to Kinesis: {str(e)}")
+    def _partition_key(self, item: GossipMessageData) -> str:
+        if self.partition_strategy == "peer":
+            return item.peer_id
+        if self.partition_strategy == "rotate":
+            key = f"{SINGLE_PARTITION_KEY}-{self._next_partition % self.rotate_partitions}"
+            self._next_partition += 1
+            return key
+        return SINGLE_PARTITION_KEY
+
+    def _pack_gossip(
+        self, message_type: str, items: List[GossipMessageData], partition_key: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Encodes items as one GossipMessage record, halving the group until each
+        record fits the size limit. A single oversized entry is left for
+        _batches to reject.
+        """
+        message = GossipMessage(type=message_type, data=items)
+        record = self._record(message.model_dump(by_alias=True), partition_key)
+        if len(items) == 1 or self._record_size(record) <= self.MAX_BYTES_PER_RECORD:
+            return [record]
+
+        self.stats.records_split += 1
+        mid = len(items) // 2
+        return self._pack_gossip(message_type, items[:mid], partition_key) + self._pack_gossip(
+            message_type, items[mid:], partition_key
+        )
+
+    def _gossip_records(self, messages: List[GossipMessage]) -> List[Dict[str, Any]]:
+        """
+        Packs gossip entries into records of up to max_entries_per_record
+        entries that share a partition key, each a GossipMessage of its own.
+        """
+        records = []
+        for message in messages:
+            if self.max_entries_per_record <= 1:
+                # Keep entries in order, one per record.
+                for item in message.data:
+                    records.extend(self._pack_gossip(message.type, [item], self._partition_key(item)))
+                continue
+
+            groups: Dict[str, List[GossipMessageData]] = {}
+            for item in message.data:
+                groups.setdefault(self._partition_key(item), []).append(item)
+
+            for partition_key, items in groups.items():
+                for start in range(0, len(items), self.max_entries_per_record):
+                    chunk = items[start : start + self.max_entries_per_record]
+                    records.extend(self._pack_gossip(message.type, chunk, partition_key))
+
+        for record in records:
+            size = self._record_size(record)
+            self.stats.record_size_histogram[1 << max(size - 1, 0).bit_length()] += 1
+        return records
+
+    def put_gossip(
+        self, data: GossipMessage, on_done: Optional[Callable[[bool], None]] = None
+    ) -> None:
+        """
+        Put gossip data to Kinesis stream.
+
+        on_done is called with True once the message is sent; failures raise instead.
+        """
+        self.put_gossip_batch([data])
+        if on_done:
+            on_done(True)
 
-    def put_gossip(self, data: GossipMessage) -> None:
-        """Put gossip data to Kinesis stream"""
+    def put_gossip_batch(self, messages: List[GossipMessage]) -> None:
+        """Put several gossip messages to Kinesis stream, batched into PutRecords calls"""
         try:
             self.logger.info("Preparing to put gossip data to Kinesis")
+            records = self._gossip_records(messages)
             self.logger.debug(
-                f"Gossip data: {json.dumps(data.model_dump(by_alias=True), cls=DateTimeEncoder)}"
+                f"Encoded {sum(len(m.data) for m in messages)} gossip entries into "
+                f"{len(records)} {self.encoding} records "
+                f"({sum(len(r['Data']) for r in records)} bytes)"
             )
-            self._put_record(data.model_dump(by_alias=True), "swarm-gossip")
+            self._put_records(records)
             self.logger.info("Successfully put gossip data to Kinesis")
         except Exception as e:
             self.logger.error(f"Failed to put gossip data: {str(e)}", exc_info=True)
-            raise KinesisError(f"Failed to put gossip data: {str(e)}")
\ No newline at end of file
+            raise KinesisError(f"Failed to put gossip data: {str(e)}")
@@ -0,0 +1,237 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Literal
+
+from .kinesis import GossipMessage, Kinesis
+
+BackpressurePolicy = Literal["block", "drop_oldest", "spill"]
+DeliveryCallback = Callable[[bool], None]
+
+
+@dataclass
+class SinkStats:
+    """Running totals for a BufferedKinesisSink."""
+
+    enqueued: int = 0
+    sent: int = 0
+    failed: int = 0
+    dropped: int = 0
+    spilled: int = 0
+    flushes: int = 0
+
+
+class BufferedKinesisSink:
+    """
+    Drop-in replacement for Kinesis.put_gossip that returns immediately.
+
+    Messages go into a bounded in-memory queue that a background thread
+    flushes with Kinesis.put_gossip_batch once flush_size messages are waiting
+    or flush_interval_seconds has passed. When the queue is full the
+    backpressure policy decides what happens:
+
+        block        put_gossip waits for room (up to block_timeout_seconds)
+        drop_oldest  the oldest queued message is discarded
+        spill        the message is appended to a file in spill_dir and sent
+                     once the in-memory queue has drained
+
+    stop() flushes everything still queued or spilled before returning.
+
+    Since put_gossip returns before the message is sent, callers that need to
+    know whether it was delivered pass on_done. It is called from the flusher
+    thread with True once the message is sent, or with False if the flush
+    failed or the message was dropped, so it should only record the outcome.
+    """
+
+    def __init__(
+        self,
+        kinesis: Kinesis,
+        max_queue_size: int = 1000,
+        flush_size: int = 100,
+        flush_interval_seconds: float = 1.0,
+        backpressure: BackpressurePolicy = "block",
+        block_timeout_seconds: float | None = None,
+        spill_dir: str | None = None,
+        logger: logging.Logger | None = None,
+    ):
+        if backpressure not in ("block", "drop_oldest", "spill"):
+            raise ValueError(f"Unknown backpressure policy: {backpressure}")
+        if backpressure == "spill" and not spill_dir:
+            raise ValueError("spill_dir is required for the spill backpressure policy")
+
+        self.kinesis = kinesis
+        self.max_queue_size = max_queue_size
+        self.flush_size = flush_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.backpressure = backpressure
+        self.block_timeout_seconds = block_timeout_seconds
+        self.logger = logger or logging.getLogger(__name__)
+        self.stats = SinkStats()
+
+        self.spill_path = None
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+            self.spill_path = os.path.join(spill_dir, "gossip-spill.jsonl")
+
+        self._queue: deque[tuple[GossipMessage, DeliveryCallback | None]] = deque()
+        # Callbacks for the messages this process spilled, in spill file order.
+        # Messages left in the file by an earlier process come first and have none.
+        self._spill_callbacks: deque[DeliveryCallback | None] = deque()
+        self._spill_orphans = self._count_spilled()
+        # Bytes of the spill file already moved back into memory.
+        self._spill_offset = 0
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._flush_thread = None
+
+    def start(self):
+        """Start the background flusher."""
+        if self._flush_thread and self._flush_thread.is_alive():
+            # Also covers a flusher still draining after stop() timed out.
+            self.logger.warning("BufferedKinesisSink is already running")
+            return
+        self._stopping = False
+        self._flush_thread = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flush_thread.start()
+
+    def stop(self, timeout: float | None = 30):
+        """Stop accepting messages and wait for everything queued to be sent."""
+        if not self._flush_thread:
+            return
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        self._flush_thread.join(timeout=timeout)
+        if self._flush_thread.is_alive():
+            # Keep the handle so start() can't run a second flusher alongside it.
+            self.logger.warning(
+                "BufferedKinesisSink did not drain before timeout",
+                extra={"queued": len(self._queue)},
+            )
+            return
+        self._flush_thread = None
+
+    def put_gossip(
+        self, data: GossipMessage, on_done: DeliveryCallback | None = None
+    ) -> None:
+        """Queue a gossip message for the background flusher."""
+        with self._cond:
+            if self._stopping:
+                raise RuntimeError("BufferedKinesisSink is stopped")
+
+            if len(self._queue) >= self.max_queue_size:
+                if self.backpressure == "block":
+                    has_room = self._cond.wait_for(
+                        lambda: len(self._queue) < self.max_queue_size or self._stopping,
+                        timeout=self.block_timeout_seconds,
+                    )
+                    if not has_room or self._stopping:
+                        self.stats.dropped += 1
+                        self.logger.warning("Dropped gossip message: sink queue is full")
+                        _report([on_done], False)
+                        return
+                elif self.backpressure == "drop_oldest":
+                    _, dropped_on_done = self._queue.popleft()
+                    self.stats.dropped += 1
+                    _report([dropped_on_done], False)
+                else:
+                    self._spill(data, on_done)
+                    return
+
+            self._queue.append((data, on_done))
+            self.stats.enqueued += 1
+            if len(self._queue) >= self.flush_size:
+                self._cond.notify_all()
+
+    def _spill(self, data: GossipMessage, on_done: DeliveryCallback | None) -> None:
+        with open(self.spill_path, "a") as f:
+            f.write(data.model_dump_json(by_alias=True) + "\n")
+        self._spill_callbacks.append(on_done)
+        self.stats.spilled += 1
+
+    def _count_spilled(self) -> int:
+        if not self.spill_path or not os.path.exists(self.spill_path):
+            return 0
+        with open(self.spill_path, "rb") as f:
+            return sum(1 for line in f if line.strip())
+
+    def _unspill(self) -> list[tuple[GossipMessage, DeliveryCallback | None]]:
+        """
+        Moves spilled messages back into memory, oldest first, only as many as
+        fit in the queue. The rest stay on disk for the next call, and the file
+        is removed once it has all been read.
+        """
+        if not self.spill_path or not os.path.exists(self.spill_path):
+            return []
+
+        room = self.max_queue_size - len(self._queue)
+        unspilled = []
+        with open(self.spill_path, "rb") as f:
+            f.seek(self._spill_offset)
+            while len(unspilled) < room and (line := f.readline()):
+                if not line.strip():
+                    continue
+                if self._spill_orphans:
+                    self._spill_orphans -= 1
+                    on_done = None
+                else:
+                    on_done = self._spill_callbacks.popleft()
+                unspilled.append((GossipMessage.model_validate_json(line), on_done))
+            self._spill_offset = f.tell()
+            exhausted = self._spill_offset >= os.fstat(f.fileno()).st_size
+
+        if exhausted:
+            os.remove(self.spill_path)
+            self._spill_offset = 0
+        return unspilled
+
+    def _next_batch(
+        self,
+    ) -> list[tuple[GossipMessage, DeliveryCallback | None]] | None:
+        """Waits for a batch to flush; returns None once stopped and fully drained."""
+        with self._cond:
+            deadline = time.monotonic() + self.flush_interval_seconds
+            while len(self._queue) < self.flush_size and not self._stopping:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            if not self._queue:
+                # Spilled messages are only read back once memory has drained.
+                self._queue.extend(self._unspill())
+                if not self._queue:
+                    return None if self._stopping else []
+
+            n = min(self.flush_size, len(self._queue))
+            batch = [self._queue.popleft() for _ in range(n)]
+            self._cond.notify_all()
+            return batch
+
+    def _flush_loop(self):
+        while (batch := self._next_batch()) is not None:
+            if not batch:
+                continue
+            self.stats.flushes += 1
+            messages, callbacks = zip(*batch)
+            try:
+                self.kinesis.put_gossip_batch(list(messages))
+                self.stats.sent += len(batch)
+            except Exception as e:
+                self.stats.failed += len(batch)
+                self.logger.error(
+                    "Error flushing gossip to Kinesis",
+                    extra={"error": str(e), "num_messages": len(batch)},
+                )
+                _report(callbacks, False)
+            else:
+                _report(callbacks, True)
+
+
+def _report(callbacks, delivered: bool) -> None:
+    for on_done in callbacks:
+        if on_done:
+            on_done(delivered)
@@ -0,0 +1,213 @@
+import threading
+import time
+from datetime import datetime, timezone
+from unittest.mock import Mock
+
+import pytest
+
+from .kinesis import GossipMessage, GossipMessageData
+from .kinesis_sink import BufferedKinesisSink
+
+TEST_TIME = datetime(2024, 3, 21, 12, 34, 56, 789000, tzinfo=timezone.utc)
+
+
+def _message(i):
+    return GossipMessage(
+        data=[
+            GossipMessageData(
+                id=f"msg{i}",
+                peerId="peer1",
+                peerName="Peer 1",
+                message="Hello world",
+                timestamp=TEST_TIME,
+            )
+        ]
+    )
+
+
+def _sent_ids(kinesis):
+    return [
+        m.data[0].id
+        for call in kinesis.put_gossip_batch.call_args_list
+        for m in call.args[0]
+    ]
+
+
+def test_flushes_on_size():
+    kinesis = Mock()
+    sink = BufferedKinesisSink(kinesis, flush_size=3, flush_interval_seconds=60)
+    sink.start()
+    for i in range(3):
+        sink.put_gossip(_message(i))
+
+    deadline = time.monotonic() + 5
+    while not kinesis.put_gossip_batch.called and time.monotonic() < deadline:
+        time.sleep(0.01)
+    sink.stop()
+    assert _sent_ids(kinesis) == ["msg0", "msg1", "msg2"]
+    assert sink.stats.sent == 3
+
+
+def test_stop_drains_queue():
+    kinesis = Mock()
+    sink = BufferedKinesisSink(kinesis, flush_size=100, flush_interval_seconds=60)
+    sink.start()
+    sink.put_gossip(_message(0))
+    sink.put_gossip(_message(1))
+    sink.stop()
+    assert _sent_ids(kinesis) == ["msg0", "msg1"]
+    with pytest.raises(RuntimeError):
+        sink.put_gossip(_message(2))
+
+
+def test_drop_oldest():
+    kinesis = Mock()
+    sink = BufferedKinesisSink(kinesis, max_queue_size=2, backpressure="drop_oldest")
+    for i in range(4):
+        sink.put_gossip(_message(i))
+    sink.start()
+    sink.stop()
+    assert _sent_ids(kinesis) == ["msg2", "msg3"]
+    assert sink.stats.dropped == 2
+
+
+def test_block_waits_for_room():
+    release = threading.Event()
+    kinesis = Mock()
+    kinesis.put_gossip_batch.side_effect = lambda batch: release.wait(5)
+    sink = BufferedKinesisSink(
+        kinesis, max_queue_size=1, flush_size=1, flush_interval_seconds=0.01
+    )
+    sink.start()
+    sink.put_gossip(_message(0))  # Taken by the flusher, which then blocks.
+    sink.put_gossip(_message(1))  # Fills the queue.
+
+    blocked = threading.Thread(target=sink.put_gossip, args=(_message(2),))
+    blocked.start()
+    blocked.join(0.1)
+    assert blocked.is_alive()
+
+    release.set()
+    blocked.join(5)
+    sink.stop()
+    assert _sent_ids(kinesis) == ["msg0", "msg1", "msg2"]
+
+
+def test_block_timeout_drops():
+    sink = BufferedKinesisSink(Mock(), max_queue_size=1, block_timeout_seconds=0.01)
+    sink.put_gossip(_message(0))
+    sink.put_gossip(_message(1))
+    assert sink.stats.dropped == 1
+
+
+def test_spill_to_disk(tmp_path):
+    kinesis = Mock()
+    sink = BufferedKinesisSink(
+        kinesis, max_queue_size=1, backpressure="spill", spill_dir=str(tmp_path)
+    )
+    for i in range(3):
+        sink.put_gossip(_message(i))
+    assert sink.stats.spilled == 2
+
+    sink.start()
+    sink.stop()
+    assert _sent_ids(kinesis) == ["msg0", "msg1", "msg2"]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_failed_flush_is_counted():
+    kinesis = Mock()
+    kinesis.put_gossip_batch.side_effect = Exception("boom")
+    sink = BufferedKinesisSink(kinesis)
+    sink.put_gossip(_message(0))
+    sink.start()
+    sink.stop()
+    assert sink.stats.failed == 1
+    assert sink.stats.sent == 0
+
+
+def test_reports_delivery():
+    kinesis = Mock()
+    sink = BufferedKinesisSink(kinesis, max_queue_size=1, backpressure="drop_oldest")
+    results = {}
+    for i in range(2):
+        sink.put_gossip(_message(i), on_done=lambda ok, i=i: results.setdefault(i, ok))
+    assert results == {0: False}
+
+    sink.start()
+    sink.stop()
+    assert results == {0: False, 1: True}
+
+
+def test_reports_failed_flush_and_spilled_delivery(tmp_path):
+    kinesis = Mock()
+    kinesis.put_gossip_batch.side_effect = Exception("boom")
+    sink = BufferedKinesisSink(
+        kinesis, max_queue_size=1, backpressure="spill", spill_dir=str(tmp_path)
+    )
+    results = {}
+    for i in range(2):
+        sink.put_gossip(_message(i), on_done=lambda ok, i=i: results.setdefault(i, ok))
+    sink.start()
+    sink.stop()
+    assert results == {0: False, 1: False}
+
+
+def test_unspill_reads_back_at_most_a_queue_of_messages(tmp_path):
+    kinesis = Mock()
+    sink = BufferedKinesisSink(
+        kinesis, max_queue_size=2, backpressure="spill", spill_dir=str(tmp_path)
+    )
+    for i in range(7):
+        sink.put_gossip(_message(i))
+    assert sink.stats.spilled == 5
+    sink._queue.clear()
+
+    batches = []
+    while unspilled := sink._unspill():
+        assert len(unspilled) <= sink.max_queue_size
+        batches.append([m.data[0].id for m, _ in unspilled])
+    assert batches == [["msg2", "msg3"], ["msg4", "msg5"], ["msg6"]]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_sends_messages_spilled_by_an_earlier_process(tmp_path):
+    earlier = BufferedKinesisSink(
+        Mock(), max_queue_size=1, backpressure="spill", spill_dir=str(tmp_path)
+    )
+    for i in range(3):
+        earlier.put_gossip(_message(i))
+
+    kinesis = Mock()
+    sink = BufferedKinesisSink(
+        kinesis, max_queue_size=1, backpressure="spill", spill_dir=str(tmp_path)
+    )
+    results = []
+    sink.put_gossip(_message(3), on_done=results.append)
+    sink.put_gossip(_message(4), on_done=results.append)  # Spilled after the old lines.
+    sink.start()
+    sink.stop()
+    assert _sent_ids(kinesis) == ["msg3", "msg1", "msg2", "msg4"]
+    assert results == [True, True]
+
+
+def test_restart_waits_for_flusher_that_outlived_stop():
+    release = threading.Event()
+    kinesis = Mock()
+    kinesis.put_gossip_batch.side_effect = lambda batch: release.wait(5)
+    sink = BufferedKinesisSink(kinesis, flush_interval_seconds=0.01)
+    sink.start()
+    sink.put_gossip(_message(0))
+    while not kinesis.put_gossip_batch.called:
+        time.sleep(0.01)
+
+    sink.stop(timeout=0.05)
+    flusher = sink._flush_thread
+    assert flusher is not None and flusher.is_alive()
+    sink.start()
+    assert sink._flush_thread is flusher
+
+    release.set()
+    sink.stop()
+    assert not flusher.is_alive()
+    assert sink._flush_thread is None
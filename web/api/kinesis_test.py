@@ -6,10 +6,12 @@ import pytest
 from botocore.exceptions import ClientError
 
 from .kinesis import (
+    CONTENT_TYPE_MARKERS,
     GossipMessage,
     GossipMessageData,
     Kinesis,
     KinesisError,
+    decode_record,
 )
 
 # Hardcoded UTC time for testing
@@ -28,10 +30,13 @@ def mock_kinesis_client():
             "StreamDescription": {"StreamName": "test-stream", "StreamStatus": "ACTIVE"}
         }
 
-        # Mock put_record response
-        mock_kinesis.put_record.return_value = {
-            "SequenceNumber": "1234567890",
-            "ShardId": "shard-000000000001",
+        # Mock put_records response
+        mock_kinesis.put_records.side_effect = lambda StreamName, Records: {
+            "FailedRecordCount": 0,
+            "Records": [
+                {"SequenceNumber": "1234567890", "ShardId": "shard-000000000001"}
+                for _ in Records
+            ],
         }
 
         # Set the mock client to return our mock kinesis instance
@@ -86,14 +91,16 @@ def test_put_gossip(kinesis_instance, mock_kinesis_client):
     kinesis_instance.put_gossip(gossip_message)
 
     # Verify the client was called correctly
-    mock_kinesis_client.put_record.assert_called_once()
-    call_args = mock_kinesis_client.put_record.call_args[1]
+    mock_kinesis_client.put_records.assert_called_once()
+    call_args = mock_kinesis_client.put_records.call_args[1]
 
     assert call_args["StreamName"] == "test-stream"
-    assert call_args["PartitionKey"] == "swarm-gossip"
+    assert len(call_args["Records"]) == 1
+    record = call_args["Records"][0]
+    assert record["PartitionKey"] == "peer1"
 
     # Verify the data was serialized correctly
-    data = json.loads(call_args["Data"])
+    data = json.loads(record["Data"])
     assert data["type"] == "gossip"
     assert len(data["data"]) == 1
     assert data["data"][0]["id"] == "msg1"
@@ -131,4 +138,213 @@ def test_kinesis_no_op_put_gossip(kinesis_instance, mock_kinesis_client):
     no_op_kinesis.put_gossip(gossip_message)
 
     # Verify the client was not called
-    mock_kinesis_client.put_record.assert_not_called()
+    mock_kinesis_client.put_records.assert_not_called()
+
+
+class StubKinesisClient:
+    """Local stand-in for the boto3 Kinesis client's PutRecords API."""
+
+    def __init__(self, failures=()):
+        # Each entry is the set of record indexes to fail on that call.
+        self.failures = list(failures)
+        self.calls = []
+
+    def describe_stream(self, StreamName):
+        return {"StreamDescription": {"StreamName": StreamName}}
+
+    def put_records(self, StreamName, Records):
+        self.calls.append(list(Records))
+        failed = self.failures.pop(0) if self.failures else set()
+        results = []
+        for i, record in enumerate(Records):
+            if i in failed:
+                results.append(
+                    {
+                        "ErrorCode": "ProvisionedThroughputExceededException",
+                        "ErrorMessage": "Rate exceeded",
+                    }
+                )
+            else:
+                shard = sum(record["PartitionKey"].encode()) % 2
+                results.append({"SequenceNumber": str(i), "ShardId": f"shard-{shard}"})
+        return {"FailedRecordCount": len(failed), "Records": results}
+
+
+@pytest.fixture
+def stub_kinesis():
+    stub = StubKinesisClient()
+    with patch("boto3.client", return_value=stub):
+        kinesis = Kinesis("test-stream", base_backoff_seconds=0.01)
+    kinesis._sleep = Mock()
+    return kinesis, stub
+
+
+def _gossip_message(i, message="Hello world"):
+    return GossipMessage(
+        data=[
+            GossipMessageData(
+                id=f"msg{i}",
+                peerId="peer1",
+                peerName="Peer 1",
+                message=message,
+                timestamp=TEST_TIME,
+            )
+        ]
+    )
+
+
+def test_put_gossip_batch_respects_record_limit(stub_kinesis):
+    kinesis, stub = stub_kinesis
+    kinesis.put_gossip_batch([_gossip_message(i) for i in range(1201)])
+
+    assert [len(c) for c in stub.calls] == [500, 500, 201]
+    assert kinesis.stats.batches == 3
+    assert kinesis.stats.records == 1201
+
+
+def test_put_gossip_batch_respects_size_limit(stub_kinesis):
+    kinesis, stub = stub_kinesis
+    big = "x" * (900 * 1024)
+    kinesis.put_gossip_batch([_gossip_message(i, big) for i in range(12)])
+
+    # Five ~900KB records fit under the 5MB request limit.
+    assert [len(c) for c in stub.calls] == [5, 5, 2]
+
+
+def test_put_gossip_batch_rejects_oversized_record(stub_kinesis):
+    kinesis, stub = stub_kinesis
+    with pytest.raises(KinesisError, match="exceeds"):
+        kinesis.put_gossip(_gossip_message(0, "x" * (1024 * 1024)))
+    assert stub.calls == []
+
+
+def test_put_gossip_batch_retries_only_failed_records(stub_kinesis):
+    kinesis, stub = stub_kinesis
+    stub.failures = [{1, 3}, {0}]
+    kinesis.put_gossip_batch([_gossip_message(i) for i in range(5)])
+
+    ids = [[json.loads(r["Data"])["data"][0]["id"] for r in c] for c in stub.calls]
+    assert ids == [
+        ["msg0", "msg1", "msg2", "msg3", "msg4"],
+        ["msg1", "msg3"],
+        ["msg1"],
+    ]
+    assert kinesis._sleep.call_count == 2
+    assert kinesis.stats.retried_records == 3
+    assert kinesis.stats.records == 5
+
+
+def test_put_gossip_batch_gives_up_after_max_retries(stub_kinesis):
+    kinesis, stub = stub_kinesis
+    stub.failures = [{0}] * (kinesis.max_retries + 1)
+    with pytest.raises(KinesisError, match="failed after 3 retries"):
+        kinesis.put_gossip(_gossip_message(0))
+    assert len(stub.calls) == kinesis.max_retries + 1
+    assert kinesis.stats.failed_batches == 1
+
+
+def _multi_peer_message(peers):
+    return GossipMessage(
+        data=[
+            GossipMessageData(
+                id=f"msg{i}",
+                peerId=peer,
+                peerName=peer,
+                message="Hello world",
+                timestamp=TEST_TIME,
+            )
+            for i, peer in enumerate(peers)
+        ]
+    )
+
+
+def test_put_gossip_one_record_per_entry(stub_kinesis):
+    kinesis, stub = stub_kinesis
+    kinesis.put_gossip(_multi_peer_message(["a", "b", "a"]))
+
+    (records,) = stub.calls
+    assert [r["PartitionKey"] for r in records] == ["a", "b", "a"]
+    for i, record in enumerate(records):
+        data = json.loads(record["Data"])
+        assert data["type"] == "gossip"
+        assert [d["id"] for d in data["data"]] == [f"msg{i}"]
+    # "a" and "b" hash to different stub shards.
+    assert kinesis.stats.records_by_shard == {"shard-1": 2, "shard-0": 1}
+
+
+@pytest.mark.parametrize(
+    "strategy,expected",
+    [
+        ("single", ["swarm-gossip"] * 3),
+        ("rotate", ["swarm-gossip-0", "swarm-gossip-1", "swarm-gossip-0"]),
+    ],
+)
+def test_partition_strategies(strategy, expected):
+    stub = StubKinesisClient()
+    with patch("boto3.client", return_value=stub):
+        kinesis = Kinesis(
+            "test-stream", partition_strategy=strategy, rotate_partitions=2
+        )
+    kinesis.put_gossip(_multi_peer_message(["a", "b", "a"]))
+    assert [r["PartitionKey"] for r in stub.calls[0]] == expected
+
+
+def test_unknown_partition_strategy():
+    with pytest.raises(ValueError):
+        Kinesis("", partition_strategy="random")
+
+
+@pytest.mark.parametrize("encoding", ["json", "gzip"])
+def test_record_encoding_round_trips(encoding):
+    stub = StubKinesisClient()
+    with patch("boto3.client", return_value=stub):
+        kinesis = Kinesis("test-stream", encoding=encoding, max_entries_per_record=10)
+    kinesis.put_gossip(_multi_peer_message(["a", "b", "a"]))
+
+    records = stub.calls[0]
+    assert [r["PartitionKey"] for r in records] == ["a", "b"]
+    if encoding == "gzip":
+        assert records[0]["Data"].startswith(CONTENT_TYPE_MARKERS["gzip"])
+    decoded = [decode_record(r["Data"]) for r in records]
+    assert [[d["id"] for d in m["data"]] for m in decoded] == [["msg0", "msg2"], ["msg1"]]
+
+
+def test_gzip_shrinks_repetitive_gossip():
+    stub = StubKinesisClient()
+    with patch("boto3.client", return_value=stub):
+        plain = Kinesis("test-stream", partition_strategy="single", max_entries_per_record=200)
+        packed = Kinesis(
+            "test-stream", partition_strategy="single", max_entries_per_record=200, encoding="gzip"
+        )
+    message = _multi_peer_message([f"peer{i}" for i in range(200)])
+    plain.put_gossip(message)
+    packed.put_gossip(message)
+    assert plain.stats.bytes > 5 * packed.stats.bytes
+
+
+def test_oversized_records_are_split(stub_kinesis):
+    kinesis, stub = stub_kinesis
+    kinesis.max_entries_per_record = 10
+    big = "x" * (300 * 1024)
+    message = GossipMessage(
+        data=[
+            GossipMessageData(
+                id=f"msg{i}", peerId="a", peerName="a", message=big, timestamp=TEST_TIME
+            )
+            for i in range(7)
+        ]
+    )
+    kinesis.put_gossip(message)
+
+    records = [r for call in stub.calls for r in call]
+    ids = [[d["id"] for d in decode_record(r["Data"])["data"]] for r in records]
+    assert [i for chunk in ids for i in chunk] == [f"msg{i}" for i in range(7)]
+    assert all(len(r["Data"]) <= Kinesis.MAX_BYTES_PER_RECORD for r in records)
+    assert kinesis.stats.records_split > 0
+    assert sum(kinesis.stats.record_size_histogram.values()) == len(records)
+    assert set(kinesis.stats.record_size_histogram) <= {512 * 1024, 1024 * 1024}
+
+
+def test_unknown_encoding():
+    with pytest.raises(ValueError):
+        Kinesis("", encoding="brotli")
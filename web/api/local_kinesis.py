@@ -0,0 +1,233 @@
+"""
+File-backed stand-in for the Kinesis stream, for offline runs, replay and load tests.
+
+LocalKinesisClient implements the parts of the boto3 Kinesis client that
+Kinesis uses, so Kinesis(..., client=LocalKinesisClient(dir)) exercises the
+real batching, encoding and partitioning code while appending records to
+rotating segment files instead of AWS.
+
+Replay recorded segments into a stream (or another directory) with:
+    python -m api.local_kinesis replay DIR --rate 500 --stream my-stream
+    python -m api.local_kinesis replay DIR --rate 500 --to-dir OTHER_DIR
+"""
+
+import argparse
+import base64
+import glob
+import hashlib
+import json
+import logging
+import os
+import struct
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Literal
+
+from .kinesis import Kinesis
+
+SegmentFormat = Literal["jsonl", "binary"]
+
+# Binary frame header: arrival time, shard index, partition key length, data length.
+_FRAME_HEADER = struct.Struct(">dIII")
+
+logger = logging.getLogger(__name__)
+
+
+def shard_for_key(partition_key: str, num_shards: int) -> int:
+    """Maps a partition key to a shard the way Kinesis does: MD5 over evenly split hash ranges."""
+    hash_key = int.from_bytes(hashlib.md5(partition_key.encode("utf-8")).digest(), "big")
+    return hash_key * num_shards >> 128
+
+
+class LocalKinesisClient:
+    """
+    Appends put_records calls to segment files in a directory, starting a new
+    segment once the current one reaches segment_max_bytes.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_format: SegmentFormat = "jsonl",
+        segment_max_bytes: int = 64 * 1024 * 1024,
+        num_shards: int = 4,
+    ):
+        if segment_format not in ("jsonl", "binary"):
+            raise ValueError(f"Unknown segment format: {segment_format}")
+
+        self.directory = directory
+        self.segment_format = segment_format
+        self.segment_max_bytes = segment_max_bytes
+        self.num_shards = num_shards
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._sequence = 0
+        existing = _segment_paths(directory)
+        self._segment_index = _segment_number(existing[-1]) + 1 if existing else 0
+        self._segment = None
+        self._segment_bytes = 0
+
+    def describe_stream(self, StreamName: str) -> Dict[str, Any]:
+        return {
+            "StreamDescription": {
+                "StreamName": StreamName,
+                "StreamStatus": "ACTIVE",
+                "Shards": [{"ShardId": self._shard_id(i)} for i in range(self.num_shards)],
+            }
+        }
+
+    @staticmethod
+    def _shard_id(index: int) -> str:
+        return f"shardId-{index:012d}"
+
+    def _open_segment(self):
+        if self._segment:
+            self._segment.close()
+        extension = "jsonl" if self.segment_format == "jsonl" else "bin"
+        path = os.path.join(self.directory, f"segment-{self._segment_index:06d}.{extension}")
+        self._segment_index += 1
+        self._segment = open(path, "ab")
+        self._segment_bytes = 0
+
+    def _frame(self, ts: float, shard: int, record: Dict[str, Any]) -> bytes:
+        data = record["Data"]
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        partition_key = record["PartitionKey"]
+        if self.segment_format == "binary":
+            key = partition_key.encode("utf-8")
+            return _FRAME_HEADER.pack(ts, shard, len(key), len(data)) + key + data
+        line = {
+            "ts": ts,
+            "shardId": self._shard_id(shard),
+            "partitionKey": partition_key,
+            "data": base64.b64encode(data).decode("ascii"),
+        }
+        return (json.dumps(line) + "\n").encode("utf-8")
+
+    def put_records(self, StreamName: str, Records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        results = []
+        with self._lock:
+            ts = time.time()
+            for record in Records:
+                if not self._segment or self._segment_bytes >= self.segment_max_bytes:
+                    self._open_segment()
+                shard = shard_for_key(record["PartitionKey"], self.num_shards)
+                frame = self._frame(ts, shard, record)
+                self._segment.write(frame)
+                self._segment_bytes += len(frame)
+                self._sequence += 1
+                results.append(
+                    {"SequenceNumber": str(self._sequence), "ShardId": self._shard_id(shard)}
+                )
+            self._segment.flush()
+        return {"FailedRecordCount": 0, "Records": results}
+
+    def close(self):
+        with self._lock:
+            if self._segment:
+                self._segment.close()
+                self._segment = None
+
+
+def _segment_paths(directory: str) -> List[str]:
+    return sorted(glob.glob(os.path.join(directory, "segment-*.*")))
+
+
+def _segment_number(path: str) -> int:
+    return int(os.path.basename(path).split("-")[1].split(".")[0])
+
+
+def read_records(directory: str) -> Iterator[Dict[str, Any]]:
+    """Yields recorded entries, oldest segment first, as {"ts", "PartitionKey", "Data"}."""
+    for path in _segment_paths(directory):
+        with open(path, "rb") as f:
+            if path.endswith(".jsonl"):
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        yield {
+                            "ts": entry["ts"],
+                            "PartitionKey": entry["partitionKey"],
+                            "Data": base64.b64decode(entry["data"]),
+                        }
+                continue
+
+            while header := f.read(_FRAME_HEADER.size):
+                if len(header) < _FRAME_HEADER.size:
+                    logger.warning(f"Truncated frame at end of {path}")
+                    break
+                ts, _, key_len, data_len = _FRAME_HEADER.unpack(header)
+                key = f.read(key_len).decode("utf-8")
+                yield {"ts": ts, "PartitionKey": key, "Data": f.read(data_len)}
+
+
+def replay(
+    directory: str,
+    client: Any,
+    stream_name: str,
+    rate: float | None = None,
+    batch_size: int = 500,
+) -> int:
+    """
+    Sends recorded entries to a Kinesis-compatible client, at most rate records
+    per second (unthrottled if None). Returns the number of records sent.
+
+    Records go through Kinesis.put_records in groups of batch_size, so replay
+    gets the same PutRecords count and size limits and the same retries of
+    failed entries as the live publisher.
+    """
+    kinesis = Kinesis(stream_name, client=client)
+    start = time.monotonic()
+    sent = 0
+    batch = []
+
+    def flush():
+        nonlocal sent, batch
+        kinesis.put_records(batch)
+        sent += len(batch)
+        batch = []
+        if rate:
+            ahead = sent / rate - (time.monotonic() - start)
+            if ahead > 0:
+                time.sleep(ahead)
+
+    for entry in read_records(directory):
+        batch.append({"Data": entry["Data"], "PartitionKey": entry["PartitionKey"]})
+        if len(batch) == batch_size:
+            flush()
+    if batch:
+        flush()
+    return sent
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    replay_parser = subparsers.add_parser("replay", help="replay recorded segments")
+    replay_parser.add_argument("directory")
+    replay_parser.add_argument("--rate", type=float, default=None, help="records per second")
+    replay_parser.add_argument("--batch-size", type=int, default=500)
+    target = replay_parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--stream", help="Kinesis stream to replay into")
+    target.add_argument("--to-dir", help="directory to replay into with a LocalKinesisClient")
+    args = parser.parse_args()
+
+    if args.stream:
+        import boto3
+
+        client = boto3.client("kinesis", region_name="us-west-2")
+        stream_name = args.stream
+    else:
+        client = LocalKinesisClient(args.to_dir)
+        stream_name = "local"
+
+    start = time.monotonic()
+    sent = replay(args.directory, client, stream_name, args.rate, args.batch_size)
+    elapsed = time.monotonic() - start
+    print(f"Replayed {sent} records in {elapsed:.2f}s ({sent / elapsed if elapsed else 0:.0f} records/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from .kinesis import GossipMessage, GossipMessageData, Kinesis, decode_record
+from .local_kinesis import (
+    LocalKinesisClient,
+    _segment_paths,
+    read_records,
+    replay,
+    shard_for_key,
+)
+
+TEST_TIME = datetime(2024, 3, 21, 12, 34, 56, 789000, tzinfo=timezone.utc)
+
+
+def _message(n, peers=("peer1", "peer2")):
+    return GossipMessage(
+        data=[
+            GossipMessageData(
+                id=f"msg{i}",
+                peerId=peers[i % len(peers)],
+                peerName="Peer",
+                message="Hello world",
+                timestamp=TEST_TIME,
+            )
+            for i in range(n)
+        ]
+    )
+
+
+@pytest.mark.parametrize("segment_format", ["jsonl", "binary"])
+def test_records_round_trip(tmp_path, segment_format):
+    client = LocalKinesisClient(str(tmp_path), segment_format=segment_format)
+    kinesis = Kinesis("local", client=client, encoding="gzip")
+    kinesis.put_gossip(_message(5))
+    client.close()
+
+    records = list(read_records(str(tmp_path)))
+    assert [r["PartitionKey"] for r in records] == ["peer1", "peer2"] * 2 + ["peer1"]
+    assert [decode_record(r["Data"])["data"][0]["id"] for r in records] == [
+        f"msg{i}" for i in range(5)
+    ]
+    assert sum(kinesis.stats.records_by_shard.values()) == 5
+
+
+def test_segments_rotate(tmp_path):
+    client = LocalKinesisClient(str(tmp_path), segment_max_bytes=1)
+    Kinesis("local", client=client).put_gossip(_message(3))
+    client.close()
+    assert len(_segment_paths(str(tmp_path))) == 3
+
+    # A new client continues after the existing segments.
+    client = LocalKinesisClient(str(tmp_path), segment_max_bytes=1)
+    Kinesis("local", client=client).put_gossip(_message(1))
+    client.close()
+    assert len(_segment_paths(str(tmp_path))) == 4
+    assert len(list(read_records(str(tmp_path)))) == 4
+
+
+def test_shard_for_key_spreads_keys():
+    shards = {shard_for_key(f"peer{i}", 4) for i in range(100)}
+    assert shards == {0, 1, 2, 3}
+
+
+def test_replay(tmp_path):
+    source = LocalKinesisClient(str(tmp_path / "source"))
+    Kinesis("local", client=source).put_gossip(_message(20))
+    source.close()
+
+    target = LocalKinesisClient(str(tmp_path / "target"), segment_format="binary")
+    start = time.monotonic()
+    sent = replay(str(tmp_path / "source"), target, "local", rate=200, batch_size=5)
+    target.close()
+
+    assert sent == 20
+    assert time.monotonic() - start >= 0.09
+    replayed = list(read_records(str(tmp_path / "target")))
+    original = list(read_records(str(tmp_path / "source")))
+    assert [r["Data"] for r in replayed] == [r["Data"] for r in original]
+
+
+class _FlakyStream:
+    """Kinesis client stub whose first PutRecords call fails its first entry."""
+
+    def __init__(self):
+        self.requests = []
+        self.received = []
+
+    def describe_stream(self, StreamName):
+        return {"StreamDescription": {"StreamName": StreamName}}
+
+    def put_records(self, StreamName, Records):
+        self.requests.append(Records)
+        results = [{"ShardId": "shardId-0", "SequenceNumber": "1"} for _ in Records]
+        if len(self.requests) == 1:
+            results[0] = {"ErrorCode": "ProvisionedThroughputExceededException"}
+        self.received.extend(r for r, res in zip(Records, results) if "ErrorCode" not in res)
+        return {"FailedRecordCount": len(self.requests) == 1, "Records": results}
+
+
+def test_replay_respects_limits_and_retries(tmp_path):
+    source = LocalKinesisClient(str(tmp_path / "source"))
+    big = [{"Data": bytes([i]) * 900_000, "PartitionKey": f"peer{i}"} for i in range(10)]
+    source.put_records(StreamName="local", Records=big)
+    source.close()
+
+    stream = _FlakyStream()
+    sent = replay(str(tmp_path / "source"), stream, "stream", batch_size=500)
+
+    assert sent == 10
+    assert all(sum(len(r["Data"]) for r in req) <= Kinesis.MAX_BYTES_PER_REQUEST for req in stream.requests)
+    # The failed entry was retried on its own.
+    assert len(stream.requests[1]) == 1
+    assert sorted(r["PartitionKey"] for r in stream.received) == sorted(r["PartitionKey"] for r in big)
@@ -0,0 +1,55 @@
+import hashlib
+import json
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable
+
+
+@dataclass(frozen=True)
+class RenderedJSON:
+    """A serialized JSON body and its content-hash ETag."""
+
+    body: bytes
+    etag: str
+
+
+def render_json(content: Any) -> RenderedJSON:
+    body = json.dumps(content, separators=(",", ":")).encode("utf-8")
+    etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+    return RenderedJSON(body, etag)
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Whether an If-None-Match header matches etag, using weak comparison."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class VersionedJSONCache:
+    """
+    Memoizes rendered JSON bodies per key until the source data version
+    changes, so each body is serialized and hashed once per data version
+    however many requests read it.
+    """
+
+    def __init__(self):
+        self._entries: dict[Hashable, tuple[Any, RenderedJSON]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, version: Any, build: Callable[[], Any]) -> RenderedJSON:
+        entry = self._entries.get(key)
+        if entry and entry[0] == version:
+            return entry[1]
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == version:
+                return entry[1]
+            rendered = render_json(build())
+            self._entries[key] = (version, rendered)
+            return rendered
@@ -0,0 +1,31 @@
+from unittest.mock import Mock
+
+from .response_cache import VersionedJSONCache, etag_matches, render_json
+
+
+def test_etag_is_content_hash():
+    assert render_json({"a": 1}).etag == render_json({"a": 1}).etag
+    assert render_json({"a": 1}).etag != render_json({"a": 2}).etag
+    assert render_json({"a": 1}).body == b'{"a":1}'
+
+
+def test_etag_matches():
+    etag = render_json([1]).etag
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_renders_once_per_version():
+    cache = VersionedJSONCache()
+    build = Mock(return_value={"round": 1})
+
+    first = cache.get("round", 1, build)
+    assert cache.get("round", 1, build) is first
+    assert build.call_count == 1
+
+    build.return_value = {"round": 2}
+    assert cache.get("round", 2, build).body == b'{"round":2}'
+    assert build.call_count == 2
@@ -1,20 +1,21 @@
 import argparse
 import logging
 import os
-from datetime import datetime, timedelta
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
 
 import uvicorn
 from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pythonjsonlogger import jsonlogger
 
-from hivemind_exp.chain_utils import ModalSwarmCoordinator, setup_web3
 from hivemind_exp.dht_utils import *
 from hivemind_exp.name_utils import *
 
 from . import global_dht
-from .dht_pub import GossipDHTPublisher
-from .kinesis import Kinesis
+from .dht_poller import DHTPollerProcess, PollingPipeline, SnapshotDHTCache
+from .gossip_stream import GossipBroadcaster, encode_event
+from .response_cache import RenderedJSON, VersionedJSONCache, etag_matches
 
 
 class CustomJsonFormatter(jsonlogger.JsonFormatter):
@@ -30,17 +31,47 @@ class CustomJsonFormatter(jsonlogger.JsonFormatter):
 
 json_formatter = CustomJsonFormatter("%(asctime)s %(levelname)s %(message)s")
 
-# Configure the root logger
+# Configure the root logger. This module can be imported more than once per
+# process (as __main__ and again as api.server by uvicorn or the poller
+# process), so the handler is named and only added once.
+LOG_HANDLER_NAME = "swarm-ui-json"
 root_logger = logging.getLogger()
-handler = logging.StreamHandler()
-handler.setFormatter(json_formatter)
-root_logger.addHandler(handler)
+if not any(h.get_name() == LOG_HANDLER_NAME for h in root_logger.handlers):
+    handler = logging.StreamHandler()
+    handler.set_name(LOG_HANDLER_NAME)
+    handler.setFormatter(json_formatter)
+    root_logger.addHandler(handler)
 root_logger.setLevel(logging.INFO)
 
 # Get the module logger
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+
+# Set by main when the DHT is polled in this process.
+polling_pipeline: PollingPipeline | None = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # The in-process publisher polls on the server's event loop.
+    if polling_pipeline:
+        polling_pipeline.gossip_publisher.start_async()
+
+    # With an out-of-process poller, every worker serves the poller's snapshots.
+    snapshot_path = os.getenv("DHT_SNAPSHOT_PATH")
+    snapshot_cache = None
+    if snapshot_path and global_dht.dht_cache is None:
+        snapshot_cache = SnapshotDHTCache(snapshot_path, broadcaster=gossip_broadcaster, logger=logger)
+        snapshot_cache.start()
+        global_dht.dht_cache = snapshot_cache
+    yield
+    if snapshot_cache:
+        snapshot_cache.stop()
+    if polling_pipeline:
+        await polling_pipeline.gossip_publisher.stop_async()
+
+
+app = FastAPI(lifespan=lifespan)
 port = os.getenv("SWARM_UI_PORT", "8000")
 
 try:
@@ -60,6 +91,16 @@ config = uvicorn.Config(
 
 server = uvicorn.Server(config)
 
+# Serialized data endpoint bodies, rebuilt only when the DHT cache version changes.
+response_cache = VersionedJSONCache()
+
+# Data only changes every poll, so clients and CDNs may reuse a response briefly
+# and then revalidate it with If-None-Match.
+DATA_CACHE_CONTROL = "public, max-age=5, stale-while-revalidate=30"
+
+# Streams gossip from the publisher to /api/gossip/stream clients.
+gossip_broadcaster = GossipBroadcaster(logger=logger)
+
 
 @app.exception_handler(Exception)
 async def internal_server_error_handler(request: Request, exc: Exception):
@@ -79,7 +120,7 @@ async def get_health():
     if lpt is None:
         raise HTTPException(status_code=500, detail="dht never polled")
 
-    diff = datetime.now() - lpt
+    diff = datetime.now(timezone.utc) - lpt
     if diff > timedelta(minutes=5):
         raise HTTPException(status_code=500, detail="dht last poll exceeded 5 minutes")
 
@@ -89,6 +130,84 @@ async def get_health():
     }
 
 
+def _dht_cache():
+    if global_dht.dht_cache is None or global_dht.dht_cache.get_last_polled() is None:
+        raise HTTPException(status_code=503, detail="dht cache not ready")
+    return global_dht.dht_cache
+
+
+def _cached_json(request: Request, rendered: RenderedJSON) -> Response:
+    """Returns rendered with its ETag, or an empty 304 if the client already has it."""
+    headers = {"ETag": rendered.etag, "Cache-Control": DATA_CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), rendered.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(rendered.body, media_type="application/json", headers=headers)
+
+
+@app.get("/api/round_and_stage")
+async def get_round_and_stage(request: Request):
+    cache = _dht_cache()
+
+    def build():
+        round_num, stage_num = cache.get_round_and_stage()
+        return {"round": round_num, "stage": stage_num}
+
+    return _cached_json(request, response_cache.get("round_and_stage", cache.version, build))
+
+
+@app.get("/api/leaderboard")
+async def get_leaderboard(request: Request):
+    cache = _dht_cache()
+    if cache.get_leaderboard() is None:
+        raise HTTPException(status_code=503, detail="leaderboard not ready")
+    return _cached_json(
+        request, response_cache.get("leaderboard", cache.version, cache.get_leaderboard)
+    )
+
+
+@app.get("/api/gossip")
+async def get_gossip(request: Request):
+    cache = _dht_cache()
+
+    def build():
+        round_num, stage_num = cache.get_round_and_stage()
+        return {
+            "currentRound": round_num,
+            "currentStage": stage_num,
+            "messages": cache.get_gossip(),
+        }
+
+    return _cached_json(request, response_cache.get("gossip", cache.version, build))
+
+
+@app.get("/api/gossip/stream")
+async def stream_gossip():
+    """Server-sent events: the current round, then gossip and round changes as they are published."""
+    subscription = gossip_broadcaster.subscribe()
+    if subscription is None:
+        raise HTTPException(status_code=503, detail="too many gossip stream clients")
+
+    cache = global_dht.dht_cache
+    round_and_stage = cache.get_round_and_stage() if cache else None
+
+    async def events():
+        try:
+            yield b"retry: 5000\n\n"
+            if round_and_stage:
+                round_num, stage_num = round_and_stage
+                yield encode_event("round", {"round": round_num, "stage": stage_num})
+            async for frame in subscription.events(heartbeat_seconds=15):
+                yield frame
+        finally:
+            gossip_broadcaster.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 def parse_arguments():
     parser = argparse.ArgumentParser()
     parser.add_argument(
@@ -98,38 +217,37 @@ def parse_arguments():
 
 
 def main(args):
-    contract_addr = os.getenv("CONTRACT_ADDRESS")
-
-    if contract_addr is None:
-        raise Exception("CONTRACT_ADDRESS is required in environment")
-
-    coordinator = ModalSwarmCoordinator(
-        setup_web3(), contract_addr, org_id=""
-    )  # Only allows contract calls
-    initial_peers = coordinator.get_bootnodes()
-
-    # Supplied with the bootstrap node, the client will have access to the DHT.
-    logger.info(f"initializing DHT with peers {initial_peers}")
-
-    kinesis_stream = os.getenv("KINESIS_STREAM", "")
-    kinesis_client = Kinesis(kinesis_stream)
-
-    global_dht.setup_global_dht(initial_peers, coordinator, logger, kinesis_client)
-
-    # Start publishing to kinesis. This will eventually replace the populate_cache thread.
-    logger.info("Starting gossip publisher")
-    gossip_publisher = GossipDHTPublisher(
-        dht=global_dht.dht,
-        kinesis_client=kinesis_client,
-        logger=logger,
-        coordinator=coordinator,
-        poll_interval_seconds=150,  # 2.5 minute
+    global polling_pipeline
+
+    snapshot_path = os.getenv("DHT_SNAPSHOT_PATH")
+    if snapshot_path:
+        # Poll and decode in a separate process; API workers read its snapshots.
+        logger.info("Starting DHT poller process", extra={"snapshot_path": snapshot_path})
+        poller = DHTPollerProcess(snapshot_path, logger=logger)
+        poller.start()
+
+        logger.info(f"initializing server on port {port}")
+        uvicorn.run(
+            "api.server:app",
+            host="0.0.0.0",
+            port=port,
+            workers=int(os.getenv("SWARM_UI_WORKERS", "1")),
+            timeout_keep_alive=10,
+            timeout_graceful_shutdown=10,
+            h11_max_incomplete_event_size=8192,
+        )
+        poller.stop()
+        return
+
+    polling_pipeline = PollingPipeline(
+        logger, broadcaster=gossip_broadcaster, start_publisher=False
     )
-    gossip_publisher.start()
 
     logger.info(f"initializing server on port {port}")
     server.run()
 
+    polling_pipeline.stop()
+
 
 if __name__ == "__main__":
     main(parse_arguments())
@@ -0,0 +1,88 @@
+import logging
+import runpy
+import warnings
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from . import global_dht, server
+from .response_cache import VersionedJSONCache
+from .server import app
+
+
+@pytest.fixture
+def dht_cache(monkeypatch):
+    cache = MagicMock()
+    cache.get_last_polled.return_value = datetime.now(timezone.utc)
+    cache.get_round_and_stage.return_value = (4, 2)
+    cache.get_leaderboard.return_value = {"round": 4, "stage": 2, "leaders": [], "total": 0}
+    cache.get_gossip.return_value = [{"id": "msg1"}]
+    cache.version = 1
+    monkeypatch.setattr(global_dht, "dht_cache", cache)
+    monkeypatch.setattr(server, "response_cache", VersionedJSONCache())
+    return cache
+
+
+def test_healthz(dht_cache):
+    response = TestClient(app).get("/api/healthz")
+    assert response.status_code == 200
+    assert response.json()["message"] == "OK"
+
+
+def test_endpoints_served_from_cache(dht_cache):
+    client = TestClient(app)
+    assert client.get("/api/round_and_stage").json() == {"round": 4, "stage": 2}
+    assert client.get("/api/leaderboard").json()["round"] == 4
+    assert client.get("/api/gossip").json() == {
+        "currentRound": 4,
+        "currentStage": 2,
+        "messages": [{"id": "msg1"}],
+    }
+
+
+def test_not_ready_before_first_poll(dht_cache):
+    dht_cache.get_last_polled.return_value = None
+    client = TestClient(app)
+    assert client.get("/api/leaderboard").status_code == 503
+    assert client.get("/api/healthz").status_code == 500
+
+
+def test_conditional_get(dht_cache):
+    client = TestClient(app)
+    response = client.get("/api/leaderboard")
+    etag = response.headers["etag"]
+    assert response.headers["cache-control"] == server.DATA_CACHE_CONTROL
+
+    response = client.get("/api/leaderboard", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+    response = client.get("/api/leaderboard", headers={"If-None-Match": '"stale"'})
+    assert response.status_code == 200
+
+
+def test_bodies_rendered_once_per_version(dht_cache):
+    client = TestClient(app)
+    for _ in range(3):
+        client.get("/api/gossip")
+    assert dht_cache.get_gossip.call_count == 1
+
+    dht_cache.version = 2
+    dht_cache.get_gossip.return_value = [{"id": "msg2"}]
+    response = client.get("/api/gossip")
+    assert response.json()["messages"] == [{"id": "msg2"}]
+    assert dht_cache.get_gossip.call_count == 2
+
+
+def test_log_handler_installed_once():
+    """Running the module again, as uvicorn and the poller process do, must not duplicate log output."""
+    root_logger = logging.getLogger()
+    before = len(root_logger.handlers)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        runpy.run_module("api.server", run_name="__mp_main__")
+    assert len(root_logger.handlers) == before
+    assert [h.get_name() for h in root_logger.handlers].count(server.LOG_HANDLER_NAME) == 1